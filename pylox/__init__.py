@@ -7,6 +7,20 @@ Pylox - Python实现的Lox语言解释器
 
 __version__ = "0.1.0"
 
-from pylox.lox import Lox
+__all__ = ["Lox", "LoxRuntime"]
 
-__all__ = ["Lox"]
\ No newline at end of file
+
+def __getattr__(name):
+    """
+    按需导入Lox和LoxRuntime，使只需要客户端等轻量功能的进程不必加载整个解释器
+    
+    Args:
+        name: str, 属性名
+        
+    Returns:
+        Lox类或LoxRuntime类
+    """
+    if name in __all__:
+        import pylox.lox
+        return getattr(pylox.lox, name)
+    raise AttributeError(f"module 'pylox' has no attribute '{name}'")
\ No newline at end of file
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+批量执行Lox脚本
+
+把大量相互独立的.lox文件分发到多个进程中执行，收集每个文件的标准输出、
+标准错误、退出码和耗时，生成JSON报告:
+
+    pylox batch "scripts/**/*.lox" -j 8 -o report.json
+
+每个脚本都在独立的LoxRuntime中执行，出错只影响自身的退出码，不会结束
+整个批处理。
+"""
+
+import glob
+import json
+import os
+import sys
+import time
+
+
+def expand_paths(patterns):
+    """
+    把文件路径、目录和通配符模式展开为脚本路径列表
+
+    目录会递归查找其中所有的.lox文件。结果保持输入顺序并去除重复。
+
+    Args:
+        patterns: list[str], 路径、目录或通配符模式
+
+    Returns:
+        list[str]: 脚本路径列表
+    """
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        elif os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(pattern, "**", "*.lox"), recursive=True))
+        else:
+            matches = [pattern]
+
+        for path in matches:
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+
+def run_script(path, limits=None):
+    """
+    执行一个脚本并记录结果
+
+    Args:
+        path: str, 脚本路径
+        limits: dict, 每个脚本的执行预算（见pylox.interpreter.budget.Budget），None表示不限制
+
+    Returns:
+        dict: 包含path、stdout、stderr、exit_code和wall_time（秒）的结果
+    """
+    from pylox.server import execute_request
+    import pylox.lox  # 解释器的导入开销不计入脚本耗时
+
+    start = time.perf_counter()
+    response = execute_request({"path": path, "limits": limits})
+    wall_time = time.perf_counter() - start
+    return {"path": path, **response, "wall_time": wall_time}
+
+
+def run_batch(paths, workers=None, limits=None):
+    """
+    并行执行多个脚本
+
+    Args:
+        paths: list[str], 脚本路径列表
+        workers: int, 工作进程数，默认为CPU数量；为1时在当前进程中依次执行
+        limits: dict, 每个脚本的执行预算，None表示不限制
+
+    Returns:
+        dict: 报告，files为按输入顺序排列的各脚本结果，summary为汇总信息
+    """
+    start = time.perf_counter()
+
+    if workers == 1:
+        files = [run_script(path, limits) for path in paths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_script, path, limits) for path in paths]
+            files = []
+            for path, future in zip(paths, futures):
+                try:
+                    files.append(future.result())
+                except Exception as error:
+                    # 工作进程异常退出时仍为该脚本记录一条结果
+                    files.append({"path": path, "stdout": "",
+                                  "stderr": f"[异常] 工作进程执行失败: {error}\n",
+                                  "exit_code": 70, "wall_time": 0.0})
+
+    passed = sum(1 for result in files if result["exit_code"] == 0)
+    return {
+        "files": files,
+        "summary": {
+            "total": len(files),
+            "passed": passed,
+            "failed": len(files) - passed,
+            "wall_time": time.perf_counter() - start,
+        },
+    }
+
+
+def main(argv):
+    """
+    pylox batch: 并行执行多个脚本并输出JSON报告
+
+    Args:
+        argv: list[str], 子命令参数
+
+    Returns:
+        int: 全部脚本成功时为0，否则为1
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="pylox batch", description="并行执行多个Lox脚本")
+    parser.add_argument("patterns", nargs="+", help="脚本路径、目录或通配符模式")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="工作进程数，默认为CPU数量")
+    parser.add_argument("-o", "--output", default=None, help="报告文件路径，默认输出到标准输出")
+    parser.add_argument("--timeout", type=float, default=None, metavar="SECONDS",
+                        help="每个脚本的最长运行时间")
+    parser.add_argument("--max-steps", type=int, default=None,
+                        help="每个脚本最多执行的步数（循环迭代与调用次数之和）")
+    args = parser.parse_args(argv)
+
+    limits = {key: value for key, value in (("timeout", args.timeout), ("max_steps", args.max_steps))
+              if value is not None}
+    report = run_batch(expand_paths(args.patterns), args.jobs, limits or None)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+        summary = report["summary"]
+        print(f"共{summary['total']}个脚本，成功{summary['passed']}个，失败{summary['failed']}个，"
+              f"耗时{summary['wall_time']:.2f}秒", file=sys.stderr)
+    else:
+        print(text)
+
+    return 0 if report["summary"]["failed"] == 0 else 1
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+基准测试
+
+在各个解释器引擎上反复执行benchmarks/目录中的标准Lox程序，报告每个程序
+的最短耗时、中位数耗时和每秒操作数:
+
+    pylox bench                     # 运行全部基准程序
+    pylox bench fib zoo -r 10       # 只运行fib和zoo，各重复10次
+    pylox bench --json result.json  # 同时把结果写成JSON
+
+    pylox bench --save-baseline baseline.json   # 记录基线
+    pylox bench --baseline baseline.json        # 与基线比较，显著变慢时退出码为1
+
+每个基准程序的第一行以"// ops: N"注明一次运行包含的操作数（调用次数、
+创建的实例数等），每秒操作数即N除以中位数耗时。耗时包含词法分析、语法
+分析、变量解析和执行的全过程，每次运行都使用新的LoxRuntime和解释器。
+"""
+
+import io
+import os
+import re
+import statistics
+import sys
+import time
+
+
+# 随源码一起分发的基准程序目录
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+
+# 引擎名 -> (模块, 类名)
+ENGINES = {
+    "interpreter": ("pylox.interpreter.interpreter", "Interpreter"),
+    "optimized": ("pylox.interpreter.optimized_interpreter", "OptimizedInterpreter"),
+}
+
+OPS_PATTERN = re.compile(r"^//\s*ops:\s*(\d+)", re.MULTILINE)
+
+# 双侧95%置信区间的t分布临界值，下标为自由度；自由度更大时使用正态近似
+T_CRITICAL = [None, 12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+              2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+              2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+# 默认的回退阈值：平均耗时增加超过10%
+DEFAULT_THRESHOLD = 0.10
+
+BASELINE_VERSION = 1
+
+
+def load_engine(name):
+    """
+    加载解释器引擎
+
+    Args:
+        name: str, ENGINES中的引擎名
+
+    Returns:
+        tuple: (解释器类, None)，引擎不可用时为(None, 原因)
+    """
+    import importlib
+    module_name, class_name = ENGINES[name]
+    try:
+        engine = getattr(importlib.import_module(module_name), class_name)
+    except (ImportError, AttributeError) as error:
+        return None, f"无法加载: {error}"
+
+    missing = getattr(engine, "__abstractmethods__", None)
+    if missing:
+        return None, f"尚未实现: {', '.join(sorted(missing))}"
+    return engine, None
+
+
+def find_benchmarks(directory=DEFAULT_DIRECTORY, names=None):
+    """
+    查找基准程序
+
+    Args:
+        directory: str, 基准程序目录
+        names: list[str], 只返回这些名称（不含.lox扩展名）的程序，None表示全部
+
+    Returns:
+        list[str]: 按名称排序的程序路径
+
+    Raises:
+        ValueError: names中包含不存在的程序
+    """
+    available = {entry[:-4]: os.path.join(directory, entry)
+                 for entry in os.listdir(directory) if entry.endswith(".lox")}
+    if not names:
+        return [available[name] for name in sorted(available)]
+
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValueError(f"未知的基准程序: {', '.join(unknown)}")
+    return [available[name] for name in names]
+
+
+def read_ops(source):
+    """
+    读取基准程序注明的操作数
+
+    Args:
+        source: str, 源代码
+
+    Returns:
+        int: "// ops: N"注明的操作数，未注明时为1
+    """
+    match = OPS_PATTERN.search(source)
+    return int(match.group(1)) if match else 1
+
+
+def confidence_interval(times):
+    """
+    计算平均耗时的95%置信区间
+
+    Args:
+        times: list[float], 各次运行的耗时
+
+    Returns:
+        tuple: (平均值, 置信区间半宽)，只有一次运行时半宽为0
+    """
+    mean = statistics.mean(times)
+    if len(times) < 2:
+        return mean, 0.0
+    degrees = len(times) - 1
+    t = T_CRITICAL[degrees] if degrees < len(T_CRITICAL) else 1.960
+    return mean, t * statistics.stdev(times) / len(times) ** 0.5
+
+
+def run_once(source, engine):
+    """
+    用新的运行时和解释器执行一次源代码
+
+    Args:
+        source: str, 源代码
+        engine: type, 解释器类
+
+    Returns:
+        tuple: (耗时（秒）, 退出码, 错误输出)
+    """
+    from pylox.lox import LoxRuntime
+    from pylox.interpreter.output import OutputSink
+
+    errors = io.StringIO()
+    runtime = LoxRuntime(output=OutputSink(io.StringIO()), error_stream=errors)
+    runtime.interpreter = engine(output=runtime.output, lox=runtime)
+
+    start = time.perf_counter()
+    exit_code = runtime.execute_source(source)
+    elapsed = time.perf_counter() - start
+    return elapsed, exit_code, errors.getvalue()
+
+
+def run_benchmark(path, engine, repeat=5, warmup=1):
+    """
+    反复执行一个基准程序并统计耗时
+
+    Args:
+        path: str, 基准程序路径
+        engine: type, 解释器类
+        repeat: int, 计时的运行次数
+        warmup: int, 计时前不计时的预热次数
+
+    Returns:
+        dict: 包含name、ops、times、min、median、mean、ci（置信区间半宽）和
+            ops_per_sec的结果；程序出错时只包含name和error
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    with open(path, encoding="utf-8") as file:
+        source = file.read()
+
+    times = []
+    for run in range(warmup + repeat):
+        elapsed, exit_code, errors = run_once(source, engine)
+        if exit_code != 0:
+            return {"name": name, "error": errors.strip() or f"退出码 {exit_code}"}
+        if run >= warmup:
+            times.append(elapsed)
+
+    ops = read_ops(source)
+    median = statistics.median(times)
+    mean, ci = confidence_interval(times)
+    return {
+        "name": name,
+        "ops": ops,
+        "times": times,
+        "min": min(times),
+        "median": median,
+        "mean": mean,
+        "ci": ci,
+        "ops_per_sec": ops / median if median > 0 else 0.0,
+    }
+
+
+def run_suite(paths, engines=None, repeat=5, warmup=1):
+    """
+    在各个引擎上运行全部基准程序
+
+    Args:
+        paths: list[str], 基准程序路径
+        engines: list[str], 引擎名，默认为ENGINES中的全部引擎
+        repeat: int, 每个程序计时的运行次数
+        warmup: int, 每个程序的预热次数
+
+    Returns:
+        dict: 报告，engines为引擎名到结果列表的映射，unavailable为不可用引擎及原因
+    """
+    report = {"python": sys.version.split()[0], "repeat": repeat, "engines": {}, "unavailable": {}}
+    for name in engines or ENGINES:
+        engine, reason = load_engine(name)
+        if engine is None:
+            report["unavailable"][name] = reason
+            continue
+        report["engines"][name] = [run_benchmark(path, engine, repeat, warmup) for path in paths]
+    return report
+
+
+def format_report(report):
+    """
+    生成文本报告
+
+    Args:
+        report: dict, run_suite返回的报告
+
+    Returns:
+        str: 各引擎的结果表格
+    """
+    lines = []
+    for engine, results in report["engines"].items():
+        lines.append(f"[{engine}]")
+        lines.append(f"{'程序':<18} {'最短(s)':>10} {'中位数(s)':>10} {'ops/s':>12}")
+        for result in results:
+            if "error" in result:
+                lines.append(f"{result['name']:<20} 出错: {result['error']}")
+                continue
+            lines.append(f"{result['name']:<20} {result['min']:>9.4f} {result['median']:>12.4f} "
+                         f"{result['ops_per_sec']:>13.0f}")
+        lines.append("")
+    for engine, reason in report["unavailable"].items():
+        lines.append(f"[{engine}] 不可用: {reason}")
+    return "\n".join(lines).rstrip()
+
+
+def save_baseline(report, path):
+    """
+    把基准测试结果保存为基线文件
+
+    Args:
+        report: dict, run_suite返回的报告
+        path: str, 基线文件路径
+    """
+    import json
+    baseline = {"version": BASELINE_VERSION, "python": report["python"], "engines": {}}
+    for engine, results in report["engines"].items():
+        baseline["engines"][engine] = {
+            result["name"]: {key: result[key] for key in ("mean", "ci", "median", "times")}
+            for result in results if "error" not in result
+        }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(baseline, file, ensure_ascii=False, indent=2)
+        file.write("\n")
+
+
+def load_baseline(path):
+    """
+    读取基线文件
+
+    Args:
+        path: str, 基线文件路径
+
+    Returns:
+        dict: 基线数据
+
+    Raises:
+        ValueError: 文件不是本工具生成的基线
+    """
+    import json
+    with open(path, encoding="utf-8") as file:
+        baseline = json.load(file)
+    if not isinstance(baseline, dict) or baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"无法识别的基线文件: {path}")
+    return baseline
+
+
+def compare_to_baseline(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    把本次结果与基线比较
+
+    平均耗时的变化超过阈值、且两次的95%置信区间不重叠时，才判定为回退
+    或改进；否则视为噪声。
+
+    Args:
+        report: dict, run_suite返回的报告
+        baseline: dict, load_baseline返回的基线
+        threshold: float, 判定回退的相对变化阈值，如0.1表示慢10%
+
+    Returns:
+        list[dict]: 每个程序的比较结果，status为regression、improvement、
+            unchanged或new（基线中没有该程序）
+    """
+    comparisons = []
+    for engine, results in report["engines"].items():
+        previous = baseline["engines"].get(engine, {})
+        for result in results:
+            if "error" in result:
+                continue
+            entry = {"engine": engine, "name": result["name"], "mean": result["mean"], "ci": result["ci"]}
+            old = previous.get(result["name"])
+            if old is None:
+                entry["status"] = "new"
+                comparisons.append(entry)
+                continue
+
+            change = result["mean"] / old["mean"] - 1.0
+            separated = (result["mean"] - result["ci"] > old["mean"] + old["ci"] or
+                         result["mean"] + result["ci"] < old["mean"] - old["ci"])
+            if separated and change > threshold:
+                status = "regression"
+            elif separated and change < -threshold:
+                status = "improvement"
+            else:
+                status = "unchanged"
+            entry.update(baseline_mean=old["mean"], baseline_ci=old["ci"], change=change, status=status)
+            comparisons.append(entry)
+    return comparisons
+
+
+def format_comparison(comparisons):
+    """
+    生成与基线比较的文本报告
+
+    Args:
+        comparisons: list[dict], compare_to_baseline返回的比较结果
+
+    Returns:
+        str: 每个程序一行的报告
+    """
+    labels = {"regression": "回退", "improvement": "改进", "unchanged": "持平", "new": "新增"}
+    lines = []
+    for entry in comparisons:
+        current = f"{entry['mean']:.4f}±{entry['ci']:.4f}s"
+        if entry["status"] == "new":
+            lines.append(f"{labels['new']}  {entry['engine']}/{entry['name']}: {current}")
+            continue
+        lines.append(f"{labels[entry['status']]}  {entry['engine']}/{entry['name']}: "
+                     f"{entry['baseline_mean']:.4f}±{entry['baseline_ci']:.4f}s -> {current} "
+                     f"({entry['change']:+.1%})")
+    return "\n".join(lines)
+
+
+def main(argv):
+    """
+    pylox bench: 运行基准测试
+
+    Args:
+        argv: list[str], 子命令参数
+
+    Returns:
+        int: 全部基准程序执行成功且相对基线没有回退时为0，否则为1
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="pylox bench", description="运行Lox基准测试")
+    parser.add_argument("names", nargs="*", help="要运行的基准程序名，默认为全部")
+    parser.add_argument("--dir", default=DEFAULT_DIRECTORY, help="基准程序目录")
+    parser.add_argument("-e", "--engine", action="append", choices=sorted(ENGINES), default=None,
+                        help="要测试的引擎，可重复指定，默认为全部")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="每个程序计时的运行次数")
+    parser.add_argument("--warmup", type=int, default=1, help="每个程序计时前的预热次数")
+    parser.add_argument("--json", default=None, metavar="FILE", help="把结果以JSON格式写入FILE")
+    parser.add_argument("--save-baseline", default=None, metavar="FILE", help="把结果保存为基线文件")
+    parser.add_argument("--baseline", default=None, metavar="FILE",
+                        help="与基线文件比较，出现显著回退时退出码为1")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="判定回退的相对变化阈值（默认0.1，即慢10%%）")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = load_baseline(args.baseline)
+        except (OSError, ValueError) as error:
+            print(f"错误: {error}", file=sys.stderr)
+            return 64  # EX_USAGE
+
+    try:
+        paths = find_benchmarks(args.dir, args.names)
+    except (OSError, ValueError) as error:
+        print(f"错误: {error}", file=sys.stderr)
+        return 64  # EX_USAGE
+
+    report = run_suite(paths, args.engine, args.repeat, args.warmup)
+    print(format_report(report))
+    if args.json:
+        import json
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+            file.write("\n")
+    if args.save_baseline:
+        save_baseline(report, args.save_baseline)
+
+    failed = any("error" in result for results in report["engines"].values() for result in results)
+    if baseline is not None:
+        comparisons = compare_to_baseline(report, baseline, args.threshold)
+        print()
+        print(format_comparison(comparisons))
+        failed = failed or any(entry["status"] == "regression" for entry in comparisons)
+    return 1 if failed else 0
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+并行分析Lox源文件
+
+扫描和语法分析对每个文件都是相互独立的CPU密集型工作。parse_files在进程池
+中分析一组文件，把可以pickle的语法树送回主进程；check_files在进程池中完整
+地检查语法和变量解析错误而不执行（与--validate-only相同），只送回错误信息:
+
+    pylox check src/ -j 8
+
+每个文件都在独立的LoxRuntime中分析，错误写入该运行时自己的缓冲区，不会
+相互混杂。
+"""
+
+import os
+import pickle
+import sys
+import time
+
+from pylox.batch import expand_paths
+
+
+def map_files(function, paths, workers=None):
+    """
+    在进程池中对每个文件调用function
+
+    文件分块提交给工作进程，大量小文件时不会被进程间通信的开销拖慢。
+
+    Args:
+        function: callable, 以文件路径调用、返回可pickle结果的模块级函数
+        paths: list[str], 文件路径列表
+        workers: int, 工作进程数，默认为CPU数量；为1时在当前进程中依次执行
+
+    Returns:
+        list: 按输入顺序排列的结果
+    """
+    if workers == 1 or len(paths) <= 1:
+        return [function(path) for path in paths]
+
+    from concurrent.futures import ProcessPoolExecutor
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, paths, chunksize=chunksize))
+
+
+def new_runtime():
+    """
+    创建把输出和错误写入缓冲区的运行时
+
+    Returns:
+        LoxRuntime: 运行时，错误输出为其error_stream
+    """
+    import io
+    from pylox.lox import LoxRuntime
+    from pylox.interpreter.output import OutputSink
+    return LoxRuntime(output=OutputSink(io.StringIO()), error_stream=io.StringIO())
+
+
+def parse_file(path):
+    """
+    扫描并解析一个文件
+
+    Args:
+        path: str, 文件路径
+
+    Returns:
+        dict: path为文件路径，statements为语句列表（有错误时为None），
+              errors为报告的错误文本，mtime_ns和size为分析时文件的修改时间和大小
+    """
+    from pylox.parser import Parser
+    from pylox.scanner import Scanner
+
+    runtime = new_runtime()
+    result = {"path": path, "statements": None, "errors": "", "mtime_ns": None, "size": None}
+    try:
+        stat = os.stat(path)
+        with open(path, 'r', encoding='utf-8') as file:
+            source = file.read()
+    except OSError:
+        result["errors"] = f"错误: 无法读取文件 '{path}'\n"
+        return result
+
+    result["mtime_ns"], result["size"] = stat.st_mtime_ns, stat.st_size
+    try:
+        # 记录文件路径，语法树可以作为模块使用（见ModuleLoader.preload）
+        tokens = Scanner(source, lox=runtime, file=path).scan_tokens()
+        statements = Parser(tokens, lox=runtime).parse()
+    except RecursionError:
+        # 嵌套过深的文件只记录为该文件的错误，不影响同一批的其他文件
+        runtime.error_stream.write("[异常] 分析时发生异常: 嵌套过深，超出Python递归限制\n")
+        statements = None
+    if statements is not None and not runtime.had_error:
+        result["statements"] = statements
+    result["errors"] = runtime.error_stream.getvalue()
+    return result
+
+
+def parse_file_pickled(path):
+    """
+    在工作进程中分析一个文件，语法树预先pickle为字节串
+
+    上万项的1 + 1 + …这样的表达式由循环解析，不会超出递归限制，得到的语法树
+    却深到无法pickle。在这里pickle可以把它记录为该文件的错误，而不是让进程池
+    在送回结果时失败、使整批分析抛出异常。
+
+    Args:
+        path: str, 文件路径
+
+    Returns:
+        dict: 同parse_file，statements为pickle后的字节串
+    """
+    result = parse_file(path)
+    if result["statements"] is not None:
+        try:
+            result["statements"] = pickle.dumps(result["statements"], protocol=pickle.HIGHEST_PROTOCOL)
+        except RecursionError:
+            result["statements"] = None
+            result["errors"] += "[异常] 分析时发生异常: 语法树嵌套过深，无法送回主进程\n"
+    return result
+
+
+def parse_files(paths, workers=None):
+    """
+    并行扫描并解析多个文件
+
+    变量解析的结果属于解释器，不随语法树返回；执行前仍需在目标解释器中解析。
+    每个文件的错误（包括嵌套过深）只记录在该文件的结果中。
+
+    Args:
+        paths: list[str], 文件路径列表
+        workers: int, 工作进程数，默认为CPU数量；为1时在当前进程中依次执行
+
+    Returns:
+        list[dict]: 按输入顺序排列的parse_file结果
+    """
+    if workers == 1 or len(paths) <= 1:
+        return map_files(parse_file, paths, 1)
+    results = map_files(parse_file_pickled, paths, workers)
+    for result in results:
+        if result["statements"] is not None:
+            result["statements"] = pickle.loads(result["statements"])
+    return results
+
+
+def check_file(path):
+    """
+    完整地检查一个文件而不执行
+
+    Args:
+        path: str, 文件路径
+
+    Returns:
+        dict: path为文件路径，exit_code为0（没有错误）或65，errors为报告的错误文本
+    """
+    runtime = new_runtime()
+    try:
+        exit_code = runtime.validate_file(path)
+    except Exception as error:
+        # 分析器自身的异常（如嵌套过深）也作为该文件的错误记录
+        runtime.error_stream.write(f"[异常] 检查时发生异常: {error}\n")
+        exit_code = 70
+    return {"path": path, "exit_code": exit_code, "errors": runtime.error_stream.getvalue()}
+
+
+def check_files(paths, workers=None):
+    """
+    并行检查多个文件
+
+    Args:
+        paths: list[str], 文件路径列表
+        workers: int, 工作进程数，默认为CPU数量；为1时在当前进程中依次执行
+
+    Returns:
+        dict: 报告，files为按输入顺序排列的check_file结果，summary为汇总信息
+    """
+    start = time.perf_counter()
+    files = map_files(check_file, paths, workers)
+    passed = sum(1 for result in files if result["exit_code"] == 0)
+    return {
+        "files": files,
+        "summary": {
+            "total": len(files),
+            "passed": passed,
+            "failed": len(files) - passed,
+            "wall_time": time.perf_counter() - start,
+        },
+    }
+
+
+def format_errors(report):
+    """
+    把检查报告中的错误格式化为每行带文件路径的文本
+
+    Args:
+        report: dict, check_files返回的报告
+
+    Returns:
+        str: 错误文本，没有错误时为空字符串
+    """
+    lines = []
+    for result in report["files"]:
+        for line in result["errors"].splitlines():
+            lines.append(f"{result['path']}: {line}")
+    return "".join(line + "\n" for line in lines)
+
+
+def main(argv):
+    """
+    pylox check: 并行检查Lox源文件的语法和变量解析错误
+
+    Args:
+        argv: list[str], 子命令参数
+
+    Returns:
+        int: 所有文件都没有错误时为0，否则为65
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="pylox check", description="检查Lox源文件而不执行")
+    parser.add_argument("patterns", nargs="+", help="文件路径、目录或通配符模式")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="工作进程数，默认为CPU数量")
+    parser.add_argument("--json", default=None, metavar="FILE", help="同时把报告以JSON格式写入FILE")
+    args = parser.parse_args(argv)
+
+    report = check_files(expand_paths(args.patterns), args.jobs)
+    sys.stderr.write(format_errors(report))
+    if args.json:
+        import json
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+            file.write("\n")
+
+    summary = report["summary"]
+    print(f"检查了{summary['total']}个文件，{summary['failed']}个有错误，"
+          f"耗时{summary['wall_time']:.2f}秒", file=sys.stderr)
+    return 0 if summary["failed"] == 0 else 65
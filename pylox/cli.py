@@ -8,25 +8,208 @@ PyLox CLI模块
 """
 
 import sys
-from pylox.lox import Lox
 
 
-def main():
+def build_parser():
+    """
+    构建命令行参数解析器
+
+    Returns:
+        argparse.ArgumentParser: 参数解析器
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="pylox", description="Lox解释器")
+    parser.add_argument("script", nargs="?", help="要执行的Lox脚本文件")
+    parser.add_argument("-d", "--debug", action="store_true", help="启用调试模式")
+    parser.add_argument("--deep-stack", action="store_true",
+                        help="在大栈线程中执行，支持深度递归")
+    parser.add_argument("--max-depth", type=int, default=None,
+                        help="Lox调用栈的最大深度，超过时报告运行时错误")
+    parser.add_argument("--line-buffered", action="store_true",
+                        help="print输出逐行写出并刷新（默认块缓冲）")
+    parser.add_argument("--profile", action="store_true",
+                        help="结束时输出各Lox函数的调用次数和耗时")
+    parser.add_argument("--profile-output", default=None, metavar="FILE",
+                        help="把性能报告以JSON格式写入FILE（隐含--profile）")
+    parser.add_argument("--sample", default=None, metavar="FILE",
+                        help="采样Lox调用栈，把可用于火焰图的折叠栈写入FILE")
+    parser.add_argument("--sample-rate", type=float, default=None, metavar="HZ",
+                        help="期望的每秒采样次数（默认1000），实际采样率在结束时报告")
+    parser.add_argument("--stats", action="store_true",
+                        help="结束时输出各阶段耗时和运行时计数")
+    parser.add_argument("--coverage", default=None, metavar="FILE",
+                        help="统计各行执行次数，写入lcov格式的FILE（扩展名为.json时写入JSON）")
+    parser.add_argument("--max-steps", type=int, default=None,
+                        help="最多执行的步数（循环迭代与调用次数之和），超过时报告运行时错误")
+    parser.add_argument("--timeout", type=float, default=None, metavar="SECONDS",
+                        help="最长运行时间，超过时报告运行时错误")
+    parser.add_argument("--max-allocations", type=int, default=None,
+                        help="最多创建的实例和环境数")
+    parser.add_argument("--max-string-chars", type=int, default=None,
+                        help="字符串拼接产生的字符总数上限")
+    parser.add_argument("--lazy-parse", action="store_true",
+                        help="首次调用时才解析顶层函数的函数体，函数体中的错误推迟到调用时报告，"
+                             "不能与--coverage同时使用")
+    parser.add_argument("--validate-only", action="store_true",
+                        help="完整地检查语法和变量解析错误而不执行，有错误时以65退出")
+    parser.add_argument("--module-cache", default=None, metavar="DIR",
+                        help="把导入模块的语法树缓存到DIR，供之后的运行直接使用")
+    return parser
+
+
+def serve_main(argv):
+    """
+    pylox serve: 启动常驻解释器服务
+
+    Args:
+        argv: list[str], 子命令参数
+
+    Returns:
+        int: 退出码
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="pylox serve", description="启动常驻Lox解释器服务")
+    parser.add_argument("--socket", default=None, help="Unix套接字路径")
+    args = parser.parse_args(argv)
+
+    from pylox.server import serve
+    serve(args.socket)
+    return 0
+
+
+def client_main(argv):
+    """
+    pylox client: 把脚本提交给常驻服务执行
+
+    Args:
+        argv: list[str], 子命令参数
+
+    Returns:
+        int: 脚本的退出码
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="pylox client", description="在常驻服务中执行Lox脚本")
+    parser.add_argument("script", nargs="?", help="要执行的Lox脚本文件")
+    parser.add_argument("-e", "--source", default=None, help="直接执行的Lox源代码")
+    parser.add_argument("--socket", default=None, help="Unix套接字路径")
+    args = parser.parse_args(argv)
+    if (args.script is None) == (args.source is None):
+        parser.error("必须且只能指定脚本文件或--source之一")
+
+    from pylox.server import run_client
+    return run_client(args.script, args.source, args.socket)
+
+
+def build_budget(args):
+    """
+    根据命令行参数创建执行预算
+
+    Args:
+        args: argparse.Namespace, 解析后的参数
+
+    Returns:
+        Budget: 执行预算，没有设置任何上限时为None
+    """
+    limits = {"max_steps": args.max_steps, "timeout": args.timeout,
+              "max_allocations": args.max_allocations, "max_string_chars": args.max_string_chars}
+    if all(value is None for value in limits.values()):
+        return None
+    from pylox.interpreter.budget import Budget
+    return Budget(**limits)
+
+
+def batch_main(argv):
+    """
+    pylox batch: 并行执行多个脚本并输出JSON报告
+
+    Args:
+        argv: list[str], 子命令参数
+
+    Returns:
+        int: 退出码
+    """
+    from pylox.batch import main as run_batch_main
+    return run_batch_main(argv)
+
+
+def check_main(argv):
+    """
+    pylox check: 并行检查Lox源文件
+
+    Args:
+        argv: list[str], 子命令参数
+
+    Returns:
+        int: 退出码
+    """
+    from pylox.check import main as run_check_main
+    return run_check_main(argv)
+
+
+def bench_main(argv):
+    """
+    pylox bench: 运行基准测试
+
+    Args:
+        argv: list[str], 子命令参数
+
+    Returns:
+        int: 退出码
+    """
+    from pylox.benchmark import main as run_bench_main
+    return run_bench_main(argv)
+
+
+SUBCOMMANDS = {
+    "serve": serve_main,
+    "client": client_main,
+    "batch": batch_main,
+    "bench": bench_main,
+    "check": check_main,
+}
+
+
+def main(argv=None):
     """
     命令行入口函数
-    
+
     处理命令行参数，根据参数启动解释器的不同模式。
     可以运行交互式REPL或执行Lox脚本文件。
+
+    Args:
+        argv: list[str], 命令行参数，默认为sys.argv[1:]
     """
-    args = sys.argv[1:]
-    if len(args) > 1:
-        print("Usage: pylox [script]")
-        sys.exit(64)
-    elif len(args) == 1:
-        Lox.run_file(args[0])
+    argv = sys.argv[1:] if argv is None else argv
+    
+    # 子命令（serve、client、batch、bench、check）见SUBCOMMANDS
+    if argv and argv[0] in SUBCOMMANDS:
+        sys.exit(SUBCOMMANDS[argv[0]](argv[1:]))
+    
+    from pylox.lox import Lox
+    
+    # 快速路径：没有任何选项时不导入argparse
+    if not argv:
+        Lox.run_prompt()
+        return
+    if len(argv) == 1 and not argv[0].startswith("-"):
+        Lox.run_file(argv[0])
+        return
+    
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.coverage is not None and args.lazy_parse:
+        parser.error("--coverage不能与--lazy-parse同时使用")
+    if args.script and args.validate_only:
+        sys.exit(Lox.validate_file(args.script))
+    if args.script:
+        Lox.run_file(args.script, args.debug, args.deep_stack, args.max_depth,
+                     args.line_buffered, args.profile, args.profile_output,
+                     sample_output=args.sample, sample_rate=args.sample_rate, stats=args.stats,
+                     coverage_output=args.coverage, budget=build_budget(args),
+                     lazy_parse=args.lazy_parse, module_cache=args.module_cache)
     else:
         Lox.run_prompt()
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
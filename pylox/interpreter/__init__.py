@@ -9,6 +9,6 @@
 
 from pylox.interpreter.interpreter import Interpreter
 from pylox.interpreter.environment import Environment
-from pylox.interpreter.runtime_error import RuntimeError
+from pylox.interpreter.runtime_error import RuntimeError, BudgetExceededError
 
-__all__ = ['Interpreter', 'Environment', 'RuntimeError'] 
\ No newline at end of file
+__all__ = ['Interpreter', 'Environment', 'RuntimeError', 'BudgetExceededError'] 
\ No newline at end of file
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+执行预算
+
+执行不可信的Lox代码时，用Budget限制一次运行的执行步数、运行时间和分配
+量，超出时抛出BudgetExceededError（一种Lox运行时错误）结束程序。
+
+任何不终止的程序都必然反复经过循环的回边或函数调用，BudgetInterpreter
+只在这两处计一步并检查预算，原生函数也不走快速调用路径，同样计步；实例
+和环境的分配在发生时计数，字符串拼接在产生新字符串时累计其长度并立即
+检查，避免在一次循环迭代中分配过量。原生容器的创建和增长、List.join等
+原生代码产生的字符串通过count_allocations和count_string_chars同样计入并
+立即检查。只有设置了预算时才会使用这个子类，普通执行路径没有任何检查。
+"""
+
+import time
+
+from pylox.interpreter.interpreter import Interpreter, BreakException
+from pylox.interpreter.lox_class import LoxClass
+from pylox.interpreter.runtime_error import RuntimeError, BudgetExceededError
+
+
+class NativeBudgetExceeded(Exception):
+    """
+    原生代码中超出预算
+
+    原生代码没有可以报告的标记，这个异常穿过原生方法，在调用它的
+    call_function中转换为带调用位置的BudgetExceededError。
+    """
+    pass
+
+
+class Budget:
+    """
+    一次运行的资源上限，各项为None时表示不限制
+    """
+
+    def __init__(self, max_steps=None, timeout=None, max_allocations=None, max_string_chars=None,
+                 clock=time.monotonic):
+        """
+        初始化预算
+
+        Args:
+            max_steps: int, 最多执行的步数（循环迭代次数与调用次数之和）
+            timeout: float, 最长运行时间（秒）
+            max_allocations: int, 最多创建的实例、环境和原生容器元素数
+            max_string_chars: int, 字符串拼接和原生代码产生的字符总数上限
+            clock: callable, 返回当前时间（秒）的函数
+        """
+        self.max_steps = max_steps
+        self.timeout = timeout
+        self.max_allocations = max_allocations
+        self.max_string_chars = max_string_chars
+        self.clock = clock
+
+    @classmethod
+    def from_dict(cls, limits):
+        """
+        从字典创建预算
+
+        Args:
+            limits: dict, 键为max_steps、timeout、max_allocations或max_string_chars
+
+        Returns:
+            Budget: 预算对象
+
+        Raises:
+            ValueError: 包含未知的键或值不是非负数
+        """
+        unknown = set(limits) - {"max_steps", "timeout", "max_allocations", "max_string_chars"}
+        if unknown:
+            raise ValueError(f"未知的预算项: {', '.join(sorted(unknown))}")
+        for key, value in limits.items():
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))
+                                      or value < 0):
+                raise ValueError(f"预算项{key}必须是非负数")
+        return cls(**limits)
+
+
+class BudgetInterpreter(Interpreter):
+    """
+    在循环回边和调用处检查执行预算的解释器
+    """
+
+    def __init__(self, *args, **kwargs):
+        """初始化解释器，预算为空时不限制"""
+        super().__init__(*args, **kwargs)
+        self.budget = Budget()
+        self.reset_budget()
+
+    def reset_budget(self):
+        """清零计数并重新开始计时"""
+        self.steps = 0
+        self.allocations = 0
+        self.string_chars = 0
+        timeout = self.budget.timeout
+        self.deadline = None if timeout is None else self.budget.clock() + timeout
+
+    def interpret(self, statements):
+        """
+        在新的预算周期中解释执行语句列表
+
+        Args:
+            statements: list[Stmt], 语句列表
+        """
+        self.reset_budget()
+        return super().interpret(statements)
+
+    def charge(self, token):
+        """
+        计一步并检查预算
+
+        Args:
+            token: Token, 用于报告错误位置的标记
+
+        Raises:
+            BudgetExceededError: 超出任一上限
+        """
+        self.steps += 1
+        budget = self.budget
+        if budget.max_steps is not None and self.steps > budget.max_steps:
+            raise BudgetExceededError(token, f"超出执行预算：执行步数超过{budget.max_steps}。")
+        if self.deadline is not None and budget.clock() > self.deadline:
+            raise BudgetExceededError(token, f"超出执行预算：运行时间超过{budget.timeout}秒。")
+        if budget.max_allocations is not None and self.allocations > budget.max_allocations:
+            raise BudgetExceededError(token, f"超出执行预算：分配的实例和环境超过{budget.max_allocations}个。")
+
+    def visit_while_stmt(self, stmt):
+        """访问while语句，每次迭代检查预算"""
+        while self.is_truthy(self.evaluate(stmt.condition)):
+            self.charge(stmt.keyword)
+            try:
+                self.execute(stmt.body)
+            except BreakException:
+                break
+        return None
+
+    def visit_call_expr(self, expr):
+        """访问函数调用表达式，原生函数同样经过call_function计步"""
+        callee = self.evaluate(expr.callee)
+        arguments = [self.evaluate(argument) for argument in expr.arguments]
+        if not hasattr(callee, 'call'):
+            raise RuntimeError(expr.paren, "只能调用函数和类。")
+        if len(arguments) != callee.arity():
+            raise RuntimeError(expr.paren, f"需要{callee.arity()}个参数但得到{len(arguments)}个。")
+        return self.call_function(callee, arguments, expr.paren)
+
+    def call_function(self, callee, arguments, paren):
+        """
+        检查预算后调用可调用对象，调用类时计数分配的实例
+
+        原生代码超出预算时在这里转换为带调用位置的BudgetExceededError。
+
+        Args:
+            callee: LoxCallable, 被调用对象
+            arguments: list, 参数值列表
+            paren: Token, 调用表达式的右括号标记，用于错误报告
+
+        Returns:
+            Any, 调用结果
+        """
+        if isinstance(callee, LoxClass):
+            self.allocations += 1
+        self.charge(paren)
+        try:
+            return super().call_function(callee, arguments, paren)
+        except NativeBudgetExceeded as error:
+            raise BudgetExceededError(paren, str(error))
+
+    def count_allocations(self, count):
+        """
+        计数原生代码的分配并立即检查
+
+        Args:
+            count: int, 分配的数量
+
+        Raises:
+            NativeBudgetExceeded: 超出分配上限
+        """
+        self.allocations += count
+        limit = self.budget.max_allocations
+        if limit is not None and self.allocations > limit:
+            raise NativeBudgetExceeded(f"超出执行预算：分配的实例和环境超过{limit}个。")
+
+    def count_string_chars(self, chars):
+        """
+        累计原生代码产生的字符串长度并立即检查
+
+        Args:
+            chars: int, 字符数
+
+        Raises:
+            NativeBudgetExceeded: 超出字符串上限
+        """
+        self.string_chars += chars
+        limit = self.budget.max_string_chars
+        if limit is not None and self.string_chars > limit:
+            raise NativeBudgetExceeded(f"超出执行预算：字符串拼接超过{limit}个字符。")
+
+    def execute_block(self, statements, environment):
+        """
+        执行代码块并计数分配的环境
+
+        Args:
+            statements: list[Stmt], 语句列表
+            environment: Environment, 执行环境
+        """
+        self.allocations += 1
+        return super().execute_block(statements, environment)
+
+    def visit_binary_expr(self, expr):
+        """访问二元表达式，累计拼接产生的字符串长度"""
+        value = super().visit_binary_expr(expr)
+        if value.__class__ is str:
+            self.string_chars += len(value)
+            limit = self.budget.max_string_chars
+            if limit is not None and self.string_chars > limit:
+                raise BudgetExceededError(expr.operator, f"超出执行预算：字符串拼接超过{limit}个字符。")
+        return value
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+行级执行计数和覆盖率
+
+CoverageInterpreter在每条语句执行时，按语句所在的源代码行累加执行次数。
+执行前先遍历整棵语法树登记所有可执行的行，因此从未执行过的行也会以0次
+出现在报告中。导入的模块按其文件分别计数，在报告中各占一条记录。报告可以
+输出为lcov格式（genhtml等工具可用）或JSON。
+
+同一行有多条语句时，该行的次数是这些语句执行次数之和。代码块只是其中语句
+的容器，本身不计数，否则块的第一条语句所在的行会被重复计数。
+"""
+
+from pylox.interpreter.interpreter import Interpreter
+from pylox.syntax_tree.locations import node_token, iter_nodes
+from pylox.syntax_tree.stmt import Stmt, Block, Class
+
+
+class LineCoverage:
+    """
+    各源代码文件中各行的执行次数
+    """
+
+    def __init__(self):
+        """初始化计数"""
+        self.locations = {}  # 语句 -> (所在文件, 行号)，缓存node_token的结果
+        self.files = {None: {}}  # 文件 -> {行号: 执行次数}，主程序为None，包含未执行的可执行行
+        self.hits = self.files[None]  # 主程序各行的执行次数
+
+    def register(self, statements):
+        """
+        登记语法树中所有可执行语句所在的行
+
+        类声明中的方法声明本身不会执行，只登记其方法体；代码块不登记。
+
+        Args:
+            statements: list[Stmt], 语句列表
+        """
+        methods = set()
+        for node in iter_nodes(statements):
+            if isinstance(node, Class):
+                methods.update(node.methods)
+            if isinstance(node, Stmt) and not isinstance(node, Block) and node not in methods:
+                file, line = self.location_of(node)
+                if line is not None:
+                    self.files.setdefault(file, {}).setdefault(line, 0)
+
+    def location_of(self, stmt):
+        """
+        获取语句所在的文件和行
+
+        Args:
+            stmt: Stmt, 语句对象
+
+        Returns:
+            tuple: (文件, 行号)，主程序的文件为None，无法确定时行号为None
+        """
+        location = self.locations.get(stmt)
+        if location is None:
+            token = node_token(stmt)
+            location = (None, None) if token is None else (token.file, token.line)
+            self.locations[stmt] = location
+        return location
+
+    def hit(self, stmt):
+        """
+        记录一次语句执行，代码块不计数
+
+        Args:
+            stmt: Stmt, 语句对象
+        """
+        if stmt.__class__ is Block:
+            return
+        file, line = self.location_of(stmt)
+        if line is not None:
+            hits = self.files.get(file)
+            if hits is None:
+                hits = self.files[file] = {}
+            hits[line] = hits.get(line, 0) + 1
+
+    def modules(self):
+        """
+        返回执行过程中导入的模块文件
+
+        Returns:
+            list[str]: 按路径排序的模块文件
+        """
+        return sorted(file for file in self.files if file is not None)
+
+    def summary(self, file=None):
+        """
+        统计一个文件的覆盖情况
+
+        Args:
+            file: str, 模块文件，None表示主程序
+
+        Returns:
+            dict: lines为可执行行数，covered为执行过的行数，percent为覆盖率
+        """
+        hits = self.files.get(file, {})
+        covered = sum(1 for count in hits.values() if count)
+        total = len(hits)
+        return {"lines": total, "covered": covered,
+                "percent": 100.0 * covered / total if total else 100.0}
+
+    def file_dict(self, file, path):
+        """
+        转换一个文件的计数
+
+        Args:
+            file: str, 模块文件，None表示主程序
+            path: str, 报告中的源文件路径
+
+        Returns:
+            dict: file为源文件，lines为行号（字符串）到执行次数的映射，summary为覆盖情况
+        """
+        hits = self.files.get(file, {})
+        return {
+            "file": path,
+            "lines": {str(line): hits[line] for line in sorted(hits)},
+            "summary": self.summary(file),
+        }
+
+    def to_dict(self, path):
+        """
+        转换为JSON报告使用的字典
+
+        Args:
+            path: str, 主程序的源文件路径
+
+        Returns:
+            dict: 主程序的file_dict，modules为各导入模块的file_dict列表
+        """
+        report = self.file_dict(None, path)
+        report["modules"] = [self.file_dict(file, file) for file in self.modules()]
+        return report
+
+    def format_lcov(self, path):
+        """
+        生成lcov格式的报告，每个源文件一条记录
+
+        Args:
+            path: str, 主程序的源文件路径
+
+        Returns:
+            str: lcov tracefile文本
+        """
+        lines = []
+        for file, name in [(None, path)] + [(file, file) for file in self.modules()]:
+            hits = self.files[file]
+            summary = self.summary(file)
+            lines.extend(["TN:", f"SF:{name}"])
+            lines.extend(f"DA:{line},{hits[line]}" for line in sorted(hits))
+            lines.extend([f"LF:{summary['lines']}", f"LH:{summary['covered']}", "end_of_record"])
+        return "\n".join(lines) + "\n"
+
+
+class CoverageInterpreter(Interpreter):
+    """
+    按行统计语句执行次数的解释器
+    """
+
+    def __init__(self, *args, **kwargs):
+        """初始化解释器和行计数"""
+        super().__init__(*args, **kwargs)
+        self.coverage = LineCoverage()
+
+    def interpret(self, statements):
+        """
+        登记可执行行后解释执行语句列表
+
+        Args:
+            statements: list[Stmt], 语句列表
+        """
+        self.coverage.register(statements)
+        return super().interpret(statements)
+
+    def execute(self, stmt):
+        """
+        执行语句并计数
+
+        Args:
+            stmt: Stmt, 语句对象
+
+        Returns:
+            Any, 执行结果
+        """
+        self.coverage.hit(stmt)
+        return super().execute(stmt)
+
+    def execute_module(self, path, statements):
+        """
+        登记模块的可执行行后执行模块
+
+        Args:
+            path: str, 模块文件路径
+            statements: list[Stmt], 语句列表
+        """
+        self.coverage.register(statements)
+        return super().execute_module(path, statements)
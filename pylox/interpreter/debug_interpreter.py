@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+调试解释器
+
+在基础解释器之上输出`[调试]`跟踪信息。只有以-d/--debug运行时才会
+使用此类，普通执行路径中的访问方法不包含任何调试判断。
+"""
+
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.runtime_error import RuntimeError
+
+
+class DebugInterpreter(Interpreter):
+    """
+    输出调试跟踪信息的解释器
+    """
+    
+    def trace(self, message):
+        """
+        输出一条调试信息
+        
+        Args:
+            message: str, 调试信息
+        """
+        self.output.write_line(f"[调试] {message}")
+    
+    def visit_print_stmt(self, stmt):
+        """访问print语句，先输出要打印的值"""
+        value = self.evaluate(stmt.expression)
+        text = self.stringify(value)
+        self.trace(f"打印值: {text}")
+        self.output.write_line(text)
+        return None
+    
+    def visit_super_expr(self, expr):
+        """访问super表达式，输出查找超类方法的每一步"""
+        self.trace(f"处理super表达式: {expr.method.lexeme}")
+        
+        distance = self.locals.get(expr)
+        self.trace(f"super作用域深度: {distance}")
+        
+        superclass = self.environment.get_at(distance, "super")
+        self.trace(f"获取到超类: {superclass}")
+        
+        instance = self.environment.get_at(distance - 1, "this")
+        self.trace(f"获取到实例: {instance}")
+        
+        method = superclass.find_method(expr.method.lexeme)
+        self.trace(f"在超类中查找方法: {expr.method.lexeme}, 结果: {method}")
+        
+        if method is None:
+            raise RuntimeError(expr.method, f"未定义的属性'{expr.method.lexeme}'。")
+        
+        return method.bind(instance)
+    
+    def visit_inner_expr(self, expr):
+        """访问inner表达式"""
+        self.trace(f"处理inner表达式: {expr.method.lexeme}")
+        return super().visit_inner_expr(expr)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+深栈执行模式
+
+树遍历解释器的每一层Lox调用大约消耗十几个Python栈帧，默认的
+sys.getrecursionlimit()只够支撑几十层Lox递归。本模块在一个拥有大栈的
+工作线程中运行解释器，并相应地提高递归限制，使Lox调用深度只受内存和
+可配置的max_call_depth约束。
+"""
+
+import sys
+import threading
+
+
+# 深栈模式下默认允许的最大Lox调用深度
+DEFAULT_MAX_CALL_DEPTH = 100000
+
+# 每层Lox调用预留的Python栈帧数量（包含访问者分发和异常处理的开销）
+FRAMES_PER_CALL = 32
+
+# 工作线程的栈大小（字节）
+DEFAULT_STACK_SIZE = 512 * 1024 * 1024
+
+
+def run_with_deep_stack(target, *args, max_call_depth=DEFAULT_MAX_CALL_DEPTH,
+                        stack_size=DEFAULT_STACK_SIZE, **kwargs):
+    """
+    在大栈工作线程中执行target
+
+    执行期间临时提高Python递归限制，结束后恢复原值。target抛出的异常
+    （包括SystemExit）会在调用线程中重新抛出。
+
+    Args:
+        target: callable, 要执行的函数
+        *args: 传给target的位置参数
+        max_call_depth: int, 需要支持的最大Lox调用深度
+        stack_size: int, 工作线程栈大小（字节）
+        **kwargs: 传给target的关键字参数
+
+    Returns:
+        target的返回值
+    """
+    outcome = {}
+
+    def runner():
+        try:
+            outcome["value"] = target(*args, **kwargs)
+        except BaseException as error:
+            outcome["error"] = error
+
+    old_limit = sys.getrecursionlimit()
+    old_stack_size = threading.stack_size()
+    try:
+        sys.setrecursionlimit(max(old_limit, max_call_depth * FRAMES_PER_CALL + 1000))
+        threading.stack_size(stack_size)
+        thread = threading.Thread(target=runner, name="pylox-deep-stack")
+        thread.start()
+        thread.join()
+    finally:
+        threading.stack_size(old_stack_size)
+        sys.setrecursionlimit(old_limit)
+
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("value")
@@ -6,6 +6,9 @@
 用于管理变量的存储与访问
 """
 
+from collections.abc import MutableMapping
+from itertools import count
+
 from pylox.interpreter.runtime_error import RuntimeError
 
 
@@ -26,6 +29,7 @@ class Environment:
         """
         self.values = {}
         self.enclosing = enclosing
+        self.display = None  # 从最外层到直接外层的祖先环境元组（静态链显示表），按需构建
     
     def define(self, name, value):
         """
@@ -47,11 +51,41 @@ class Environment:
         Returns:
             Environment: 找到的环境
         """
+        # 近距离访问直接沿enclosing走，比构建显示表更便宜
+        if distance == 0:
+            return self
+        if distance == 1:
+            return self.enclosing
+        if distance == 2:
+            return self.enclosing.enclosing
+        
+        display = self.display
+        if display is None:
+            display = self.build_display()
+        return display[-distance]
+    
+    def build_display(self):
+        """
+        构建显示表
+        
+        显示表是从最外层环境到直接外层环境的元组，构建后任意距离的祖先都
+        可以O(1)索引得到。显示表不包含环境自身，因此不会形成引用循环，环境
+        在不再使用时可以由引用计数立即释放。沿链向上只走到第一个已有显示表
+        的祖先，沿途每个环境都缓存自己的显示表，因此每个环境最多构建一次。
+        
+        Returns:
+            tuple: 显示表
+        """
+        chain = []
         environment = self
-        for _ in range(distance):
+        while environment is not None and environment.display is None:
+            chain.append(environment)
             environment = environment.enclosing
         
-        return environment
+        for environment in reversed(chain):
+            enclosing = environment.enclosing
+            environment.display = () if enclosing is None else enclosing.display + (enclosing,)
+        return self.display
     
     def get_at(self, distance, name):
         """
@@ -92,8 +126,8 @@ class Environment:
         Raises:
             RuntimeError: 变量未定义或未初始化
         """
-        if name.lexeme in self.values:
-            value = self.values[name.lexeme]
+        value = self.values.get(name.lexeme, UNDEFINED)
+        if value is not UNDEFINED:
             # 这里有特殊处理：如果值为None，可能表示未初始化的变量
             if value is None:
                 raise RuntimeError(name, f"未初始化的变量 '{name.lexeme}'。")
@@ -137,11 +171,293 @@ class Environment:
         Args:
             name_str: str, 变量名
             
+        Returns:
+            Any: 变量值，外部环境中都没有定义时为None
+        """
+        environment = self.enclosing
+        while environment is not None:
+            value = environment.values.get(name_str, UNDEFINED)
+            if value is not UNDEFINED:
+                return value
+            environment = environment.enclosing
+        return None
+
+class EnvironmentPool:
+    """
+    环境对象池
+    
+    为被证明不会逃逸（没有闭包捕获）的块和函数调用环境提供空闲列表，
+    执行结束后清空并回收，下次直接复用，避免频繁创建环境对象和字典。
+    同时记录分配计数，便于观察对象创建的减少。
+    """
+    
+    def __init__(self, max_size=256):
+        """
+        初始化环境池
+        
+        Args:
+            max_size: int, 空闲列表的最大长度
+        """
+        self.free = []  # 已清空、可复用的环境
+        self.max_size = max_size
+        self.allocated = 0  # 新创建的环境数量
+        self.reused = 0  # 从空闲列表复用的环境数量
+        self.released = 0  # 归还到池中的环境数量
+    
+    def acquire(self, enclosing):
+        """
+        获取一个以enclosing为外层的空环境
+        
+        Args:
+            enclosing: Environment, 外层环境
+            
+        Returns:
+            Environment: 可用的环境
+        """
+        if self.free:
+            environment = self.free.pop()
+            environment.enclosing = enclosing
+            self.reused += 1
+            return environment
+        
+        self.allocated += 1
+        return Environment(enclosing)
+    
+    def release(self, environment):
+        """
+        归还不再使用的环境
+        
+        调用者必须保证没有闭包或其他对象仍然引用该环境。
+        
+        Args:
+            environment: Environment, 要回收的环境
+        """
+        if len(self.free) < self.max_size:
+            environment.values.clear()
+            environment.enclosing = None
+            environment.display = None
+            self.free.append(environment)
+            self.released += 1
+    
+    def stats(self):
+        """
+        返回分配计数
+        
+        Returns:
+            dict: 新建、复用、回收的环境数量以及当前空闲数量
+        """
+        return {
+            "allocated": self.allocated,
+            "reused": self.reused,
+            "released": self.released,
+            "free": len(self.free),
+        }
+
+
+# 全局槽位的"未定义"标记，与表示"未初始化"的None区分
+UNDEFINED = object()
+
+# 全局变量名到槽位编号的映射，由所有全局环境共用：同一个名称在每个解释器中
+# 都是同一个槽位，解析时记录在语法树节点上的槽位因此对共享语法树的解释器都有效
+GLOBAL_SLOT_TABLE = {}
+_slot_numbers = count()  # next()在CPython中是原子操作，并发分配不会得到重复编号
+
+
+class GlobalValues(MutableMapping):
+    """
+    全局变量的名称到值的映射
+    
+    直接读写全局环境的槽位，不复制任何数据：通过它写入的值对槽位访问立即
+    可见，反之亦然。槽位为未定义标记的名称不在映射中。
+    """
+    
+    __slots__ = ("environment",)
+    
+    def __init__(self, environment):
+        """
+        初始化映射
+        
+        Args:
+            environment: GlobalEnvironment, 全局环境
+        """
+        self.environment = environment
+    
+    def get(self, name, default=None):
+        """
+        获取变量值，只查找一次名称表
+        
+        Args:
+            name: str, 变量名
+            default: Any, 变量未定义时返回的值
+            
         Returns:
             Any: 变量值
         """
-        if self.enclosing:
-            if name_str in self.enclosing.values:
-                return self.enclosing.values[name_str]
-            return self.enclosing.get_from_enclosing(name_str)
-        return None
\ No newline at end of file
+        index = self.environment.slot_table.get(name)
+        if index is None:
+            return default
+        value = self.environment.slot_value(index)
+        return default if value is UNDEFINED else value
+    
+    def __getitem__(self, name):
+        """按名获取变量值，未定义时抛出KeyError"""
+        value = self.get(name, UNDEFINED)
+        if value is UNDEFINED:
+            raise KeyError(name)
+        return value
+    
+    def __setitem__(self, name, value):
+        """定义或修改变量"""
+        self.environment.define(name, value)
+    
+    def __delitem__(self, name):
+        """把变量恢复为未定义，槽位保留"""
+        index = self.environment.slot_table.get(name)
+        if index is None or self.environment.slot_value(index) is UNDEFINED:
+            raise KeyError(name)
+        self.environment.slots[index] = UNDEFINED
+    
+    def __iter__(self):
+        """按定义顺序遍历已定义的变量名"""
+        slot_value = self.environment.slot_value
+        return (name for name, index in list(self.environment.slot_table.items())
+                if slot_value(index) is not UNDEFINED)
+    
+    def __len__(self):
+        """已定义的变量数量"""
+        return sum(1 for value in self.environment.slots if value is not UNDEFINED)
+    
+    def __repr__(self):
+        """返回与dict相同形式的表示"""
+        return repr(dict(self.items()))
+
+
+class GlobalEnvironment(Environment):
+    """
+    全局环境类
+    
+    全局变量存放在固定编号的槽位中。解析器在解析阶段为每个全局变量引用
+    分配槽位并记录在节点上，运行时通过列表索引读写，无需对变量名或节点做
+    哈希查找。槽位编号由全局共用的名称表分配，本环境的槽位列表按需补齐；
+    名称表用于按名访问，以及晚定义或REPL中新增的全局变量。
+    """
+    
+    def __init__(self):
+        """初始化全局环境"""
+        self.slots = []  # 槽位中的变量值
+        self.slot_table = GLOBAL_SLOT_TABLE  # 变量名到槽位的映射
+        self.enclosing = None
+        self.display = ()
+        self.values = GlobalValues(self)  # 按名访问槽位的映射，与槽位共享数据
+    
+    def slot_for(self, name):
+        """
+        获取变量名对应的槽位，不存在时分配新的槽位
+        
+        Args:
+            name: str, 变量名
+            
+        Returns:
+            int: 槽位编号
+        """
+        index = self.slot_table.get(name)
+        if index is None:
+            index = self.slot_table.setdefault(name, next(_slot_numbers))
+        missing = index + 1 - len(self.slots)
+        if missing > 0:
+            self.slots.extend([UNDEFINED] * missing)
+        return index
+    
+    def slot_value(self, index):
+        """
+        按槽位读取值，槽位超出本环境已分配的范围时视为未定义
+        
+        Args:
+            index: int, 槽位编号
+            
+        Returns:
+            变量的值，或未定义标记
+        """
+        slots = self.slots
+        return slots[index] if index < len(slots) else UNDEFINED
+    
+    def define(self, name, value):
+        """
+        定义全局变量
+        
+        Args:
+            name: str, 变量名
+            value: 任意类型，变量值
+        """
+        self.slots[self.slot_for(name)] = value
+    
+    def get_slot(self, index, name):
+        """
+        通过槽位获取全局变量的值
+        
+        Args:
+            index: int, 槽位编号
+            name: Token, 变量名标记，用于错误报告
+            
+        Returns:
+            变量的值
+            
+        Raises:
+            RuntimeError: 变量未定义或未初始化
+        """
+        value = self.slots[index]
+        if value is None:
+            raise RuntimeError(name, f"未初始化的变量 '{name.lexeme}'。")
+        if value is UNDEFINED:
+            raise RuntimeError(name, f"未定义的变量 '{name.lexeme}'。")
+        return value
+    
+    def assign_slot(self, index, name, value):
+        """
+        通过槽位给全局变量赋值
+        
+        Args:
+            index: int, 槽位编号
+            name: Token, 变量名标记，用于错误报告
+            value: 任意类型，变量值
+            
+        Raises:
+            RuntimeError: 变量未定义
+        """
+        if self.slots[index] is UNDEFINED:
+            raise RuntimeError(name, f"未定义的变量 '{name.lexeme}'。")
+        self.slots[index] = value
+    
+    def get(self, name):
+        """
+        按名获取全局变量的值
+        
+        Args:
+            name: Token, 变量名标记
+            
+        Returns:
+            变量的值
+            
+        Raises:
+            RuntimeError: 变量未定义或未初始化
+        """
+        index = self.slot_table.get(name.lexeme)
+        if index is None or index >= len(self.slots):
+            raise RuntimeError(name, f"未定义的变量 '{name.lexeme}'。")
+        return self.get_slot(index, name)
+    
+    def assign(self, name, value):
+        """
+        按名给全局变量赋值
+        
+        Args:
+            name: Token, 变量名标记
+            value: 任意类型，变量值
+            
+        Raises:
+            RuntimeError: 变量未定义
+        """
+        index = self.slot_table.get(name.lexeme)
+        if index is None or index >= len(self.slots):
+            raise RuntimeError(name, f"未定义的变量 '{name.lexeme}'。")
+        self.assign_slot(index, name, value)
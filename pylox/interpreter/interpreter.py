@@ -10,9 +10,16 @@
 from pylox.syntax_tree.visitor import Visitor
 from pylox.scanner.token_type import TokenType
 from pylox.interpreter.runtime_error import RuntimeError
-from pylox.interpreter.environment import Environment
+from pylox.interpreter.output import OutputSink
+from pylox.interpreter.environment import Environment, GlobalEnvironment, EnvironmentPool, UNDEFINED
 from pylox.interpreter.lox_callable import LoxFunction
 from pylox.interpreter.lox_class import LoxClass, LoxInstance
+from pylox.interpreter.natives.native_object import NativeObject, NativeError
+from pylox.interpreter.natives.registry import NativeFunction, registry
+# 内置原生值在这些模块导入时注册到默认注册表，安装注册表之前显式导入
+import pylox.interpreter.natives.clock
+import pylox.interpreter.natives.containers
+import pylox.interpreter.natives.numarray
 
 
 class Interpreter(Visitor):
@@ -22,17 +29,34 @@ class Interpreter(Visitor):
     遍历AST并执行代码，实现Visitor模式
     """
     
-    def __init__(self):
-        """初始化解释器"""
-        self.globals = Environment()  # 全局环境
+    def __init__(self, max_call_depth=None, output=None, lox=None):
+        """
+        初始化解释器
+        
+        Args:
+            max_call_depth: int, Lox调用栈的最大深度，默认为None表示不限制
+                            （此时深度受限于Python的递归限制）
+            output: OutputSink, print语句的输出目标，默认为缓冲写入sys.stdout
+            lox: 错误报告对象（LoxRuntime或Lox类），默认为pylox.lox.Lox
+        """
+        self.globals = GlobalEnvironment()  # 全局环境
         self.environment = self.globals  # 当前环境，初始为全局环境
-        from pylox.lox import Lox
-        self.lox = Lox  # Lox类，用于错误报告
+        if lox is None:
+            from pylox.lox import Lox
+            lox = Lox
+        self.lox = lox  # 错误报告对象
         self.locals = {}  # 局部变量表，存储表达式到作用域深度的映射
-        
-        # 初始化全局函数
-        from pylox.interpreter.natives.clock import Clock
-        self.globals.define("clock", Clock())
+        self.non_escaping = set()  # 环境不会被闭包捕获的块和函数节点
+        self.environment_pool = EnvironmentPool()  # 不逃逸环境的对象池
+        self.max_call_depth = max_call_depth
+        self.call_depth = 0  # 当前Lox调用栈深度
+        self.output = output if output is not None else OutputSink()
+        self.modules = set()  # 已导入（或正在导入）的模块路径
+        self.module_dirs = []  # 正在执行的模块所在目录栈，用于解析相对路径
+        
+        # 初始化全局函数：复制默认注册表，本解释器注册的原生值不影响其他解释器
+        self.natives = registry.copy()
+        self.natives.install(self.globals.define)
     
     def interpret(self, statements):
         """
@@ -53,8 +77,12 @@ class Interpreter(Visitor):
                     last_result = ret.value
             return last_result
         except RuntimeError as error:
+            # 先写出已缓冲的输出，保证错误信息出现在它们之后
+            self.output.flush()
             self.lox.runtime_error(error)
             return None
+        finally:
+            self.output.flush()
     
     def execute(self, stmt):
         """
@@ -68,6 +96,19 @@ class Interpreter(Visitor):
         """
         return stmt.accept(self)
     
+    def set_trace(self, callback):
+        """
+        安装或移除跟踪回调
+        
+        回调以callback(event, line, arg)调用，event为"statement"、"call"、
+        "return"或"exception"，详见pylox.interpreter.tracing。
+        
+        Args:
+            callback: callable, 跟踪回调，None表示移除
+        """
+        from pylox.interpreter.tracing import set_trace
+        set_trace(self, callback)
+    
     def resolve(self, expr, depth):
         """
         解析表达式的作用域深度
@@ -78,6 +119,65 @@ class Interpreter(Visitor):
         """
         self.locals[expr] = depth
     
+    def resolve_global(self, expr, name):
+        """
+        将全局变量引用解析为固定槽位
+        
+        槽位记录在节点上，读写时不需要查表。槽位编号由所有解释器共用的名称表
+        分配，共享语法树的解释器写入的是同一个值；每次解析都会重新写入，
+        从磁盘缓存载入的节点上残留的编号因此不会被使用。
+        
+        Args:
+            expr: Expr, 表达式对象
+            name: Token, 变量名标记
+        """
+        expr.slot = self.globals.slot_for(name.lexeme)
+    
+    def resolve_frame(self, node, escapes):
+        """
+        记录块或函数的环境是否可能被闭包捕获
+        
+        不会逃逸的环境在执行结束后可以回收到环境池中复用。
+        
+        Args:
+            node: Block | Function | Lambda, 拥有独立环境的语法树节点
+            escapes: bool, 环境是否可能被闭包捕获
+        """
+        if escapes:
+            self.non_escaping.discard(node)
+        else:
+            self.non_escaping.add(node)
+    
+    def forget(self, nodes):
+        """
+        释放语法树节点的解析结果
+        
+        REPL执行完一段输入后，其中不属于函数、Lambda或类的节点不会再被执行，
+        可以从解析结果中移除，避免长时间的会话不断积累。
+        
+        Args:
+            nodes: iterable, 语法树节点
+        """
+        for node in nodes:
+            self.locals.pop(node, None)
+            self.non_escaping.discard(node)
+    
+    def execute_module(self, path, statements):
+        """
+        在全局环境中执行导入的模块的顶层语句
+        
+        Args:
+            path: str, 模块文件路径
+            statements: list[Stmt], 已经完成变量解析的语句列表
+        """
+        environment = self.environment
+        self.environment = self.globals
+        try:
+            for statement in statements:
+                self.execute(statement)
+        finally:
+            self.environment = environment
+    
     def evaluate(self, expr):
         """
         计算表达式的值
@@ -141,14 +241,8 @@ class Interpreter(Visitor):
     
     def visit_print_stmt(self, stmt):
         """访问print语句"""
-        from pylox.lox import Lox
-        
         value = self.evaluate(stmt.expression)
-        
-        if Lox.debug_mode:
-            print(f"[调试] 打印值: {self.stringify(value)}")
-            
-        print(self.stringify(value))
+        self.output.write_line(self.stringify(value))
         return None
     
     def visit_var_stmt(self, stmt):
@@ -182,7 +276,13 @@ class Interpreter(Visitor):
     def visit_block_stmt(self, stmt):
         """访问块语句"""
         # 创建新环境并执行块中的语句
-        self.execute_block(stmt.statements, Environment(self.environment))
+        environment = self.environment_pool.acquire(self.environment)
+        try:
+            self.execute_block(stmt.statements, environment)
+        finally:
+            # 没有闭包捕获的块环境可以回收复用
+            if stmt in self.non_escaping:
+                self.environment_pool.release(environment)
         return None
     
     def visit_if_stmt(self, stmt):
@@ -213,6 +313,12 @@ class Interpreter(Visitor):
         self.environment.define(stmt.name.lexeme, function)
         return None
     
+    def visit_import_stmt(self, stmt):
+        """访问import语句，见pylox.modules"""
+        from pylox.modules import import_module
+        import_module(self, stmt)
+        return None
+    
     def visit_return_stmt(self, stmt):
         """访问return语句"""
         value = None
@@ -253,7 +359,7 @@ class Interpreter(Visitor):
             methods[method.name.lexeme] = function
         
         # 创建类对象
-        klass = LoxClass(stmt.name.lexeme, superclass, methods)
+        klass = LoxClass(stmt.name.lexeme, superclass, methods, stmt)
         
         # 如果有超类，弹出super环境
         if stmt.superclass is not None:
@@ -337,6 +443,17 @@ class Interpreter(Visitor):
         """访问函数调用表达式"""
         callee = self.evaluate(expr.callee)
         
+        # 原生函数快速路径：参数数量已预先计算，直接调用Python函数
+        if callee.__class__ is NativeFunction:
+            arguments = [self.evaluate(argument) for argument in expr.arguments]
+            if len(arguments) != callee.arity_count:
+                raise RuntimeError(expr.paren,
+                                   f"需要{callee.arity_count}个参数但得到{len(arguments)}个。")
+            try:
+                return callee.function(*arguments)
+            except NativeError as error:
+                raise RuntimeError(expr.paren, str(error))
+        
         # 计算参数值
         arguments = []
         for argument in expr.arguments:
@@ -351,12 +468,55 @@ class Interpreter(Visitor):
             raise RuntimeError(expr.paren, 
                               f"需要{callee.arity()}个参数但得到{len(arguments)}个。")
         
-        # 调用函数，并捕获可能的Return异常
+        return self.call_function(callee, arguments, expr.paren)
+    
+    def call_function(self, callee, arguments, paren):
+        """
+        调用可调用对象并维护Lox调用栈深度
+        
+        超过max_call_depth或耗尽Python递归限制时，抛出Lox运行时错误而不是
+        让RecursionError穿透到宿主程序。
+        
+        Args:
+            callee: LoxCallable, 被调用对象
+            arguments: list, 参数值列表
+            paren: Token, 调用表达式的右括号标记，用于错误报告
+            
+        Returns:
+            Any, 调用结果
+        """
+        if self.max_call_depth is not None and self.call_depth >= self.max_call_depth:
+            raise RuntimeError(paren, f"栈溢出：调用深度超过{self.max_call_depth}层。")
+        
+        self.call_depth += 1
         try:
             return callee.call(self, arguments)
         except Return as ret:
             # 函数调用中产生的Return异常在这里被捕获，并返回其值
             return ret.value
+        except NativeError as error:
+            # 原生代码的错误在调用处报告
+            raise RuntimeError(paren, str(error))
+        except RecursionError:
+            raise RuntimeError(paren, "栈溢出：超出Python递归限制，可使用--deep-stack模式运行。")
+        finally:
+            self.call_depth -= 1
+    
+    def count_allocations(self, count):
+        """
+        记录原生代码分配的对象或容器元素，普通解释器不计数
+        
+        Args:
+            count: int, 分配的数量
+        """
+    
+    def count_string_chars(self, chars):
+        """
+        记录原生代码产生的字符串长度，普通解释器不计数
+        
+        Args:
+            chars: int, 字符数
+        """
     
     def visit_get_expr(self, expr):
         """访问属性访问表达式"""
@@ -380,6 +540,10 @@ class Interpreter(Visitor):
             # 获取属性或方法
             return obj.get(expr.name, self)
         
+        # 原生对象（如List、Map）的方法
+        if isinstance(obj, NativeObject):
+            return obj.get(expr.name, self)
+        
         # 如果不是实例或类，抛出运行时错误
         raise RuntimeError(expr.name, "只能从实例或类上获取属性。")
     
@@ -402,35 +566,18 @@ class Interpreter(Visitor):
     
     def visit_super_expr(self, expr):
         """访问super表达式"""
-        from pylox.lox import Lox
-        
-        if Lox.debug_mode:
-            print(f"[调试] 处理super表达式: {expr.method.lexeme}")
-        
         # 获取super在环境中的深度
         distance = self.locals.get(expr)
         
-        if Lox.debug_mode:
-            print(f"[调试] super作用域深度: {distance}")
-        
         # 获取超类
         superclass = self.environment.get_at(distance, "super")
         
-        if Lox.debug_mode:
-            print(f"[调试] 获取到超类: {superclass}")
-        
         # 获取this实例（子类实例）
         instance = self.environment.get_at(distance - 1, "this")
         
-        if Lox.debug_mode:
-            print(f"[调试] 获取到实例: {instance}")
-        
         # 在超类中查找方法
         method = superclass.find_method(expr.method.lexeme)
         
-        if Lox.debug_mode:
-            print(f"[调试] 在超类中查找方法: {expr.method.lexeme}, 结果: {method}")
-        
         if method is None:
             raise RuntimeError(expr.method, f"未定义的属性'{expr.method.lexeme}'。")
         
@@ -454,26 +601,40 @@ class Interpreter(Visitor):
         Returns:
             Any, 变量值
         """
+        slot = expr.slot
+        if slot is not None:
+            # 已解析的全局变量，直接按槽位读取；None和未定义标记交给get_slot报错
+            value = self.globals.slots[slot]
+            if value is None or value is UNDEFINED:
+                return self.globals.get_slot(slot, name)
+            return value
+        
         distance = self.locals.get(expr)
         if distance is not None:
             # 局部变量，从指定深度的环境中获取
             return self.environment.get_at(distance, name.lexeme)
-        else:
-            # 全局变量，从全局环境中获取
-            return self.globals.get(name)
+        
+        # 未经解析的全局变量，按名查找
+        return self.globals.get(name)
     
     def visit_assign_expr(self, expr):
         """访问赋值表达式"""
         # 计算右侧表达式的值
         value = self.evaluate(expr.value)
         
+        slot = expr.slot
+        if slot is not None:
+            # 已解析的全局变量
+            self.globals.assign_slot(slot, expr.name, value)
+            return value
+        
         # 根据变量作用域深度进行赋值
         distance = self.locals.get(expr)
         if distance is not None:
             # 局部变量
             self.environment.assign_at(distance, expr.name, value)
         else:
-            # 全局变量
+            # 未经解析的全局变量
             self.globals.assign(expr.name, value)
         
         return value
@@ -573,11 +734,6 @@ class Interpreter(Visitor):
     
     def visit_inner_expr(self, expr):
         """访问inner表达式"""
-        from pylox.lox import Lox
-        
-        if Lox.debug_mode:
-            print(f"[调试] 处理inner表达式: {expr.method.lexeme}")
-        
         # 在BETA风格中，inner应该引用子类（如果有的话）
         # 但当前我们已经在最底层的类中，所以没有子类可以调用
         # 应该抛出运行时错误
@@ -7,7 +7,6 @@
 包含Lox语言中可调用对象的接口和函数实现类。
 """
 
-import time
 from abc import ABC, abstractmethod
 from pylox.interpreter.environment import Environment
 from pylox.interpreter.return_value import Return
@@ -92,49 +91,55 @@ class LoxFunction(LoxCallable):
             函数的返回值，或者None
         """
         # 创建一个新的环境
-        environment = Environment(self.closure)
+        pool = interpreter.environment_pool
+        environment = pool.acquire(self.closure)
         
-        # 检查闭包中是否有this，如果有则添加到当前环境
         try:
-            instance = self.closure.get_at(0, "this")
-            # 在执行环境中定义this
-            environment.define("this", instance)
-            
-            # 为inner()调用添加特殊处理
-            if hasattr(instance, 'klass'):
-                # 创建inner可调用对象
-                inner_func = InnerFunction(instance, self.declaration.name.lexeme)
+            # 检查闭包中是否有this，如果有则添加到当前环境
+            try:
+                instance = self.closure.get_at(0, "this")
+                # 在执行环境中定义this
+                environment.define("this", instance)
                 
-                # 将inner作为函数添加到环境中
-                environment.define("inner", inner_func)
-        except RuntimeError:
-            pass  # 闭包中没有this，忽略
-        
-        # 只有非getter方法才需要绑定参数
-        if not self.is_getter:
-            # 将参数绑定到函数参数上
-            for i in range(len(self.declaration.params)):
-                environment.define(self.declaration.params[i].lexeme, arguments[i])
-        
-        try:
-            # 执行函数体
-            result = interpreter.execute_block(self.declaration.body, environment)
-        except Return as return_value:
-            # 处理返回值
+                # 为inner()调用添加特殊处理
+                if hasattr(instance, 'klass'):
+                    # 创建inner可调用对象
+                    inner_func = InnerFunction(instance, self.declaration.name.lexeme)
+                    
+                    # 将inner作为函数添加到环境中
+                    environment.define("inner", inner_func)
+            except RuntimeError:
+                pass  # 闭包中没有this，忽略
+            
+            # 只有非getter方法才需要绑定参数
+            if not self.is_getter:
+                # 将参数绑定到函数参数上
+                for i in range(len(self.declaration.params)):
+                    environment.define(self.declaration.params[i].lexeme, arguments[i])
+            
+            try:
+                # 执行函数体
+                result = interpreter.execute_block(self.declaration.body, environment)
+            except Return as return_value:
+                # 处理返回值
+                if self.is_initializer:
+                    # 如果是初始化方法，始终返回this
+                    return self.closure.get_at(0, "this")
+                return return_value.value
+            except Exception as e:
+                # 其他异常直接重新抛出
+                raise
+            
+            # 如果是初始化方法，返回this
             if self.is_initializer:
-                # 如果是初始化方法，始终返回this
                 return self.closure.get_at(0, "this")
-            return return_value.value
-        except Exception as e:
-            # 其他异常直接重新抛出
-            raise
-        
-        # 如果是初始化方法，返回this
-        if self.is_initializer:
-            return self.closure.get_at(0, "this")
-        
-        # 默认返回nil
-        return None
+            
+            # 默认返回nil
+            return None
+        finally:
+            # 没有闭包捕获的调用环境可以回收复用
+            if self.declaration in interpreter.non_escaping:
+                pool.release(environment)
         
     def bind(self, instance):
         """
@@ -253,45 +258,6 @@ class LoxLambda(LoxCallable):
         return "<lambda fn>"
 
 
-class Clock(LoxCallable):
-    """
-    内置函数: clock()
-    
-    返回当前的系统时间（以秒为单位）。
-    """
-    
-    def call(self, interpreter, arguments):
-        """
-        返回当前时间（秒）
-        
-        Args:
-            interpreter: Interpreter, 解释器实例
-            arguments: list, 参数列表
-            
-        Returns:
-            float: 当前时间（秒）
-        """
-        return time.time()
-        
-    def arity(self):
-        """
-        返回所需参数数量
-        
-        Returns:
-            int: 0，不需要参数
-        """
-        return 0
-        
-    def __str__(self):
-        """
-        返回函数的字符串表示
-        
-        Returns:
-            str: 函数的字符串表示
-        """
-        return "<native fn: clock>"
-
-
 class InnerFunction(LoxCallable):
     """
     Inner函数实现
@@ -18,7 +18,7 @@ class LoxClass(LoxCallable):
     表示一个Lox类，可以被实例化并包含方法。
     """
     
-    def __init__(self, name, superclass, methods):
+    def __init__(self, name, superclass, methods, declaration=None):
         """
         初始化Lox类
         
@@ -26,8 +26,10 @@ class LoxClass(LoxCallable):
             name: str, 类名
             superclass: LoxClass, 父类，可以为None
             methods: dict, 方法字典，键为方法名，值为LoxFunction对象
+            declaration: Class, AST中的类声明节点，默认为None
         """
         self.name = name
+        self.declaration = declaration
         self.superclass = superclass
         self.methods = {}
         self.static_methods = {}
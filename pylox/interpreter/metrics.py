@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+运行统计
+
+Metrics记录一次运行各阶段（词法分析、语法分析、变量解析、解释执行）的
+耗时和规模，以及解释执行期间的运行时计数。运行时计数由MetricsInterpreter
+在相应的访问方法中累加，只有以--stats运行或创建LoxRuntime(stats=True)时
+才会使用这个子类，普通执行路径没有任何计数开销。进入的环境可能来自环境池，
+报告同时给出环境池的统计，区分新建和复用的环境。
+"""
+
+import time
+
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.lox_class import LoxClass
+from pylox.syntax_tree.locations import iter_nodes
+
+
+# 阶段名 -> 报告中的名称
+PHASES = {"scan": "词法分析", "parse": "语法分析", "resolve": "变量解析", "interpret": "解释执行"}
+
+# 计数器名 -> 报告中的名称
+COUNTERS = {
+    "tokens": "标记",
+    "ast_nodes": "语法树节点",
+    "resolved_locals": "已解析的局部变量引用",
+    "calls": "Lox调用",
+    "environments": "进入的环境",
+    "instances": "创建的实例",
+    "property_lookups": "属性读取",
+    "control_exceptions": "控制流异常（return/break）",
+}
+
+
+def count_nodes(nodes):
+    """
+    统计语法树节点数
+
+    Args:
+        nodes: list[Stmt], 语句列表
+
+    Returns:
+        int: 语句和表达式节点的总数
+    """
+    return sum(1 for _ in iter_nodes(nodes))
+
+
+class Metrics:
+    """
+    一个运行时累计的阶段耗时和计数
+    """
+
+    def __init__(self, clock=time.perf_counter, environment_pool=None):
+        """
+        初始化统计数据
+
+        Args:
+            clock: callable, 返回当前时间（秒）的函数
+            environment_pool: EnvironmentPool, 解释器的环境池，None表示不报告
+        """
+        self.clock = clock
+        self.environment_pool = environment_pool
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        for name in COUNTERS:
+            setattr(self, name, 0)
+        self.lap_start = None
+
+    def start_lap(self):
+        """开始计时下一个阶段"""
+        self.lap_start = self.clock()
+
+    def lap(self, phase):
+        """
+        把上次计时以来的耗时计入阶段，并开始计时下一个阶段
+
+        Args:
+            phase: str, PHASES中的阶段名
+        """
+        now = self.clock()
+        self.phases[phase] += now - self.lap_start
+        self.lap_start = now
+
+    def to_dict(self):
+        """
+        转换为字典
+
+        Returns:
+            dict: phases为各阶段耗时（秒），environment_pool为环境池的stats()
+                  （有环境池时），其余为各计数器的值
+        """
+        result = {"phases": dict(self.phases)}
+        for name in COUNTERS:
+            result[name] = getattr(self, name)
+        if self.environment_pool is not None:
+            result["environment_pool"] = self.environment_pool.stats()
+        return result
+
+    def format_report(self):
+        """
+        生成文本报告
+
+        Returns:
+            str: 各阶段耗时和计数器的报告
+        """
+        lines = ["[统计] 阶段耗时:"]
+        for phase, label in PHASES.items():
+            lines.append(f"  {label}: {self.phases[phase]:.6f}s")
+        lines.append("[统计] 计数:")
+        for name, label in COUNTERS.items():
+            lines.append(f"  {label}: {getattr(self, name)}")
+        if self.environment_pool is not None:
+            pool = self.environment_pool.stats()
+            lines.append(f"  环境池: 新建{pool['allocated']}，复用{pool['reused']}，"
+                         f"回收{pool['released']}，空闲{pool['free']}")
+        return "\n".join(lines)
+
+
+class MetricsInterpreter(Interpreter):
+    """
+    在执行期间累加运行时计数的解释器
+    """
+
+    def __init__(self, *args, **kwargs):
+        """初始化解释器和统计数据"""
+        super().__init__(*args, **kwargs)
+        self.metrics = Metrics(environment_pool=self.environment_pool)
+
+    def execute_block(self, statements, environment):
+        """
+        执行代码块并计数进入的环境
+
+        块和函数体每次执行都会进入一个新环境（可能来自环境池）。
+
+        Args:
+            statements: list[Stmt], 语句列表
+            environment: Environment, 执行环境
+        """
+        self.metrics.environments += 1
+        return super().execute_block(statements, environment)
+
+    def call_function(self, callee, arguments, paren):
+        """
+        调用可调用对象并计数，调用类时同时计数创建的实例
+
+        Args:
+            callee: LoxCallable, 被调用对象
+            arguments: list, 参数值列表
+            paren: Token, 调用表达式的右括号标记，用于错误报告
+
+        Returns:
+            Any, 调用结果
+        """
+        self.metrics.calls += 1
+        if isinstance(callee, LoxClass):
+            self.metrics.instances += 1
+        return super().call_function(callee, arguments, paren)
+
+    def visit_get_expr(self, expr):
+        """访问属性访问表达式并计数"""
+        self.metrics.property_lookups += 1
+        return super().visit_get_expr(expr)
+
+    def visit_return_stmt(self, stmt):
+        """访问return语句并计数用于控制流的异常"""
+        self.metrics.control_exceptions += 1
+        return super().visit_return_stmt(stmt)
+
+    def visit_break_stmt(self, stmt):
+        """访问break语句并计数用于控制流的异常"""
+        self.metrics.control_exceptions += 1
+        return super().visit_break_stmt(stmt)
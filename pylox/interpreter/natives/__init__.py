@@ -5,6 +5,12 @@
 原生函数模块
 """
 
-from pylox.interpreter.natives.clock import Clock
+from pylox.interpreter.natives.registry import NativeFunction, NativeRegistry, registry, native
+from pylox.interpreter.natives.clock import clock
+from pylox.interpreter.natives.native_object import NativeObject, NativeMethod, NativeError
+from pylox.interpreter.natives.containers import LoxList, LoxMap, ListClass, MapClass
+from pylox.interpreter.natives.numarray import NumArray, NumArrayClass
 
-__all__ = ["Clock"]
\ No newline at end of file
+__all__ = ["NativeFunction", "NativeRegistry", "registry", "native", "clock",
+           "NativeObject", "NativeMethod", "NativeError",
+           "LoxList", "LoxMap", "ListClass", "MapClass", "NumArray", "NumArrayClass"]
\ No newline at end of file
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+List和Map原生容器类型
+
+分别以Python的list和dict为底层存储，让Lox脚本以原生容器的速度处理数据。
+创建容器和容器增长的元素数通过interpreter.count_allocations计入执行预算，
+join产生的字符串通过interpreter.count_string_chars计入。
+
+用法示例:
+    var list = List();
+    list.append(1);
+    print list.get(0);
+    list.forEach(fun (item) { print item; });
+
+    var map = Map();
+    map.set("key", "value");
+    print map.has("key");
+"""
+
+from pylox.interpreter.lox_callable import LoxCallable
+from pylox.interpreter.natives.registry import registry
+from pylox.interpreter.natives.native_object import (
+    NativeObject, NativeError, invoke, to_index, format_value
+)
+
+
+class LoxList(NativeObject):
+    """
+    Lox列表
+    
+    以Python list存储元素的有序容器。
+    """
+    
+    methods = {
+        "append": (1, "append"),
+        "get": (1, "get_item"),
+        "set": (2, "set_item"),
+        "insert": (2, "insert"),
+        "remove": (1, "remove"),
+        "pop": (0, "pop"),
+        "length": (0, "length"),
+        "contains": (1, "contains"),
+        "indexOf": (1, "index_of"),
+        "slice": (2, "slice"),
+        "join": (1, "join"),
+        "forEach": (1, "for_each"),
+        "map": (1, "map"),
+        "filter": (1, "filter"),
+    }
+    
+    def __init__(self, items=None):
+        """
+        初始化列表
+        
+        Args:
+            items: list, 初始元素，默认为空
+        """
+        self.items = items if items is not None else []
+    
+    def append(self, interpreter, value):
+        """在末尾追加元素"""
+        interpreter.count_allocations(1)
+        self.items.append(value)
+        return None
+    
+    def get_item(self, interpreter, index):
+        """获取指定下标的元素"""
+        return self.items[to_index(index, len(self.items))]
+    
+    def set_item(self, interpreter, index, value):
+        """设置指定下标的元素，返回设置的值"""
+        self.items[to_index(index, len(self.items))] = value
+        return value
+    
+    def insert(self, interpreter, index, value):
+        """在指定下标前插入元素，下标可以等于长度（即追加）"""
+        index = to_index(index, len(self.items) + 1)
+        interpreter.count_allocations(1)
+        self.items.insert(index, value)
+        return None
+    
+    def remove(self, interpreter, index):
+        """删除并返回指定下标的元素"""
+        return self.items.pop(to_index(index, len(self.items)))
+    
+    def pop(self, interpreter):
+        """删除并返回最后一个元素"""
+        if not self.items:
+            raise NativeError("不能从空列表中弹出元素。")
+        return self.items.pop()
+    
+    def length(self, interpreter):
+        """返回元素数量"""
+        return float(len(self.items))
+    
+    def contains(self, interpreter, value):
+        """判断是否包含元素"""
+        return value in self.items
+    
+    def index_of(self, interpreter, value):
+        """返回元素第一次出现的下标，不存在时返回-1"""
+        try:
+            return float(self.items.index(value))
+        except ValueError:
+            return -1.0
+    
+    def slice(self, interpreter, start, end):
+        """返回[start, end)范围内元素组成的新列表"""
+        length = len(self.items)
+        start = to_index(start, length + 1)
+        end = to_index(end, length + 1)
+        interpreter.count_allocations(max(0, end - start))
+        return LoxList(self.items[start:end])
+    
+    def join(self, interpreter, separator):
+        """用分隔符把元素连接成字符串"""
+        if not isinstance(separator, str):
+            raise NativeError("分隔符必须是字符串。")
+        text = separator.join(
+            item if isinstance(item, str) else format_value(item) for item in self.items
+        )
+        interpreter.count_string_chars(len(text))
+        return text
+    
+    def for_each(self, interpreter, function):
+        """对每个元素调用函数"""
+        for item in list(self.items):
+            invoke(interpreter, function, [item])
+        return None
+    
+    def map(self, interpreter, function):
+        """返回对每个元素调用函数的结果组成的新列表"""
+        interpreter.count_allocations(len(self.items))
+        return LoxList([invoke(interpreter, function, [item]) for item in list(self.items)])
+    
+    def filter(self, interpreter, function):
+        """返回使函数结果为真的元素组成的新列表"""
+        interpreter.count_allocations(len(self.items))
+        return LoxList([
+            item for item in list(self.items)
+            if interpreter.is_truthy(invoke(interpreter, function, [item]))
+        ])
+    
+    def __str__(self):
+        """
+        返回列表的字符串表示
+        
+        Returns:
+            str: 形如[1, 2, 3]的字符串
+        """
+        return "[" + ", ".join(format_value(item) for item in self.items) + "]"
+
+
+class LoxMap(NativeObject):
+    """
+    Lox映射
+    
+    以Python dict存储键值对的容器，键可以是数字、字符串、布尔值或对象。
+    Python中true == 1且hash相同，所以dict的键是带类型标记的(type(key), key)，
+    true和1是不同的键。
+    """
+    
+    methods = {
+        "get": (1, "get_item"),
+        "set": (2, "set_item"),
+        "has": (1, "has"),
+        "remove": (1, "remove"),
+        "length": (0, "length"),
+        "keys": (0, "keys"),
+        "values": (0, "values"),
+        "forEach": (1, "for_each"),
+    }
+    
+    def __init__(self):
+        """初始化映射"""
+        self.entries = {}
+    
+    def get_item(self, interpreter, key):
+        """获取键对应的值，键不存在时返回nil"""
+        return self.entries.get(self.check_key(key))
+    
+    def set_item(self, interpreter, key, value):
+        """设置键对应的值，返回设置的值"""
+        key = self.check_key(key)
+        if key not in self.entries:
+            interpreter.count_allocations(1)
+        self.entries[key] = value
+        return value
+    
+    def has(self, interpreter, key):
+        """判断是否包含键"""
+        return self.check_key(key) in self.entries
+    
+    def remove(self, interpreter, key):
+        """删除键并返回其值，键不存在时返回nil"""
+        return self.entries.pop(self.check_key(key), None)
+    
+    def length(self, interpreter):
+        """返回键值对数量"""
+        return float(len(self.entries))
+    
+    def keys(self, interpreter):
+        """返回所有键组成的列表"""
+        interpreter.count_allocations(len(self.entries))
+        return LoxList([key for _, key in self.entries])
+    
+    def values(self, interpreter):
+        """返回所有值组成的列表"""
+        interpreter.count_allocations(len(self.entries))
+        return LoxList(list(self.entries.values()))
+    
+    def for_each(self, interpreter, function):
+        """对每个键值对调用函数(key, value)"""
+        for (_, key), value in list(self.entries.items()):
+            invoke(interpreter, function, [key, value])
+        return None
+    
+    def check_key(self, key):
+        """
+        检查键是否可以作为映射的键
+        
+        Args:
+            key: Any, Lox值
+            
+        Returns:
+            tuple: 带类型标记的键(type(key), key)
+            
+        Raises:
+            NativeError: 键不可哈希（例如nil）
+        """
+        if key is None:
+            raise NativeError("映射的键不能是nil。")
+        return (type(key), key)
+    
+    def __str__(self):
+        """
+        返回映射的字符串表示
+        
+        Returns:
+            str: 形如{"a": 1}的字符串
+        """
+        return "{" + ", ".join(
+            f"{format_value(key)}: {format_value(value)}" for (_, key), value in self.entries.items()
+        ) + "}"
+
+
+class ListClass(LoxCallable):
+    """
+    原生函数: List()
+    
+    创建一个空列表。
+    """
+    
+    def call(self, interpreter, arguments):
+        """创建空列表"""
+        interpreter.count_allocations(1)
+        return LoxList()
+    
+    def arity(self):
+        """不需要参数"""
+        return 0
+    
+    def __str__(self):
+        """返回字符串表示"""
+        return "<native class List>"
+
+
+class MapClass(LoxCallable):
+    """
+    原生函数: Map()
+    
+    创建一个空映射。
+    """
+    
+    def call(self, interpreter, arguments):
+        """创建空映射"""
+        interpreter.count_allocations(1)
+        return LoxMap()
+    
+    def arity(self):
+        """不需要参数"""
+        return 0
+    
+    def __str__(self):
+        """返回字符串表示"""
+        return "<native class Map>"
+
+
+registry.register("List", ListClass())
+registry.register("Map", MapClass())
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+原生对象支持
+
+为用Python实现的Lox对象（如List、Map）提供属性访问和方法调用的公共基础。
+"""
+
+import math
+
+from pylox.interpreter.lox_callable import LoxCallable
+from pylox.interpreter.runtime_error import RuntimeError
+
+
+class NativeError(Exception):
+    """
+    原生代码错误
+
+    原生函数或方法在参数非法时抛出此异常，解释器在调用处将其转换为带有
+    调用位置信息的Lox运行时错误。
+    """
+    pass
+
+
+class NativeObject:
+    """
+    原生对象基类
+
+    子类在methods中声明可从Lox调用的方法：方法名 -> (参数数量, Python方法名)。
+    对应的Python方法签名为 method(interpreter, *arguments)。
+    """
+
+    methods = {}
+
+    def get(self, name, interpreter):
+        """
+        获取原生方法
+
+        Args:
+            name: Token, 方法名标记
+            interpreter: Interpreter, 解释器实例
+
+        Returns:
+            NativeMethod: 绑定到此对象的原生方法
+
+        Raises:
+            RuntimeError: 方法不存在
+        """
+        spec = self.methods.get(name.lexeme)
+        if spec is None:
+            raise RuntimeError(name, f"未定义的属性 '{name.lexeme}'。")
+        arity, attribute = spec
+        return NativeMethod(name.lexeme, arity, getattr(self, attribute))
+
+
+class NativeMethod(LoxCallable):
+    """
+    绑定到原生对象的方法
+    """
+
+    def __init__(self, name, arity, function):
+        """
+        初始化原生方法
+
+        Args:
+            name: str, 方法名
+            arity: int, 参数数量
+            function: callable, 绑定的Python方法
+        """
+        self.name = name
+        self._arity = arity
+        self.function = function
+
+    def call(self, interpreter, arguments):
+        """
+        调用原生方法
+
+        Args:
+            interpreter: Interpreter, 解释器实例
+            arguments: list, 参数列表
+
+        Returns:
+            方法返回值
+        """
+        return self.function(interpreter, *arguments)
+
+    def arity(self):
+        """
+        返回参数数量
+
+        Returns:
+            int: 参数数量
+        """
+        return self._arity
+
+    def __str__(self):
+        """
+        返回方法的字符串表示
+
+        Returns:
+            str: 方法的字符串表示
+        """
+        return f"<native method {self.name}>"
+
+
+def invoke(interpreter, callee, arguments):
+    """
+    从原生代码中调用Lox可调用对象（如forEach的回调）
+
+    Args:
+        interpreter: Interpreter, 解释器实例
+        callee: LoxCallable, 被调用对象
+        arguments: list, 参数列表
+
+    Returns:
+        调用结果
+
+    Raises:
+        NativeError: 不是可调用对象或参数数量不匹配
+    """
+    if not hasattr(callee, 'call'):
+        raise NativeError("回调参数必须是函数。")
+    if callee.arity() != len(arguments):
+        raise NativeError(f"回调函数需要{callee.arity()}个参数但得到{len(arguments)}个。")
+
+    from pylox.interpreter.interpreter import Return
+    try:
+        return callee.call(interpreter, arguments)
+    except Return as ret:
+        return ret.value
+
+
+def to_index(value, length):
+    """
+    将Lox数字转换为合法的列表下标
+
+    Args:
+        value: Any, Lox值
+        length: int, 列表长度
+
+    Returns:
+        int: 下标
+
+    Raises:
+        NativeError: 不是整数（包括无穷大和NaN）或越界
+    """
+    if (isinstance(value, bool) or not isinstance(value, (int, float))
+            or not math.isfinite(value) or int(value) != value):
+        raise NativeError("列表下标必须是整数。")
+    index = int(value)
+    if index < 0 or index >= length:
+        raise NativeError(f"列表下标{index}越界，长度为{length}。")
+    return index
+
+
+def format_value(value):
+    """
+    按Lox的规则格式化容器中的元素
+
+    Args:
+        value: Any, Lox值
+
+    Returns:
+        str: 字符串表示
+    """
+    if value is None:
+        return "nil"
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, float):
+        text = str(value)
+        return text[:-2] if text.endswith(".0") else text
+    if isinstance(value, str):
+        return f'"{value}"'
+    return str(value)
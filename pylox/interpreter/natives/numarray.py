@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NumArray原生数值数组
+
+以NumPy数组为底层存储，把逐元素运算和归约交给向量化的C实现，
+避免在Lox的while循环里逐个处理数字。NumPy是可选依赖，只在创建
+NumArray时才导入；未安装时调用NumArray()会报告明确的运行时错误。
+新数组的元素数计入执行预算的分配量。
+
+用法示例:
+    var values = List();
+    values.append(1);
+    values.append(2);
+    var a = NumArray(values);     // 从List创建
+    var b = NumArray(3);          // 长度为3的零数组
+    print a.mul(2).add(1).sum();
+    print a.dot(a);
+"""
+
+import math
+
+from pylox.interpreter.lox_callable import LoxCallable
+from pylox.interpreter.natives.registry import registry
+from pylox.interpreter.natives.native_object import NativeObject, NativeError, to_index
+from pylox.interpreter.natives.containers import LoxList
+
+
+def load_numpy():
+    """
+    导入NumPy
+
+    Returns:
+        module: numpy模块
+
+    Raises:
+        NativeError: 未安装NumPy
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise NativeError("NumArray需要NumPy，请先安装: pip install numpy")
+    return numpy
+
+
+class NumArray(NativeObject):
+    """
+    NumPy支持的一维数值数组
+    """
+
+    methods = {
+        "add": (1, "add"),
+        "sub": (1, "sub"),
+        "mul": (1, "mul"),
+        "div": (1, "div"),
+        "dot": (1, "dot"),
+        "sum": (0, "sum"),
+        "min": (0, "min"),
+        "max": (0, "max"),
+        "mean": (0, "mean"),
+        "slice": (2, "slice"),
+        "get": (1, "get_item"),
+        "set": (2, "set_item"),
+        "length": (0, "length"),
+        "toList": (0, "to_list"),
+    }
+
+    def __init__(self, array):
+        """
+        初始化数值数组
+
+        Args:
+            array: numpy.ndarray, 一维float64数组
+        """
+        self.array = array
+
+    def operand(self, value):
+        """
+        将Lox值转换为参与运算的操作数
+
+        Args:
+            value: NumArray | float, 另一个数组或标量
+
+        Returns:
+            numpy.ndarray | float: 操作数
+
+        Raises:
+            NativeError: 类型不支持或长度不一致
+        """
+        if isinstance(value, NumArray):
+            if len(value.array) != len(self.array):
+                raise NativeError(
+                    f"数组长度不一致: {len(self.array)} 和 {len(value.array)}。")
+            return value.array
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+        raise NativeError("操作数必须是NumArray或数字。")
+
+    def add(self, interpreter, other):
+        """逐元素相加"""
+        operand = self.operand(other)
+        interpreter.count_allocations(len(self.array))
+        return NumArray(self.array + operand)
+
+    def sub(self, interpreter, other):
+        """逐元素相减"""
+        operand = self.operand(other)
+        interpreter.count_allocations(len(self.array))
+        return NumArray(self.array - operand)
+
+    def mul(self, interpreter, other):
+        """逐元素相乘"""
+        operand = self.operand(other)
+        interpreter.count_allocations(len(self.array))
+        return NumArray(self.array * operand)
+
+    def div(self, interpreter, other):
+        """逐元素相除"""
+        divisor = self.operand(other)
+        if not isinstance(divisor, float):
+            if (divisor == 0).any():
+                raise NativeError("除数不能为零。")
+        elif divisor == 0:
+            raise NativeError("除数不能为零。")
+        interpreter.count_allocations(len(self.array))
+        return NumArray(self.array / divisor)
+
+    def dot(self, interpreter, other):
+        """点积"""
+        if not isinstance(other, NumArray):
+            raise NativeError("dot的参数必须是NumArray。")
+        return float(self.array.dot(self.operand(other)))
+
+    def sum(self, interpreter):
+        """元素之和"""
+        return float(self.array.sum())
+
+    def min(self, interpreter):
+        """最小元素"""
+        self.check_not_empty("min")
+        return float(self.array.min())
+
+    def max(self, interpreter):
+        """最大元素"""
+        self.check_not_empty("max")
+        return float(self.array.max())
+
+    def mean(self, interpreter):
+        """平均值"""
+        self.check_not_empty("mean")
+        return float(self.array.mean())
+
+    def slice(self, interpreter, start, end):
+        """返回[start, end)范围的副本"""
+        length = len(self.array)
+        start = to_index(start, length + 1)
+        end = to_index(end, length + 1)
+        interpreter.count_allocations(max(0, end - start))
+        return NumArray(self.array[start:end].copy())
+
+    def get_item(self, interpreter, index):
+        """获取指定下标的元素"""
+        return float(self.array[to_index(index, len(self.array))])
+
+    def set_item(self, interpreter, index, value):
+        """设置指定下标的元素，值必须是数字"""
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise NativeError("NumArray的元素必须是数字。")
+        self.array[to_index(index, len(self.array))] = value
+        return value
+
+    def length(self, interpreter):
+        """元素数量"""
+        return float(len(self.array))
+
+    def to_list(self, interpreter):
+        """转换为List"""
+        interpreter.count_allocations(len(self.array))
+        return LoxList([float(item) for item in self.array])
+
+    def check_not_empty(self, operation):
+        """
+        检查数组非空
+
+        Args:
+            operation: str, 操作名，用于错误信息
+
+        Raises:
+            NativeError: 数组为空
+        """
+        if len(self.array) == 0:
+            raise NativeError(f"不能对空数组执行{operation}。")
+
+    def __str__(self):
+        """
+        返回数组的字符串表示
+
+        Returns:
+            str: 字符串表示
+        """
+        items = []
+        for item in self.array:
+            text = str(float(item))
+            items.append(text[:-2] if text.endswith(".0") else text)
+        return "NumArray[" + ", ".join(items) + "]"
+
+
+class NumArrayClass(LoxCallable):
+    """
+    原生函数: NumArray(source)
+
+    source为List时按其元素创建数组，为数字n时创建长度为n的零数组。参数在导入
+    NumPy之前检查，内存不足等分配失败报告为运行时错误。
+    """
+
+    def call(self, interpreter, arguments):
+        """创建数值数组"""
+        source = arguments[0]
+
+        if isinstance(source, LoxList):
+            for item in source.items:
+                if isinstance(item, bool) or not isinstance(item, (int, float)):
+                    raise NativeError("NumArray的元素必须是数字。")
+            items = source.items
+            length = len(items)
+        elif isinstance(source, (int, float)) and not isinstance(source, bool):
+            if not math.isfinite(source) or source < 0 or int(source) != source:
+                raise NativeError("数组长度必须是非负整数。")
+            items = None
+            length = int(source)
+        else:
+            raise NativeError("NumArray的参数必须是List或长度。")
+
+        numpy = load_numpy()
+        interpreter.count_allocations(length)
+        try:
+            if items is None:
+                array = numpy.zeros(length, dtype=numpy.float64)
+            else:
+                array = numpy.array(items, dtype=numpy.float64)
+        except (MemoryError, ValueError):
+            # NumPy在内存不足时抛出MemoryError，长度超出可寻址范围时抛出ValueError
+            raise NativeError(f"无法分配长度为{length}的数组。")
+        return NumArray(array)
+
+    def arity(self):
+        """需要一个参数"""
+        return 1
+
+    def __str__(self):
+        """返回字符串表示"""
+        return "<native class NumArray>"
+
+
+registry.register("NumArray", NumArrayClass())
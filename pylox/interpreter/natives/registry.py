@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+原生函数注册表
+
+用装饰器把普通Python函数注册为Lox原生函数:
+
+    from pylox.interpreter.natives.registry import native
+
+    @native("sqrt")
+    def sqrt(x):
+        return math.sqrt(x)
+
+参数数量在注册时根据函数签名计算一次（必需的位置参数个数）；无法取得签名的
+内置函数需要显式指定arity。解释器遇到NativeFunction时走
+快速调用路径：直接把求值后的参数传给Python函数，不再检查call属性、
+调用arity()或构造参数列表。
+
+模块级的registry是所有解释器共享的默认注册表。每个解释器创建时复制一份
+（interpreter.natives）并安装到自己的全局环境，之后在这份副本上注册的
+原生值只对该解释器可见:
+
+    @runtime.interpreter.natives.native("hostAdd")
+    def host_add(a, b):
+        return a + b
+"""
+
+from types import FunctionType
+
+from pylox.interpreter.lox_callable import LoxCallable
+
+
+def required_positional_count(name, function):
+    """
+    计算可调用对象必需的位置参数个数
+    
+    普通Python函数直接读取代码对象；绑定方法、内置函数等其他可调用对象通过
+    inspect.signature计算（inspect只在这时导入，不拖慢启动）。
+    
+    Args:
+        name: str, 在Lox中的名称，用于错误报告
+        function: callable, Python可调用对象
+        
+    Returns:
+        int: 没有默认值的位置参数个数
+        
+    Raises:
+        TypeError: 无法取得签名时
+    """
+    if type(function) is FunctionType:
+        return function.__code__.co_argcount - len(function.__defaults__ or ())
+    
+    import inspect
+    try:
+        signature = inspect.signature(function)
+    except (TypeError, ValueError):
+        raise TypeError(f"无法确定原生函数'{name}'的参数数量，请显式指定arity。") from None
+    positional = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+    return sum(1 for parameter in signature.parameters.values()
+               if parameter.kind in positional and parameter.default is parameter.empty)
+
+
+class NativeFunction(LoxCallable):
+    """
+    包装普通Python函数的Lox原生函数
+    """
+    
+    __slots__ = ("name", "function", "arity_count")
+    
+    def __init__(self, name, function, arity=None):
+        """
+        初始化原生函数
+        
+        Args:
+            name: str, 在Lox中的名称
+            function: callable, Python函数，参数即Lox实参
+            arity: int, 参数数量，默认取函数必需的位置参数个数
+            
+        Raises:
+            TypeError: 未指定arity且无法取得函数签名时
+        """
+        self.name = name
+        self.function = function
+        if arity is None:
+            arity = required_positional_count(name, function)
+        self.arity_count = arity
+    
+    def call(self, interpreter, arguments):
+        """
+        调用原生函数
+        
+        Args:
+            interpreter: Interpreter, 解释器实例
+            arguments: list, 参数列表
+            
+        Returns:
+            函数返回值
+        """
+        return self.function(*arguments)
+    
+    def arity(self):
+        """
+        返回所需参数数量
+        
+        Returns:
+            int: 参数数量
+        """
+        return self.arity_count
+    
+    def __str__(self):
+        """
+        返回函数的字符串表示
+        
+        Returns:
+            str: 字符串表示
+        """
+        return f"<native fn: {self.name}>"
+
+
+class NativeRegistry:
+    """
+    原生全局名称注册表
+    
+    记录名称到原生值（NativeFunction或其他可调用对象）的映射，
+    解释器初始化时一次性安装到全局环境中。安装之后注册的原生值立即定义到
+    安装时的全局环境。
+    """
+    
+    def __init__(self, natives=None):
+        """
+        初始化注册表
+        
+        Args:
+            natives: dict, 初始的名称到原生值的映射，默认为空
+        """
+        self.natives = dict(natives) if natives is not None else {}
+        self.define = None  # install时的定义函数，尚未安装时为None
+    
+    def native(self, name=None, arity=None):
+        """
+        返回把Python函数注册为原生函数的装饰器
+        
+        Args:
+            name: str, 在Lox中的名称，默认使用函数名
+            arity: int, 参数数量，默认根据函数签名计算
+            
+        Returns:
+            callable: 装饰器，返回原函数本身
+        """
+        def decorator(function):
+            native_name = name or function.__name__
+            self.register(native_name, NativeFunction(native_name, function, arity))
+            return function
+        return decorator
+    
+    def register(self, name, value):
+        """
+        注册原生值
+        
+        Args:
+            name: str, 全局名称
+            value: LoxCallable, 原生值
+        """
+        self.natives[name] = value
+        if self.define is not None:
+            self.define(name, value)
+    
+    def copy(self):
+        """
+        复制注册表，副本上的注册不影响原注册表
+        
+        Returns:
+            NativeRegistry: 尚未安装的副本
+        """
+        return NativeRegistry(self.natives)
+    
+    def install(self, define):
+        """
+        将所有原生值定义到全局环境，之后注册的原生值同样定义到该环境
+        
+        Args:
+            define: callable, 定义函数，签名为define(name, value)
+        """
+        self.define = define
+        for name, value in self.natives.items():
+            define(name, value)
+
+
+# 默认注册表，每个解释器复制一份后安装
+registry = NativeRegistry()
+native = registry.native
@@ -11,7 +11,12 @@ from pylox.syntax_tree.visitor import Visitor
 from pylox.scanner.token_type import TokenType
 from pylox.interpreter.runtime_error import RuntimeError
 from pylox.interpreter.optimized_environment import OptimizedEnvironment
-from pylox.interpreter.lox_callable import LoxCallable, LoxFunction, Clock, LoxLambda
+from pylox.interpreter.lox_callable import LoxCallable, LoxFunction, LoxLambda
+from pylox.interpreter.natives.registry import registry
+# 内置原生值在这些模块导入时注册到默认注册表，安装注册表之前显式导入
+import pylox.interpreter.natives.clock
+import pylox.interpreter.natives.containers
+import pylox.interpreter.natives.numarray
 from pylox.interpreter.return_value import Return
 
 
@@ -31,16 +36,26 @@ class OptimizedInterpreter(Visitor):
     使用数组索引代替映射查找，提高变量访问性能。
     """
     
-    def __init__(self):
-        """初始化解释器"""
+    def __init__(self, lox=None):
+        """
+        初始化解释器
+        
+        Args:
+            lox: 错误报告对象（LoxRuntime或Lox类），默认为pylox.lox.Lox
+        """
         self.environment = OptimizedEnvironment()
         self.globals = self.environment  # 全局环境引用
+        if lox is None:
+            from pylox.lox import Lox
+            lox = Lox
+        self.lox = lox  # 错误报告对象
         
         # 变量解析结果存储
         self.locals = {}  # 表达式 -> (深度, 索引)
         
         # 定义内置函数
-        self.globals.define_global("clock", Clock())
+        self.natives = registry.copy()
+        self.natives.install(self.globals.define_global)
         
     def interpret(self, statements):
         """
@@ -58,8 +73,7 @@ class OptimizedInterpreter(Visitor):
                 result = self.execute(statement)
             return result
         except RuntimeError as error:
-            from pylox.lox import Lox
-            Lox.runtime_error(error)
+            self.lox.runtime_error(error)
             return None
     
     def resolve_optimized(self, expr, depth, index):
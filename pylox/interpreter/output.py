@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+print语句的输出目标
+
+解释器把print的输出写入OutputSink而不是直接调用Python的print，
+默认先在内存中累积，达到缓冲区大小、程序结束或报告错误前才写出，
+避免每条print语句都触发一次写入和刷新。
+"""
+
+import sys
+
+
+# 块缓冲模式下的默认缓冲区大小（字符数）
+DEFAULT_BUFFER_SIZE = 8192
+
+
+class OutputSink:
+    """
+    带缓冲的输出目标
+    
+    stream为None时每次写出都使用当前的sys.stdout，因此重定向sys.stdout
+    （例如测试中捕获输出）仍然有效。嵌入时可以传入StringIO或文件对象。
+    """
+    
+    def __init__(self, stream=None, line_buffered=False, buffer_size=DEFAULT_BUFFER_SIZE):
+        """
+        初始化输出目标
+        
+        Args:
+            stream: 文本流，默认为None表示sys.stdout
+            line_buffered: bool, 为True时每行立即写出并刷新流
+            buffer_size: int, 块缓冲模式下累积多少字符后写出
+        """
+        self.stream = stream
+        self.line_buffered = line_buffered
+        self.buffer_size = buffer_size
+        self.buffer = []  # 尚未写出的文本片段
+        self.pending = 0  # 缓冲区中的字符数
+    
+    def write_line(self, text):
+        """
+        输出一行文本
+        
+        Args:
+            text: str, 不含换行符的文本
+        """
+        if self.line_buffered:
+            stream = sys.stdout if self.stream is None else self.stream
+            stream.write(text + "\n")
+            stream.flush()
+            return
+        
+        self.buffer.append(text)
+        self.pending += len(text) + 1
+        if self.pending >= self.buffer_size:
+            self.flush()
+    
+    def flush(self):
+        """写出缓冲区中的内容并刷新流"""
+        stream = sys.stdout if self.stream is None else self.stream
+        if self.buffer:
+            self.buffer.append("")
+            stream.write("\n".join(self.buffer))
+            self.buffer = []
+            self.pending = 0
+        stream.flush()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Lox函数级性能分析
+
+ProfilingInterpreter在每次Lox调用前后计时，按函数、方法、匿名函数和类
+（以名称和定义所在的文件和行区分）统计调用次数、包含子调用的总时间（inclusive）
+和扣除子调用后的自身时间（exclusive），不受解释器自身Python调用的干扰。
+"""
+
+import time
+
+from pylox.interpreter.interpreter import Interpreter
+
+
+class FunctionProfile:
+    """
+    单个Lox可调用对象的统计数据
+    """
+
+    __slots__ = ("name", "line", "file", "kind", "calls", "inclusive", "exclusive", "active")
+
+    def __init__(self, name, line, kind, file=None):
+        """
+        初始化统计数据
+
+        Args:
+            name: str, 名称
+            line: int, 定义所在行，未知时为0
+            kind: str, 种类: function、lambda或class
+            file: str, 定义所在的模块文件，主程序为None
+        """
+        self.name = name
+        self.line = line
+        self.file = file
+        self.kind = kind
+        self.calls = 0
+        self.inclusive = 0.0
+        self.exclusive = 0.0
+        self.active = 0  # 正在执行的调用层数，用于避免递归时重复计入总时间
+
+    def to_dict(self):
+        """
+        转换为字典
+
+        Returns:
+            dict: 统计数据
+        """
+        return {
+            "name": self.name,
+            "line": self.line,
+            "file": self.file,
+            "kind": self.kind,
+            "calls": self.calls,
+            "inclusive": self.inclusive,
+            "exclusive": self.exclusive,
+        }
+
+
+class Profiler:
+    """
+    函数级计时器
+
+    维护一个调用栈，每个栈帧记录开始时间和子调用耗时，出栈时把耗时累加到
+    对应的FunctionProfile上。
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        """
+        初始化计时器
+
+        Args:
+            clock: callable, 返回当前时间（秒）的函数
+        """
+        self.clock = clock
+        self.profiles = {}  # 声明节点 -> FunctionProfile
+        self.stack = []  # [FunctionProfile, 开始时间, 子调用耗时]
+
+    def profile_for(self, callee):
+        """
+        获取被调用对象对应的统计数据
+
+        Args:
+            callee: LoxCallable, 被调用对象
+
+        Returns:
+            FunctionProfile: 统计数据，不统计的对象（如原生函数）返回None
+        """
+        declaration = getattr(callee, "declaration", None)
+        if declaration is None:
+            # BETA风格方法链以最底层子类的方法为准
+            chain = getattr(callee, "method_chain", None)
+            if not chain:
+                return None
+            declaration = chain[-1].declaration
+
+        profile = self.profiles.get(declaration)
+        if profile is None:
+            name_token = getattr(declaration, "name", None)
+            if name_token is not None:
+                kind = "class" if hasattr(declaration, "methods") else "function"
+                profile = FunctionProfile(name_token.lexeme, name_token.line, kind, name_token.file)
+            else:
+                keyword = getattr(declaration, "keyword", None)
+                profile = FunctionProfile("<lambda>", keyword.line if keyword else 0, "lambda",
+                                          keyword.file if keyword else None)
+            self.profiles[declaration] = profile
+        return profile
+
+    def enter(self, profile):
+        """
+        记录一次调用开始
+
+        Args:
+            profile: FunctionProfile, 被调用对象的统计数据
+        """
+        profile.calls += 1
+        profile.active += 1
+        self.stack.append([profile, self.clock(), 0.0])
+
+    def exit(self):
+        """记录最近一次调用结束"""
+        profile, start, children = self.stack.pop()
+        elapsed = self.clock() - start
+        profile.exclusive += elapsed - children
+        profile.active -= 1
+        if profile.active == 0:
+            profile.inclusive += elapsed
+        if self.stack:
+            self.stack[-1][2] += elapsed
+
+    def results(self):
+        """
+        返回按自身时间降序排列的统计结果
+
+        Returns:
+            list[dict]: 统计数据列表
+        """
+        profiles = sorted(self.profiles.values(), key=lambda profile: profile.exclusive, reverse=True)
+        return [profile.to_dict() for profile in profiles]
+
+    def format_report(self):
+        """
+        生成文本报告
+
+        Returns:
+            str: 以表格形式列出各函数统计数据的报告
+        """
+        lines = [f"{'调用次数':>10} {'总时间(s)':>12} {'自身时间(s)':>12}  函数"]
+        for result in self.results():
+            location = f"行 {result['line']}"
+            if result["file"] is not None:
+                location = f"{result['file']} {location}"
+            location = f"{result['name']} ({location})"
+            if result["kind"] != "function":
+                location += f" [{result['kind']}]"
+            lines.append(f"{result['calls']:>14} {result['inclusive']:>13.6f} "
+                         f"{result['exclusive']:>14.6f}  {location}")
+        return "\n".join(lines)
+
+
+class ProfilingInterpreter(Interpreter):
+    """
+    在每次Lox调用前后计时的解释器
+    """
+
+    def __init__(self, *args, **kwargs):
+        """初始化解释器和计时器"""
+        super().__init__(*args, **kwargs)
+        self.profiler = Profiler()
+
+    def call_function(self, callee, arguments, paren):
+        """
+        调用可调用对象并记录耗时
+
+        Args:
+            callee: LoxCallable, 被调用对象
+            arguments: list, 参数值列表
+            paren: Token, 调用表达式的右括号标记，用于错误报告
+
+        Returns:
+            Any, 调用结果
+        """
+        profile = self.profiler.profile_for(callee)
+        if profile is None:
+            return super().call_function(callee, arguments, paren)
+
+        self.profiler.enter(profile)
+        try:
+            return super().call_function(callee, arguments, paren)
+        finally:
+            self.profiler.exit()
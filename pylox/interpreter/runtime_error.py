@@ -27,3 +27,12 @@ class RuntimeError(Exception):
         """
         super().__init__(message)
         self.token = token
+
+
+class BudgetExceededError(RuntimeError):
+    """
+    超出执行预算
+    
+    程序执行的步数、运行时间或分配量超过了Budget设置的上限。
+    """
+    pass
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Lox调用栈采样
+
+SamplingInterpreter只在每次Lox调用时压入、弹出一个栈帧，并记录当前执行
+的语句；后台线程按固定间隔读取这份Lox级调用栈，统计每条栈出现的次数。
+结果以折叠栈（collapsed stack）文本输出，每行形如
+
+    <script>:12;fib:3;fib:3 42
+
+可以直接交给flamegraph.pl、speedscope等火焰图工具。与逐次计时的
+ProfilingInterpreter相比，采样对被测程序的时间分布影响小得多。
+
+采样线程只有在拿到GIL时才能醒来，而CPython默认每5ms才切换一次线程，
+不调整时实际采样率只有约200Hz。因此采样期间把线程切换间隔
+（sys.setswitchinterval，进程级设置）缩短为采样间隔的一半，结束时恢复原值，
+采样线程按固定的时间点而不是固定的等待时长采样；实际达到的采样率
+（样本数除以墙钟时间）记录在rate()中，并随报告输出。
+"""
+
+import sys
+import threading
+import time
+
+from pylox.interpreter.interpreter import Interpreter
+from pylox.syntax_tree.locations import node_line
+
+
+# 默认采样间隔（秒），即1kHz
+DEFAULT_INTERVAL = 0.001
+
+# 最外层（脚本顶层）栈帧的名称
+SCRIPT_FRAME = "<script>"
+
+
+class StackSampler:
+    """
+    在后台线程中周期性采样解释器的Lox调用栈
+    """
+
+    def __init__(self, interpreter, interval=DEFAULT_INTERVAL):
+        """
+        初始化采样器
+
+        Args:
+            interpreter: SamplingInterpreter, 被采样的解释器
+            interval: float, 采样间隔（秒）
+        """
+        self.interpreter = interpreter
+        self.interval = interval
+        self.counts = {}  # 折叠栈 -> 采样次数
+        self.samples = 0
+        self.elapsed = 0.0  # 累计采样的墙钟时间（秒）
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.started = None  # 本次采样开始的时间
+        self.switch_interval = None  # 采样前的线程切换间隔，采样结束时恢复
+
+    def start(self):
+        """缩短线程切换间隔并启动采样线程"""
+        self.switch_interval = sys.getswitchinterval()
+        # 唤醒后还要等主线程让出GIL，切换间隔取采样间隔的一半
+        sys.setswitchinterval(min(self.switch_interval, self.interval / 2))
+        self.stop_event.clear()
+        self.started = time.perf_counter()
+        self.thread = threading.Thread(target=self.run, name="pylox-sampler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """停止采样线程并等待其结束，恢复线程切换间隔"""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if self.started is not None:
+            self.elapsed += time.perf_counter() - self.started
+            self.started = None
+        if self.switch_interval is not None:
+            sys.setswitchinterval(self.switch_interval)
+            self.switch_interval = None
+
+    def rate(self):
+        """
+        返回实际达到的采样率
+
+        Returns:
+            float: 每秒采样次数（样本数除以采样的墙钟时间），尚未采样时为0
+        """
+        return self.samples / self.elapsed if self.elapsed > 0 else 0.0
+
+    def format_summary(self):
+        """
+        生成采样情况的一行摘要
+
+        Returns:
+            str: 样本数、耗时以及实际和期望的采样率
+        """
+        return (f"[采样] {self.samples}个样本，耗时{self.elapsed:.3f}s，"
+                f"实际约{self.rate():.0f}Hz（期望{1.0 / self.interval:.0f}Hz）")
+
+    def run(self):
+        """采样线程的主循环，按固定的时间点采样，醒来晚了的时间不累积"""
+        interval = self.interval
+        clock = time.perf_counter
+        deadline = clock() + interval
+        while not self.stop_event.wait(max(0.0, deadline - clock())):
+            self.sample()
+            deadline = max(deadline + interval, clock())
+
+    def sample(self):
+        """采样一次当前的Lox调用栈"""
+        interpreter = self.interpreter
+        frames = interpreter.frames[:]
+        current = interpreter.current
+
+        names = [SCRIPT_FRAME]
+        sites = []
+        for name, call_site in frames:
+            names.append(name)
+            sites.append(call_site)
+        sites.append(current)
+
+        parts = []
+        for name, site in zip(names, sites):
+            line = node_line(site) if site is not None else None
+            parts.append(name if line is None else f"{name}:{line}")
+
+        stack = ";".join(parts)
+        self.counts[stack] = self.counts.get(stack, 0) + 1
+        self.samples += 1
+
+    def collapsed(self):
+        """
+        返回折叠栈文本
+
+        Returns:
+            str: 每行一条调用栈及其采样次数
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.counts.items()))
+
+
+class SamplingInterpreter(Interpreter):
+    """
+    维护Lox级调用栈以供采样的解释器
+    """
+
+    def __init__(self, *args, **kwargs):
+        """初始化解释器和采样器"""
+        super().__init__(*args, **kwargs)
+        self.frames = []  # (函数名, 调用处语句)
+        self.current = None  # 当前正在执行的语句
+        self.frame_names = {}  # 声明节点 -> 函数名
+        self.sampler = StackSampler(self)
+
+    def interpret(self, statements):
+        """
+        在采样线程运行期间解释执行语句列表
+
+        Args:
+            statements: list[Stmt], 语句列表
+        """
+        self.sampler.start()
+        try:
+            return super().interpret(statements)
+        finally:
+            self.sampler.stop()
+
+    def execute(self, stmt):
+        """
+        执行语句并记录为当前语句
+
+        Args:
+            stmt: Stmt, 语句对象
+
+        Returns:
+            Any, 执行结果
+        """
+        self.current = stmt
+        return super().execute(stmt)
+
+    def call_function(self, callee, arguments, paren):
+        """
+        调用可调用对象，调用期间压入一个栈帧
+
+        Args:
+            callee: LoxCallable, 被调用对象
+            arguments: list, 参数值列表
+            paren: Token, 调用表达式的右括号标记，用于错误报告
+
+        Returns:
+            Any, 调用结果
+        """
+        call_site = self.current
+        self.frames.append((self.frame_name(callee), call_site))
+        try:
+            return super().call_function(callee, arguments, paren)
+        finally:
+            self.frames.pop()
+            self.current = call_site
+
+    def frame_name(self, callee):
+        """
+        返回被调用对象在调用栈中的名称
+
+        Args:
+            callee: LoxCallable, 被调用对象
+
+        Returns:
+            str: 函数、方法或类名，匿名函数为<lambda>，原生对象使用其字符串表示
+        """
+        declaration = getattr(callee, "declaration", None)
+        if declaration is None:
+            # BETA风格方法链以最底层子类的方法为准
+            chain = getattr(callee, "method_chain", None)
+            if not chain:
+                return str(callee)
+            declaration = chain[-1].declaration
+
+        name = self.frame_names.get(declaration)
+        if name is None:
+            token = getattr(declaration, "name", None)
+            name = token.lexeme if token is not None else "<lambda>"
+            self.frame_names[declaration] = name
+        return name
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+跟踪钩子
+
+Interpreter.set_trace(callback)安装一个类似sys.settrace的回调，在以下事件
+发生时以callback(event, line, arg)调用它:
+
+    "statement"  即将执行一条语句，line为语句所在行，arg为语句节点
+    "call"       即将调用Lox函数、方法或类，line为调用处所在行，arg为被调用对象
+    "return"     调用正常结束，line为调用处所在行，arg为返回值
+    "exception"  调用因Lox运行时错误结束，line为调用处所在行，arg为RuntimeError
+
+安装回调时把解释器实例的类替换为原来的类加上TracingMethods中方法的子类，
+移除回调时再换回原来的类，因此未安装回调时执行路径与没有跟踪功能时完全
+相同。通过visit_call_expr快速路径调用的原生函数不产生调用事件。
+"""
+
+from pylox.interpreter.runtime_error import RuntimeError
+from pylox.syntax_tree.locations import node_line
+
+
+class TracingMethods:
+    """
+    在语句执行和调用前后调用跟踪回调的方法
+
+    这些方法被复制到各解释器类的单继承子类中（多继承的子类与原来的类实例
+    布局不同，不能切换__class__），因此通过untraced_class而不是super()调用
+    原来的实现。
+    """
+
+    # 原来的解释器类，由tracing_class设置
+    untraced_class = None
+
+    def execute(self, stmt):
+        """
+        通知回调后执行语句
+
+        Args:
+            stmt: Stmt, 语句对象
+
+        Returns:
+            Any, 执行结果
+        """
+        line = self.trace_lines.get(stmt)
+        if line is None:
+            line = self.trace_lines[stmt] = node_line(stmt)
+        self.trace_callback("statement", line, stmt)
+        return self.untraced_class.execute(self, stmt)
+
+    def call_function(self, callee, arguments, paren):
+        """
+        在调用前后通知回调
+
+        Args:
+            callee: LoxCallable, 被调用对象
+            arguments: list, 参数值列表
+            paren: Token, 调用表达式的右括号标记，用于错误报告
+
+        Returns:
+            Any, 调用结果
+        """
+        callback = self.trace_callback
+        callback("call", paren.line, callee)
+        try:
+            value = self.untraced_class.call_function(self, callee, arguments, paren)
+        except RuntimeError as error:
+            callback("exception", paren.line, error)
+            raise
+        callback("return", paren.line, value)
+        return value
+
+
+# 解释器类 -> 跟踪子类
+_tracing_classes = {}
+
+
+def tracing_class(cls):
+    """
+    返回加入了TracingMethods中方法的解释器子类
+
+    Args:
+        cls: type, 解释器类
+
+    Returns:
+        type: 子类，同一个解释器类总是返回同一个子类
+    """
+    traced = _tracing_classes.get(cls)
+    if traced is None:
+        namespace = {"untraced_class": cls,
+                     "execute": TracingMethods.execute,
+                     "call_function": TracingMethods.call_function}
+        traced = type("Tracing" + cls.__name__, (cls,), namespace)
+        _tracing_classes[cls] = traced
+    return traced
+
+
+def is_tracing(interpreter):
+    """
+    判断解释器是否安装了跟踪回调
+
+    Args:
+        interpreter: Interpreter, 解释器实例
+
+    Returns:
+        bool: 已安装回调时为True
+    """
+    return type(interpreter).__dict__.get("untraced_class") is not None
+
+
+def set_trace(interpreter, callback):
+    """
+    安装或移除解释器的跟踪回调
+
+    Args:
+        interpreter: Interpreter, 解释器实例
+        callback: callable, 以(event, line, arg)调用的回调，None表示移除
+    """
+    if callback is None:
+        if is_tracing(interpreter):
+            interpreter.__class__ = interpreter.untraced_class
+            del interpreter.trace_callback
+            del interpreter.trace_lines
+        return
+
+    if not is_tracing(interpreter):
+        interpreter.__class__ = tracing_class(type(interpreter))
+        interpreter.trace_lines = {}  # 语句 -> 所在行
+    interpreter.trace_callback = callback
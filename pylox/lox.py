@@ -4,139 +4,437 @@
 """
 Lox解释器的主类
 
-提供运行Lox代码的公共接口和错误处理功能。
+提供运行Lox代码的公共接口和错误处理功能。LoxRuntime是可以多实例并存的
+运行时，Lox是进程级的默认运行时。
 """
 
-import sys
 import os
-import traceback
-import time
-import re
-import copy
-from io import StringIO
-import types
-import inspect
-import importlib
-import argparse
-
-# 解决ast命名冲突
-import ast as python_stdlib_ast
-
-# 确保优先使用Python标准库模块
-for i in range(len(sys.path)-1, -1, -1):
-    if "site-packages" in sys.path[i]:
-        sys.path.insert(0, sys.path.pop(i))
+import sys
 
-# 使用标准库的ast模块，避免与项目冲突
 from pylox.scanner import Scanner, TokenType
 from pylox.interpreter.runtime_error import RuntimeError
 from pylox.interpreter.interpreter import Interpreter, Return
 from pylox.parser import Parser
 
 
-class Lox:
+def location(line, file=None):
     """
-    Lox语言的主类
+    格式化错误信息中的源代码位置
     
-    包含运行Lox代码和处理错误的主要方法。
+    Args:
+        line: int, 行号
+        file: str, 导入的模块文件，主程序为None
+        
+    Returns:
+        str: 主程序为"行 N"，模块为"文件 行 N"
     """
+    if file is None:
+        return f"行 {line}"
+    return f"{file} 行 {line}"
+
+
+def check_lazy_parse(coverage, lazy_parse):
+    """
+    检查延迟解析能否与其他功能同时使用
     
-    # 状态标志
-    had_error = False
-    had_runtime_error = False
-    had_warnings = False
+    延迟解析的函数体在调用前不在语法树中，覆盖率统计无法登记从未调用的
+    函数中的行，因此两者不能同时启用。
     
-    # 调试标志
-    debug_mode = False
+    Args:
+        coverage: bool, 是否统计行覆盖率
+        lazy_parse: bool, 是否延迟解析顶层函数的函数体
+        
+    Raises:
+        ValueError: 同时启用了两者
+    """
+    if coverage and lazy_parse:
+        raise ValueError("行覆盖率统计不能与延迟解析同时使用。")
+
+
+class LoxRuntime:
+    """
+    Lox运行时
     
-    # 解释器实例
-    interpreter = None
+    持有一次或多次执行所需的全部状态：错误标志、调试模式、解释器（及其
+    全局环境和输出目标）以及错误输出流。扫描器、解析器、变量解析器和
+    解释器都通过它报告错误，因此多个LoxRuntime实例可以在同一进程的
+    不同线程中相互隔离地运行各自的程序。
+    """
     
-    @classmethod
-    def init(cls):
+    def __init__(self, debug=False, output=None, error_stream=None, profile=False, stats=False,
+                 coverage=False, budget=None, lazy_parse=False, module_loader=None):
+        """
+        初始化运行时
+        
+        Args:
+            debug: bool, 是否启用调试模式
+            output: OutputSink, print语句和运行信息的输出目标，默认为缓冲写入sys.stdout
+            error_stream: 文本流，错误和警告的输出流，默认为None表示sys.stderr
+            profile: bool, 是否统计各Lox函数的调用次数和耗时
+            stats: bool, 是否记录各阶段耗时和运行时计数，结果见metrics属性
+            coverage: bool, 是否按行统计语句执行次数，结果见interpreter.coverage
+            budget: Budget, 每次运行的执行步数、时间和分配上限，None表示不限制
+            lazy_parse: bool, 是否延迟到首次调用时才解析顶层函数的函数体，不能与coverage
+                        同时使用
+            module_loader: ModuleLoader, import语句使用的模块加载器，None表示使用进程内
+                           共享的pylox.modules.default_loader
+            
+        Raises:
+            ValueError: 同时启用了coverage和lazy_parse
+        """
+        check_lazy_parse(coverage, lazy_parse)
+        # 状态标志
+        self.had_error = False
+        self.had_runtime_error = False
+        self.had_warnings = False
+        
+        # 调试标志
+        self.debug_mode = debug
+        
+        # 性能分析
+        self.profile = profile
+        self.profile_output = None  # 性能报告的JSON文件路径，None表示输出文本报告
+        self.sample_output = None  # 采样得到的折叠栈文件路径，None表示不采样
+        self.sample_interval = None  # 采样间隔（秒），None表示使用默认值
+        
+        # 运行统计
+        self.stats = stats
+        self.metrics = None  # 启用统计时为解释器的Metrics对象
+        
+        # 行覆盖率
+        self.coverage = coverage
+        self.coverage_output = None  # 覆盖率报告的文件路径
+        
+        # 执行预算
+        self.budget = budget
+        
+        # 延迟解析顶层函数的函数体
+        self.lazy_parse = lazy_parse
+        
+        # 模块加载器
+        self.module_loader = module_loader
+        
+        # 输出目标
+        self.output = output
+        self.error_stream = error_stream
+        
+        # 解释器实例，首次执行时创建
+        self.interpreter = None
+        self.interpreter_features = None  # 创建解释器时的feature_flags()
+    
+    def init(self):
         """初始化Lox解释器"""
-        if cls.interpreter is None:
+        if self.interpreter is None:
+            Interpreter = self.interpreter_class()
+            self.interpreter = Interpreter(output=self.output, lox=self)
+            self.interpreter_features = self.feature_flags()
+            if self.sample_interval is not None:
+                self.interpreter.sampler.interval = self.sample_interval
+            self.metrics = getattr(self.interpreter, "metrics", None)
+            if self.budget is not None:
+                self.interpreter.budget = self.budget
+    
+    def feature_flags(self):
+        """
+        返回决定解释器类和其设置的功能开关
+        
+        Returns:
+            tuple: 采样、性能分析、调试、统计、覆盖率和预算的设置
+        """
+        return (self.sample_output is not None, self.sample_interval, self.profile,
+                self.debug_mode, self.stats, self.coverage, self.budget)
+    
+    def interpreter_class(self):
+        """
+        根据启用的功能选择解释器类
+        
+        调试、性能分析等功能各自由Interpreter的一个子类实现，同时启用
+        多个功能时动态组合这些子类，普通执行路径不包含任何额外判断。
+        
+        Returns:
+            type: 解释器类
+        """
+        classes = []
+        if self.sample_output is not None:
+            from pylox.interpreter.sampler import SamplingInterpreter
+            classes.append(SamplingInterpreter)
+        if self.profile:
+            from pylox.interpreter.profiler import ProfilingInterpreter
+            classes.append(ProfilingInterpreter)
+        if self.debug_mode:
+            from pylox.interpreter.debug_interpreter import DebugInterpreter
+            classes.append(DebugInterpreter)
+        if self.stats:
+            from pylox.interpreter.metrics import MetricsInterpreter
+            classes.append(MetricsInterpreter)
+        if self.coverage:
+            from pylox.interpreter.coverage import CoverageInterpreter
+            classes.append(CoverageInterpreter)
+        if self.budget is not None:
+            from pylox.interpreter.budget import BudgetInterpreter
+            classes.append(BudgetInterpreter)
+        
+        if not classes:
             from pylox.interpreter.interpreter import Interpreter
-            cls.interpreter = Interpreter()
+            return Interpreter
+        if len(classes) == 1:
+            return classes[0]
+        name = "".join(cls.__name__.replace("Interpreter", "") for cls in classes) + "Interpreter"
+        return type(name, tuple(classes), {})
+    
+    def error_output(self):
+        """
+        返回错误和警告的输出流
+        
+        Returns:
+            文本流: error_stream，未设置时为当前的sys.stderr
+        """
+        return sys.stderr if self.error_stream is None else self.error_stream
+    
+    def set_trace(self, callback):
+        """
+        在解释器上安装或移除跟踪回调
+        
+        Args:
+            callback: callable, 以(event, line, arg)调用的回调，None表示移除
+        """
+        self.init()
+        self.interpreter.set_trace(callback)
     
-    @classmethod
-    def run_file(cls, path, debug=False):
+    def write(self, text):
+        """
+        通过解释器的输出目标输出一行运行信息
+        
+        Args:
+            text: str, 不含换行符的文本
+        """
+        self.init()
+        self.interpreter.output.write_line(text)
+    
+    def run_file(self, path, debug=False, deep_stack=False, max_depth=None, line_buffered=False,
+                 profile=False, profile_output=None, sample_output=None, sample_rate=None,
+                 stats=False, coverage_output=None, budget=None, lazy_parse=False,
+                 module_cache=None):
         """
         执行Lox脚本文件
         
         Args:
             path: str, 文件路径
             debug: bool, 是否启用调试模式
+            deep_stack: bool, 是否在大栈线程中执行，以支持深度递归
+            max_depth: int, Lox调用栈的最大深度，None表示使用默认值
+            line_buffered: bool, print输出是否逐行写出，默认为块缓冲
+            profile: bool, 是否在结束时输出各Lox函数的性能报告
+            profile_output: str, 性能报告的JSON文件路径，None表示向错误输出打印文本报告
+            sample_output: str, 采样调用栈并把折叠栈写入该文件，None表示不采样
+            sample_rate: float, 期望的每秒采样次数，None表示使用默认值（1000）
+            stats: bool, 是否在结束时输出各阶段耗时和运行时计数
+            coverage_output: str, 把行覆盖率报告写入该文件，扩展名为.json时输出JSON，
+                             否则输出lcov格式；None表示不统计
+            budget: Budget, 执行步数、时间和分配上限，None表示不限制
+            lazy_parse: bool, 是否延迟到首次调用时才解析顶层函数的函数体，
+                        函数体中的错误在首次调用时报告；不能与coverage_output同时使用
+            module_cache: str, 把导入模块的语法树缓存到该目录，None表示只在内存中缓存
+            
+        Raises:
+            ValueError: 同时启用了覆盖率统计和lazy_parse
+        """
+        check_lazy_parse(coverage_output is not None, lazy_parse)
+        # 调试模式和性能分析决定创建哪种解释器，必须在初始化之前设置
+        self.debug_mode = debug
+        self.profile = profile or profile_output is not None
+        self.profile_output = profile_output
+        self.sample_output = sample_output
+        self.sample_interval = 1.0 / sample_rate if sample_rate else None
+        self.stats = stats
+        self.coverage = coverage_output is not None
+        self.coverage_output = coverage_output
+        self.budget = budget
+        self.lazy_parse = lazy_parse
+        if module_cache is not None:
+            from pylox.modules import ModuleLoader
+            self.module_loader = ModuleLoader(cache_dir=module_cache)
+        
+        # 已有的解释器按不同的功能开关创建时，重新创建解释器
+        if self.interpreter is not None and self.interpreter_features != self.feature_flags():
+            self.interpreter = None
+            self.metrics = None
+        
+        if line_buffered:
+            self.init()
+            self.interpreter.output.line_buffered = True
+        
+        if deep_stack:
+            from pylox.interpreter.deep_stack import run_with_deep_stack, DEFAULT_MAX_CALL_DEPTH
+            if max_depth is None:
+                max_depth = DEFAULT_MAX_CALL_DEPTH
+            self.init()
+            self.interpreter.max_call_depth = max_depth
+            run_with_deep_stack(self._run_file, path, debug, max_call_depth=max_depth)
+            return
+        
+        if max_depth is not None:
+            self.init()
+            self.interpreter.max_call_depth = max_depth
+        self._run_file(path, debug)
+    
+    def _run_file(self, path, debug):
+        """
+        执行Lox脚本文件的实际实现，出错时以相应的退出码结束进程
+        
+        Args:
+            path: str, 文件路径
+            debug: bool, 是否启用调试模式
+        """
+        status = self.execute_file(path, debug)
+        if self.profile:
+            self.write_profile()
+        if self.sample_output is not None:
+            self.write_samples()
+        if self.stats:
+            print(self.metrics.format_report(), file=self.error_output())
+        if self.coverage_output is not None:
+            self.write_coverage(path)
+        if status:
+            sys.exit(status)
+    
+    def write_profile(self):
+        """
+        输出性能报告
+        
+        设置了profile_output时写入JSON文件，否则向错误输出打印按自身时间
+        排序的文本报告。
+        """
+        profiler = self.interpreter.profiler
+        if self.profile_output is not None:
+            import json
+            with open(self.profile_output, "w", encoding="utf-8") as file:
+                json.dump({"functions": profiler.results()}, file, ensure_ascii=False, indent=2)
+        else:
+            print(profiler.format_report(), file=self.error_output())
+    
+    def write_samples(self):
+        """把采样得到的折叠栈写入sample_output文件，并向错误输出报告实际采样率"""
+        sampler = self.interpreter.sampler
+        with open(self.sample_output, "w", encoding="utf-8") as file:
+            file.write(sampler.collapsed())
+        print(sampler.format_summary(), file=self.error_output())
+    
+    def write_coverage(self, path):
+        """
+        把行覆盖率报告写入coverage_output文件
+        
+        Args:
+            path: str, 被统计的脚本路径，写入报告的源文件字段
+        """
+        coverage = self.interpreter.coverage
+        with open(self.coverage_output, "w", encoding="utf-8") as file:
+            if self.coverage_output.endswith(".json"):
+                import json
+                json.dump(coverage.to_dict(path), file, ensure_ascii=False, indent=2)
+                file.write("\n")
+            else:
+                file.write(coverage.format_lcov(path))
+    
+    def execute_file(self, path, debug=False):
+        """
+        执行Lox脚本文件并返回退出码
+        
+        Args:
+            path: str, 文件路径
+            debug: bool, 是否启用调试模式
+            
+        Returns:
+            int: 0表示成功，65表示找不到文件或有语法错误，70表示运行时错误
         """
         try:
             # 设置调试模式
-            cls.debug_mode = debug
+            self.debug_mode = debug
             
             # 重置状态
-            cls.had_error = False
-            cls.had_runtime_error = False
+            self.had_error = False
+            self.had_runtime_error = False
             
             # 初始化解释器
-            cls.init()
+            self.init()
+            
+            # import语句的相对路径相对于脚本所在的目录
+            self.interpreter.module_dirs = [os.path.dirname(os.path.abspath(path))]
             
             # 读取并执行文件
             with open(path, 'r', encoding='utf-8') as file:
                 source = file.read()
-                print(f"[执行文件] {path}")
+                self.write(f"[执行文件] {path}")
                 
-                if cls.debug_mode:
-                    print("[调试] 开始执行文件...")
+                if self.debug_mode:
+                    self.write("[调试] 开始执行文件...")
                     
-                cls.run(source)
+                self.run(source)
                 
-                if cls.debug_mode:
-                    print("[调试] 文件执行完成")
+                if self.debug_mode:
+                    self.write("[调试] 文件执行完成")
                     
         except FileNotFoundError:
-            print(f"错误: 找不到文件 '{path}'", file=sys.stderr)
-            sys.exit(65)  # EX_DATAERR
+            print(f"错误: 找不到文件 '{path}'", file=self.error_output())
+            return 65  # EX_DATAERR
         except Exception as e:
-            print(f"[异常] 执行 {path} 时发生异常: {e}")
-            traceback.print_exc()
-            sys.exit(70)  # EX_SOFTWARE
+            self.report_exception(f"[异常] 执行 {path} 时发生异常: {e}")
+            return 70  # EX_SOFTWARE
+        finally:
+            if self.interpreter is not None:
+                self.interpreter.output.flush()
+        
+        return self.exit_status()
+    
+    def execute_source(self, source):
+        """
+        执行Lox源代码并返回退出码
+        
+        Args:
+            source: str, 源代码
             
+        Returns:
+            int: 0表示成功，65表示有语法错误，70表示运行时错误
+        """
+        self.had_error = False
+        self.had_runtime_error = False
+        self.init()
+        
+        try:
+            self.run(source)
+        except Exception as e:
+            self.report_exception(f"[异常] 执行时发生异常: {e}")
+            return 70  # EX_SOFTWARE
+        finally:
+            self.interpreter.output.flush()
+        
+        return self.exit_status()
+    
+    def exit_status(self):
+        """
+        根据错误状态返回退出码
+        
+        Returns:
+            int: 语法错误为65，运行时错误为70，否则为0
+        """
         # 语法错误时返回错误码
-        if cls.had_error:
-            sys.exit(65)  # EX_DATAERR
+        if self.had_error:
+            return 65  # EX_DATAERR
             
         # 运行时错误时返回错误码
-        if cls.had_runtime_error:
-            sys.exit(70)  # EX_SOFTWARE
+        if self.had_runtime_error:
+            return 70  # EX_SOFTWARE
+        
+        return 0
 
-    @classmethod
-    def run_prompt(cls):
+    def run_prompt(self):
         """
-        运行交互式REPL
+        运行交互式REPL，支持多行输入，见pylox.repl.ReplSession
         """
-        try:
-            # 初始化解释器
-            cls.init()
-            
-            print("Lox 交互式模式 (Ctrl+D或Ctrl+Z退出)")
-            # 开始REPL循环
-            while True:
-                print("> ", end="")
-                line = input()
-                if not line:
-                    break
-                cls.run(line, repl_mode=True)
-                # 在REPL模式下，每次命令后重置错误状态
-                cls.had_error = False
-        except EOFError:
-            print("\nGoodbye!")
-        except KeyboardInterrupt:
-            print("\nREPL被中断")
-        except Exception as e:
-            print(f"[异常]  REPL发生异常: {e}")
-            traceback.print_exc()
+        from pylox.repl import ReplSession
+        ReplSession(self).interact()
 
-    @classmethod
-    def run(cls, source, repl_mode=False):
+    def run(self, source, repl_mode=False):
         """执行Lox代码
 
         Args:
@@ -146,29 +444,118 @@ class Lox:
         Returns:
             解释执行的结果
         """
-        
+        statements = self.compile(source)
+        if statements is None:
+            return None
+        return self.execute_statements(statements, repl_mode)
+
+    def compile(self, source, tokens=None, resolver=None, lazy=None):
+        """
+        扫描、解析源代码并解析变量引用
+
+        Args:
+            source: str, 源代码
+            tokens: list[Token], 已经扫描好的标记，None表示扫描source
+            resolver: Resolver, 复用的变量解析器，None表示新建
+            lazy: bool, 是否延迟解析顶层函数的函数体，None表示使用lazy_parse属性
+
+        Returns:
+            list[Stmt]: 语句列表，有语法或解析错误时为None
+        """
         # 确保解释器已初始化
-        cls.init()
+        self.init()
+        metrics = self.metrics  # 未启用统计时为None
+        if metrics is not None:
+            metrics.start_lap()
         
         # 扫描和解析
-        scanner = Scanner(source)
-        tokens = scanner.scan_tokens()
+        if tokens is None:
+            scanner = Scanner(source, lox=self)
+            tokens = scanner.scan_tokens()
+        if metrics is not None:
+            metrics.lap("scan")
+            metrics.tokens += len(tokens)
         
-        parser = Parser(tokens)
+        if lazy is None:
+            lazy = self.lazy_parse
+        parser = Parser(tokens, lox=self, lazy=lazy)
         statements = parser.parse()
+        if metrics is not None:
+            metrics.lap("parse")
         
         # 有语法错误时停止
-        if cls.had_error:
+        if self.had_error:
             return None
         
         # 解析变量：确定变量引用绑定
-        from pylox.resolver import Resolver
-        resolver = Resolver(cls.interpreter)
+        if resolver is None:
+            from pylox.resolver import Resolver
+            resolver = Resolver(self.interpreter, lox=self)
         resolver.resolve(statements)
+        if metrics is not None:
+            metrics.lap("resolve")
+            from pylox.interpreter.metrics import count_nodes
+            metrics.ast_nodes += count_nodes(statements)
+            metrics.resolved_locals = len(self.interpreter.locals)
         
         # 有解析错误时停止
-        if cls.had_error:
+        if self.had_error:
             return None
+        return statements
+
+    def validate_source(self, source):
+        """
+        完整地解析源代码并解析变量引用，但不执行
+        
+        总是立即解析所有函数体，因此能在执行前发现延迟解析模式下要到
+        首次调用才会报告的错误，错误的报告方式与执行时相同。
+        
+        Args:
+            source: str, 源代码
+            
+        Returns:
+            int: 0表示没有错误，65表示有语法或解析错误或嵌套过深
+        """
+        self.had_error = False
+        try:
+            self.compile(source, lazy=False)
+        except RecursionError:
+            print("错误: 嵌套过深，超出Python递归限制，无法检查。", file=self.error_output())
+            self.had_error = True
+        return 65 if self.had_error else 0
+    
+    def validate_file(self, path):
+        """
+        检查Lox脚本文件而不执行，见validate_source
+        
+        Args:
+            path: str, 文件路径
+            
+        Returns:
+            int: 0表示没有错误，65表示找不到文件、有语法或解析错误或嵌套过深
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                source = file.read()
+        except FileNotFoundError:
+            print(f"错误: 找不到文件 '{path}'", file=self.error_output())
+            return 65  # EX_DATAERR
+        return self.validate_source(source)
+
+    def execute_statements(self, statements, repl_mode=False):
+        """
+        解释执行已经完成变量解析的语句列表
+
+        Args:
+            statements: list[Stmt], compile返回的语句列表
+            repl_mode: bool, 是否在REPL模式下运行，此时单个表达式语句的值会被输出
+
+        Returns:
+            解释执行的结果
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.start_lap()
         
         # 在REPL模式下，如果只有一个表达式语句，则打印结果
         if repl_mode and len(statements) == 1:
@@ -176,42 +563,51 @@ class Lox:
             if isinstance(statements[0], Expression):
                 try:
                     # 对表达式求值并打印结果
-                    result = cls.interpreter.evaluate(statements[0].expression)
-                    print(cls.interpreter.stringify(result))
-                    return result
+                    result = self.interpreter.evaluate(statements[0].expression)
                 except Return as ret:
                     # 处理函数返回值异常
                     result = ret.value
-                    print(cls.interpreter.stringify(result))
-                    return result
+                except RuntimeError as error:
+                    self.interpreter.output.flush()
+                    self.runtime_error(error)
+                    return None
+                finally:
+                    # 表达式中调用的函数可能有缓冲的print输出
+                    self.interpreter.output.flush()
+                    if metrics is not None:
+                        metrics.lap("interpret")
+                self.write(self.interpreter.stringify(result))
+                self.interpreter.output.flush()
+                return result
         
         # 添加一个明确的包裹层来处理 Return 异常    
         try:
             # 将语句列表传递给解释器执行
-            result = cls.interpreter.interpret(statements)
+            result = self.interpreter.interpret(statements)
             return result
         except Return as ret:
             # 返回函数值
             return ret.value
         except Exception as e:
             # 处理其他异常
-            print(f"[异常] 执行时发生异常: {e}")
-            traceback.print_exc()
+            self.report_exception(f"[异常] 执行时发生异常: {e}")
             return None
+        finally:
+            if metrics is not None:
+                metrics.lap("interpret")
 
-    @classmethod
-    def error(cls, line, message):
+    def error(self, line, message, file=None):
         """
         报告行号的错误
         
         Args:
             line: int, 错误发生的行号
             message: str, 错误信息
+            file: str, 错误所在的模块文件，主程序为None
         """
-        cls.report(line, "", message)
+        self.report(line, "", message, file)
         
-    @classmethod
-    def error_token(cls, token, message):
+    def error_token(self, token, message):
         """
         报告标记的错误
         
@@ -220,24 +616,22 @@ class Lox:
             message: str, 错误信息
         """
         if token.type == TokenType.EOF:
-            cls.report(token.line, " at end", message)
+            self.report(token.line, " at end", message, token.file)
         else:
-            cls.report(token.line, f" at '{token.lexeme}'", message)
+            self.report(token.line, f" at '{token.lexeme}'", message, token.file)
             
-    @classmethod
-    def runtime_error(cls, error):
+    def runtime_error(self, error):
         """
         报告运行时错误
         
         Args:
             error: RuntimeError, 运行时错误对象
         """
-        message = f"[行 {error.token.line}] 运行时错误: {error}"
-        print(message, file=sys.stderr)
-        cls.had_runtime_error = True
+        message = f"[{location(error.token.line, error.token.file)}] 运行时错误: {error}"
+        print(message, file=self.error_output())
+        self.had_runtime_error = True
 
-    @classmethod
-    def report(cls, line, where, message):
+    def report(self, line, where, message, file=None):
         """
         输出错误信息
         
@@ -245,13 +639,13 @@ class Lox:
             line: int, 错误发生的行号
             where: str, 错误位置的额外信息
             message: str, 错误信息
+            file: str, 错误所在的模块文件，主程序为None
         """
-        message = f"[行 {line}] 错误{where}: {message}"
-        print(message, file=sys.stderr)
-        cls.had_error = True
+        message = f"[{location(line, file)}] 错误{where}: {message}"
+        print(message, file=self.error_output())
+        self.had_error = True
         
-    @classmethod
-    def evaluate(cls, source):
+    def evaluate(self, source):
         """
         计算单个表达式的值（便捷方法）
         
@@ -261,52 +655,52 @@ class Lox:
         Returns:
             表达式的值，如果有错误则返回None
         """
-        cls.had_error = False
-        cls.had_runtime_error = False
+        self.had_error = False
+        self.had_runtime_error = False
+        self.init()
         
         # 扫描：源代码 -> 词法标记
-        scanner = Scanner(source)
+        scanner = Scanner(source, lox=self)
         tokens = scanner.scan_tokens()
         
         # 有词法错误时停止
-        if cls.had_error:
+        if self.had_error:
             return None
             
         # 解析：词法标记 -> 语句列表
         from pylox.parser import Parser
         
-        parser = Parser(tokens)
+        parser = Parser(tokens, lox=self)
         
         # 尝试解析为表达式
         try:
             expression = parser.parse_expression()
             
             # 有语法错误时停止
-            if cls.had_error:
+            if self.had_error:
                 return None
             
             # 如果解析成功，获取表达式的值并返回
             if expression:
-                return cls.interpreter.evaluate(expression)
+                return self.interpreter.evaluate(expression)
                 
         except Exception:
             # 如果解析为表达式失败，尝试解析为语句列表
             statements = parser.parse()
             
             # 有语法错误时停止
-            if cls.had_error:
+            if self.had_error:
                 return None
                 
             # 解释执行
             try:
-                return cls.run(source)
+                return self.run(source)
             except Return as ret:
                 return ret.value
                 
         return None
 
-    @classmethod
-    def warning(cls, message):
+    def warning(self, message):
         """
         输出警告信息
         
@@ -315,8 +709,99 @@ class Lox:
         Args:
             message: str, 警告信息
         """
-        print(f"[警告] {message}", file=sys.stderr)
-        cls.had_warnings = True
+        print(f"[警告] {message}", file=self.error_output())
+        self.had_warnings = True
+    
+    def report_exception(self, message):
+        """
+        报告解释器内部的意外异常
+        
+        先输出说明信息并写出已缓冲的输出，再把异常栈写入错误输出流。
+        
+        Args:
+            message: str, 说明信息
+        """
+        self.write(message)
+        self.interpreter.output.flush()
+        import traceback
+        traceback.print_exc(file=self.error_output())
+
+
+class Lox:
+    """
+    Lox语言的主类
+    
+    进程级的默认运行时，供命令行和只需要一个解释器的代码使用。状态保存在
+    类属性上，方法与LoxRuntime共用同一份实现。需要在同一进程中并发运行
+    多个相互隔离的程序时，请为每个程序创建一个LoxRuntime实例。
+    """
+    
+    # 状态标志
+    had_error = False
+    had_runtime_error = False
+    had_warnings = False
+    
+    # 调试标志
+    debug_mode = False
+    
+    # 性能分析
+    profile = False
+    profile_output = None
+    sample_output = None
+    sample_interval = None
+    
+    # 运行统计
+    stats = False
+    metrics = None
+    
+    # 行覆盖率
+    coverage = False
+    coverage_output = None
+    
+    # 执行预算
+    budget = None
+    
+    # 延迟解析顶层函数的函数体
+    lazy_parse = False
+    
+    # 模块加载器
+    module_loader = None
+    
+    # 输出目标
+    output = None
+    error_stream = None
+    
+    # 解释器实例
+    interpreter = None
+    interpreter_features = None
+    
+    init = classmethod(LoxRuntime.init)
+    feature_flags = classmethod(LoxRuntime.feature_flags)
+    interpreter_class = classmethod(LoxRuntime.interpreter_class)
+    error_output = classmethod(LoxRuntime.error_output)
+    set_trace = classmethod(LoxRuntime.set_trace)
+    write = classmethod(LoxRuntime.write)
+    run_file = classmethod(LoxRuntime.run_file)
+    _run_file = classmethod(LoxRuntime._run_file)
+    write_profile = classmethod(LoxRuntime.write_profile)
+    write_samples = classmethod(LoxRuntime.write_samples)
+    write_coverage = classmethod(LoxRuntime.write_coverage)
+    execute_file = classmethod(LoxRuntime.execute_file)
+    execute_source = classmethod(LoxRuntime.execute_source)
+    exit_status = classmethod(LoxRuntime.exit_status)
+    run_prompt = classmethod(LoxRuntime.run_prompt)
+    run = classmethod(LoxRuntime.run)
+    compile = classmethod(LoxRuntime.compile)
+    validate_source = classmethod(LoxRuntime.validate_source)
+    validate_file = classmethod(LoxRuntime.validate_file)
+    execute_statements = classmethod(LoxRuntime.execute_statements)
+    error = classmethod(LoxRuntime.error)
+    error_token = classmethod(LoxRuntime.error_token)
+    runtime_error = classmethod(LoxRuntime.runtime_error)
+    report = classmethod(LoxRuntime.report)
+    evaluate = classmethod(LoxRuntime.evaluate)
+    warning = classmethod(LoxRuntime.warning)
+    report_exception = classmethod(LoxRuntime.report_exception)
 
 
 if __name__ == "__main__":
@@ -326,18 +811,10 @@ if __name__ == "__main__":
     如果提供一个参数，将其作为文件路径执行
     否则启动交互式解释器
     
-    命令行参数:
-    -d, --debug: 启用调试模式
+    命令行参数见pylox.cli
     """
     print("Lox Python解释器")
     
-    # 处理命令行参数
-    parser = argparse.ArgumentParser(description='Lox解释器')
-    parser.add_argument('script', nargs='?', help='要执行的Lox脚本文件')
-    parser.add_argument('-d', '--debug', action='store_true', help='启用调试模式')
-    args = parser.parse_args()
-    
-    if args.script:
-        Lox.run_file(args.script, args.debug)
-    else:
-        Lox.run_prompt()
\ No newline at end of file
+    # 交给CLI处理命令行参数，保证解释器各组件使用同一个pylox.lox.Lox
+    from pylox.cli import main
+    main()
\ No newline at end of file
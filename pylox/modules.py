@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+模块系统
+
+import "path";语句导入一个Lox源文件：解释器第一次导入某个模块时在全局
+环境中执行它的顶层语句，之后再导入同一模块不会重复执行，模块定义的全局
+变量、函数和类对导入者可见。相对路径相对于正在执行的模块（或脚本）所在
+的目录；循环导入时，正在导入的模块视为已经导入。
+
+模块的词法单元记录了模块文件的路径，模块中的语法错误、变量解析错误和运行时
+错误都会带上该路径。
+
+ModuleLoader按路径、修改时间和文件大小缓存模块扫描和语法分析得到的语法
+树，同一进程中的所有运行时（常驻服务的各个请求、批处理同一工作进程中的
+脚本）共享这些语法树，只在文件变化后重新分析。变量解析的结果属于各个
+解释器（全局槽位来自解释器自己的全局环境），所以每个解释器在首次导入时
+对共享的语法树解析一次。设置cache_dir后语法树还以pickle格式写入该目录，
+供之后启动的进程直接读取。
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+from pylox.interpreter.runtime_error import RuntimeError
+from pylox.parser import Parser
+from pylox.scanner import Scanner
+
+
+# 磁盘缓存的格式版本，语法树节点的结构变化时递增
+CACHE_VERSION = 2
+
+
+class ModuleLoader:
+    """
+    读取并缓存模块的语法树
+    """
+
+    def __init__(self, cache_dir=None):
+        """
+        初始化加载器
+
+        Args:
+            cache_dir: str, 磁盘缓存目录，None表示只在内存中缓存
+        """
+        self.cache_dir = cache_dir
+        self.modules = {}  # 路径 -> ((修改时间, 大小), 语句列表)
+        self.lock = threading.Lock()
+
+    def load(self, path, lox):
+        """
+        返回模块的语法树，文件未变化时使用缓存
+
+        Args:
+            path: str, 模块的绝对路径
+            lox: 错误报告对象，模块有语法错误时通过它报告
+
+        Returns:
+            list[Stmt]: 语句列表，有语法错误时为None
+
+        Raises:
+            OSError: 无法读取模块文件
+        """
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            cached = self.modules.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        statements = self.read_cache(path, key)
+        if statements is None:
+            statements = self.parse(path, lox)
+            if statements is None:
+                return None
+            self.write_cache(path, key, statements)
+
+        with self.lock:
+            self.modules[path] = (key, statements)
+        return statements
+
+    def preload(self, paths, workers=None):
+        """
+        在进程池中并行分析一组模块并放入缓存
+
+        有错误的模块不放入缓存，导入时再按通常的方式报告。
+
+        Args:
+            paths: list[str], 模块路径列表
+            workers: int, 工作进程数，默认为CPU数量；为1时在当前进程中依次执行
+
+        Returns:
+            int: 放入缓存的模块数
+        """
+        from pylox.check import parse_files
+        loaded = 0
+        for result in parse_files([os.path.abspath(path) for path in paths], workers):
+            if result["statements"] is None:
+                continue
+            key = (result["mtime_ns"], result["size"])
+            self.write_cache(result["path"], key, result["statements"])
+            with self.lock:
+                self.modules[result["path"]] = (key, result["statements"])
+            loaded += 1
+        return loaded
+
+    def parse(self, path, lox):
+        """
+        扫描并解析模块文件
+
+        Args:
+            path: str, 模块路径
+            lox: 错误报告对象
+
+        Returns:
+            list[Stmt]: 语句列表，有语法错误时为None
+        """
+        with open(path, 'r', encoding='utf-8') as file:
+            source = file.read()
+
+        had_error = lox.had_error
+        lox.had_error = False
+        tokens = Scanner(source, lox=lox, file=path).scan_tokens()
+        statements = Parser(tokens, lox=lox).parse()
+        failed = lox.had_error
+        lox.had_error = had_error or failed
+        return None if failed else statements
+
+    def cache_path(self, path):
+        """
+        返回模块在磁盘缓存中的文件路径
+
+        Args:
+            path: str, 模块路径
+
+        Returns:
+            str: 缓存文件路径
+        """
+        digest = hashlib.sha1(path.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".pickle")
+
+    def read_cache(self, path, key):
+        """
+        从磁盘缓存读取语法树
+
+        Args:
+            path: str, 模块路径
+            key: tuple, 模块文件的(修改时间, 大小)
+
+        Returns:
+            list[Stmt]: 语句列表，没有启用磁盘缓存、没有缓存或缓存已过期时为None
+        """
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self.cache_path(path), "rb") as file:
+                version, cached_path, cached_key, statements = pickle.load(file)
+        except Exception:
+            # 缓存不存在、损坏或来自不兼容的版本时重新分析
+            return None
+        if (version, cached_path, cached_key) != (CACHE_VERSION, path, key):
+            return None
+        return statements
+
+    def write_cache(self, path, key, statements):
+        """
+        把语法树写入磁盘缓存，写入失败时忽略
+
+        Args:
+            path: str, 模块路径
+            key: tuple, 模块文件的(修改时间, 大小)
+            statements: list[Stmt], 语句列表
+        """
+        if self.cache_dir is None:
+            return
+        temp = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, temp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump((CACHE_VERSION, path, key, statements), file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp, self.cache_path(path))
+        except (OSError, RecursionError, pickle.PicklingError):
+            if temp is not None and os.path.exists(temp):
+                os.remove(temp)
+
+
+# 进程内所有运行时默认共享的加载器
+default_loader = ModuleLoader()
+
+
+def import_module(interpreter, stmt):
+    """
+    执行import语句
+
+    Args:
+        interpreter: Interpreter, 执行导入的解释器
+        stmt: Import, import语句
+
+    Raises:
+        RuntimeError: 模块无法读取，或有语法错误或变量解析错误
+    """
+    lox = interpreter.lox
+    name = stmt.path.literal
+    base = interpreter.module_dirs[-1] if interpreter.module_dirs else os.getcwd()
+    path = os.path.normpath(os.path.join(base, name))
+    if path in interpreter.modules:
+        return
+
+    loader = getattr(lox, "module_loader", None) or default_loader
+    try:
+        statements = loader.load(path, lox)
+    except OSError:
+        raise RuntimeError(stmt.path, f"无法读取模块'{name}'。")
+    if statements is None:
+        raise RuntimeError(stmt.path, f"模块'{name}'有错误，无法导入。")
+
+    from pylox.resolver import Resolver
+    had_error = lox.had_error
+    lox.had_error = False
+    Resolver(interpreter, lox=lox).resolve(statements)
+    failed = lox.had_error
+    lox.had_error = had_error or failed
+    if failed:
+        raise RuntimeError(stmt.path, f"模块'{name}'有错误，无法导入。")
+
+    # 先登记再执行，循环导入时不会重复执行
+    interpreter.modules.add(path)
+    interpreter.module_dirs.append(os.path.dirname(path))
+    try:
+        interpreter.execute_module(path, statements)
+    finally:
+        interpreter.module_dirs.pop()
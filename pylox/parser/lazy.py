@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+延迟解析的函数体
+
+以Parser(tokens, lazy=True)解析时，顶层函数声明的函数体只做括号匹配，
+记录函数体在标记列表中的范围，得到LazyFunction节点。函数第一次被调用
+（或函数体第一次被访问）时才解析函数体并解析其中的变量引用，之后节点
+变回普通的Function，不再有额外开销。
+
+只有顶层函数可以延迟：方法、嵌套函数和Lambda的变量解析依赖外层作用域，
+仍然立即解析。函数体中的语法错误和变量解析错误推迟到首次调用时报告，
+报告方式与立即解析时相同（同样设置had_error），随后以运行时错误结束
+这次调用。需要在执行前发现所有错误时，用LoxRuntime.validate_file以立即
+解析模式检查。
+"""
+
+from pylox.interpreter.runtime_error import RuntimeError
+from pylox.syntax_tree.stmt import Function
+
+
+class LazyFunction(Function):
+    """
+    函数体尚未解析的顶层函数声明
+    """
+
+    def __init__(self, name, params, tokens, start, end, lox):
+        """
+        初始化函数声明
+
+        Args:
+            name: Token, 函数名
+            params: list, 参数标记列表
+            tokens: list[Token], 整个源文件的标记列表
+            start: int, 函数体第一个标记（'{'之后）的位置
+            end: int, 函数体结束的'}'的位置
+            lox: 错误报告对象（LoxRuntime或Lox类），解析函数体时使用它的解释器
+        """
+        self.name = name
+        self.params = params
+        self.is_static = False
+        self.is_getter = False
+        self.tokens = tokens
+        self.start = start
+        self.end = end
+        self.lox = lox
+        self.parsed_body = None  # 解析得到的语句列表
+        self.failed = False  # 函数体是否有错误
+
+    @property
+    def body(self):
+        """
+        函数体语句列表，首次访问时解析
+
+        Returns:
+            list[Stmt]: 函数体语句列表
+        """
+        if self.parsed_body is None:
+            return self.load()
+        return self.parsed_body
+
+    def load(self):
+        """
+        解析函数体并解析其中的变量引用，成功后节点变回普通的Function
+
+        Returns:
+            list[Stmt]: 函数体语句列表
+
+        Raises:
+            RuntimeError: 函数体有语法错误或变量解析错误
+        """
+        if self.failed:
+            raise RuntimeError(self.name, f"函数'{self.name.lexeme}'的函数体有错误，无法调用。")
+
+        from pylox.parser.parser import Parser, ParseError
+        from pylox.resolver.resolver import Resolver, FunctionType
+
+        lox = self.lox
+        had_error = lox.had_error
+        lox.had_error = False
+
+        # 函数体的标记加上EOF，错误恢复不会越过函数体
+        tokens = self.tokens[self.start:self.end + 1]
+        tokens.append(self.tokens[-1])
+        parser = Parser(tokens, lox=lox)
+        try:
+            statements = parser.block()
+        except ParseError:
+            statements = None
+
+        if not lox.had_error:
+            self.parsed_body = statements
+            Resolver(lox.interpreter, lox=lox).resolve_function(self, FunctionType.FUNCTION)
+
+        self.failed = lox.had_error
+        lox.had_error = had_error or self.failed
+        if self.failed:
+            self.parsed_body = None
+            self.tokens = None
+            raise RuntimeError(self.name, f"函数'{self.name.lexeme}'的函数体有错误，无法调用。")
+
+        del self.tokens, self.start, self.end, self.lox, self.parsed_body, self.failed
+        self.__class__ = Function
+        self.body = statements
+        return statements
@@ -12,6 +12,7 @@ from pylox.scanner.token_type import TokenType
 from pylox.syntax_tree import Binary, Grouping, Literal, Unary, Variable, Assign, Logical, Call, Lambda, Inner
 from pylox.syntax_tree import Get, Set, This  # 添加新的表达式类型
 from pylox.syntax_tree import Expression, Print, Var, Block, If, While, Break, Function, Return, Class  # 添加Class
+from pylox.syntax_tree import Import
 
 
 class ParseError(Exception):
@@ -26,15 +27,22 @@ class Parser:
     实现了Lox语言的表达式语法解析，采用递归下降解析算法。
     """
     
-    def __init__(self, tokens):
+    def __init__(self, tokens, lox=None, lazy=False):
         """
         初始化解析器
         
         Args:
             tokens: List[Token], 标记列表
+            lox: 错误报告对象（LoxRuntime或Lox类），默认为pylox.lox.Lox
+            lazy: bool, 是否延迟解析顶层函数的函数体，见pylox.parser.lazy
         """
         self.tokens = tokens  # 要解析的标记列表
         self.current = 0      # 当前标记位置
+        self.lazy = lazy
+        if lox is None:
+            from pylox.lox import Lox
+            lox = Lox
+        self.lox = lox  # 错误报告对象
     
     def parse(self):
         """
@@ -46,7 +54,7 @@ class Parser:
         statements = []
         
         while not self.is_at_end():
-            statements.append(self.declaration())
+            statements.append(self.declaration(top_level=True))
             
         return statements
         
@@ -62,12 +70,15 @@ class Parser:
         except ParseError:
             return None
     
-    def declaration(self):
+    def declaration(self, top_level=False):
         """
         解析声明语句
         
-        声明 → classDecl | funDecl | varDecl | statement
+        声明 → classDecl | funDecl | varDecl | importStmt | statement
         
+        Args:
+            top_level: bool, 是否是顶层声明，延迟解析模式下顶层函数的函数体延迟解析
+            
         Returns:
             Stmt: 声明语句
         """
@@ -75,16 +86,18 @@ class Parser:
             if self.match(TokenType.CLASS):
                 return self.class_declaration()
             if self.match(TokenType.FUN):
-                return self.function_declaration("function")
+                return self.function_declaration("function", lazy=top_level and self.lazy)
             if self.match(TokenType.VAR):
                 return self.var_declaration()
+            if self.match(TokenType.IMPORT):
+                return self.import_statement(top_level)
                 
             return self.statement()
         except ParseError:
             self.synchronize()
             return None
             
-    def function_declaration(self, kind, is_static=False, is_getter=False):
+    def function_declaration(self, kind, is_static=False, is_getter=False, lazy=False):
         """
         解析函数声明
         
@@ -98,9 +111,10 @@ class Parser:
             kind: str, 函数类型，用于错误消息
             is_static: bool, 是否是静态方法
             is_getter: bool, 是否是getter方法
+            lazy: bool, 是否只匹配函数体的括号，首次调用时再解析函数体
             
         Returns:
-            Function: 函数声明对象
+            Function: 函数声明对象，延迟解析时为LazyFunction
             
         Raises:
             ParseError: 解析错误时抛出
@@ -132,6 +146,11 @@ class Parser:
         
         # 解析函数体
         self.consume(TokenType.LEFT_BRACE, "期望" + kind + "体开始的'{'。")
+        if lazy:
+            from pylox.parser.lazy import LazyFunction
+            start = self.current
+            self.skip_block()
+            return LazyFunction(name, parameters, self.tokens, start, self.current - 1, self.lox)
         body = self.block()
         
         return Function(name, parameters, body, is_static, is_getter)
@@ -208,9 +227,10 @@ class Parser:
         Raises:
             ParseError: 打印语句格式错误时抛出
         """
+        keyword = self.previous()
         value = self.expression()
         self.consume(TokenType.SEMICOLON, "打印语句后需要';'。")
-        return Print(value)
+        return Print(value, keyword)
     
     def block(self):
         """
@@ -232,6 +252,25 @@ class Parser:
         self.consume(TokenType.RIGHT_BRACE, "代码块后需要'}'。")
         return statements
     
+    def skip_block(self):
+        """
+        跳过代码块的标记，直到与已消费的'{'匹配的'}'
+        
+        Raises:
+            ParseError: 代码块没有结束时抛出
+        """
+        depth = 1
+        while not self.is_at_end():
+            token = self.advance()
+            if token.type == TokenType.LEFT_BRACE:
+                depth += 1
+            elif token.type == TokenType.RIGHT_BRACE:
+                depth -= 1
+                if depth == 0:
+                    return
+                    
+        raise self.error(self.peek(), "代码块后需要'}'。")
+    
     def expression_statement(self):
         """
         exprStmt → expression ";"
@@ -260,6 +299,7 @@ class Parser:
         Raises:
             ParseError: 解析出错时抛出
         """
+        keyword = self.previous()
         self.consume(TokenType.LEFT_PAREN, "if语句后需要'('。")
         condition = self.expression()
         self.consume(TokenType.RIGHT_PAREN, "条件表达式后需要')'。")
@@ -270,7 +310,7 @@ class Parser:
         if self.match(TokenType.ELSE):
             else_branch = self.statement()
             
-        return If(condition, then_branch, else_branch)
+        return If(condition, then_branch, else_branch, keyword)
     
     def while_statement(self):
         """
@@ -284,13 +324,14 @@ class Parser:
         Raises:
             ParseError: 解析出错时抛出
         """
+        keyword = self.previous()
         self.consume(TokenType.LEFT_PAREN, "while语句后需要'('。")
         condition = self.expression()
         self.consume(TokenType.RIGHT_PAREN, "条件表达式后需要')'。")
         
         body = self.statement()
         
-        return While(condition, body)
+        return While(condition, body, keyword)
     
     def for_statement(self):
         """
@@ -306,6 +347,7 @@ class Parser:
         Raises:
             ParseError: 解析出错时抛出
         """
+        keyword = self.previous()
         self.consume(TokenType.LEFT_PAREN, "for语句后需要'('。")
         
         # 初始化部分
@@ -343,7 +385,7 @@ class Parser:
             condition = Literal(True)
             
         # 转换为while循环
-        body = While(condition, body)
+        body = While(condition, body, keyword)
         
         # 如果有初始化器，将其添加在循环之前
         if initializer is not None:
@@ -368,6 +410,30 @@ class Parser:
         self.consume(TokenType.SEMICOLON, "break语句后需要';'。")
         return Break(keyword)
     
+    def import_statement(self, top_level):
+        """
+        解析import语句
+        
+        语法规则：
+        importStmt → "import" STRING ";" ;
+        
+        Args:
+            top_level: bool, 是否是顶层语句，import只能出现在顶层
+            
+        Returns:
+            Import: import语句对象
+            
+        Raises:
+            ParseError: 解析错误时抛出
+        """
+        keyword = self.previous()
+        if not top_level:
+            self.error(keyword, "import只能出现在顶层。")
+            
+        path = self.consume(TokenType.STRING, "import后需要模块路径字符串。")
+        self.consume(TokenType.SEMICOLON, "import语句后需要';'。")
+        return Import(keyword, path)
+    
     def return_statement(self):
         """
         解析return语句
@@ -609,18 +675,21 @@ class Parser:
             
         # 解析匿名函数（Lambda表达式）
         if self.match(TokenType.FUN):
-            return self.lambda_expression()
+            return self.lambda_expression(self.previous())
             
         # 没有匹配到任何有效的基本表达式
         raise self.error(self.peek(), "期望表达式。")
     
-    def lambda_expression(self):
+    def lambda_expression(self, keyword=None):
         """
         解析Lambda表达式（匿名函数）
         
         语法规则：
         lambda → "fun" "(" parameters? ")" block ;
         
+        Args:
+            keyword: Token, 已匹配的fun关键字标记
+        
         Returns:
             Lambda: Lambda表达式对象
             
@@ -648,7 +717,7 @@ class Parser:
         self.consume(TokenType.LEFT_BRACE, "Lambda表达式需要'{'开始的函数体。")
         body = self.block()
         
-        return Lambda(parameters, body)
+        return Lambda(parameters, body, keyword)
     
     def call(self):
         """
@@ -802,8 +871,7 @@ class Parser:
         Returns:
             ParseError: 解析错误异常
         """
-        from pylox.lox import Lox
-        Lox.error_token(token, message)
+        self.lox.error_token(token, message)
         return ParseError()
     
     def synchronize(self):
@@ -827,7 +895,8 @@ class Parser:
                 TokenType.IF,
                 TokenType.WHILE,
                 TokenType.PRINT,
-                TokenType.RETURN
+                TokenType.RETURN,
+                TokenType.IMPORT
             ):
                 return
                 
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+交互式会话
+
+ReplSession把逐行输入累积成完整的代码段再执行：括号或花括号未闭合、
+字符串或块注释未结束时提示继续输入，在继续输入时输入空行则立即执行。
+
+会话在多次输入之间复用同一个变量解析器，用于检查输入是否完整的扫描
+结果也直接交给语法分析；执行完一段输入后，不属于函数、Lambda或类声明的
+节点不会再被执行，会话把它们的解析结果从解释器中释放，长时间的会话不会
+越来越慢、越来越大。顶层声明保存在解释器的全局环境中，在输入之间一直有效。
+"""
+
+from pylox.scanner import Scanner, TokenType
+from pylox.syntax_tree.expr import Lambda
+from pylox.syntax_tree.stmt import Function, Class
+from pylox.syntax_tree.locations import child_nodes
+
+
+# 这些错误表示输入尚未结束
+INCOMPLETE_ERRORS = {"Unterminated string.", "Unterminated block comment."}
+
+OPENING = {TokenType.LEFT_PAREN: 1, TokenType.LEFT_BRACE: 1,
+           TokenType.RIGHT_PAREN: -1, TokenType.RIGHT_BRACE: -1}
+
+
+class ScanErrors:
+    """
+    收集扫描错误而不输出，用于判断输入是否完整
+    """
+
+    def __init__(self):
+        """初始化错误列表"""
+        self.messages = []
+
+    def error(self, line, message):
+        """
+        记录一个错误
+
+        Args:
+            line: int, 错误所在行
+            message: str, 错误信息
+        """
+        self.messages.append(message)
+
+
+def transient_nodes(statements):
+    """
+    找出执行完毕后不会再被执行的节点
+
+    函数、Lambda和类声明之下的节点可能在以后被调用，其余节点只在这段
+    输入执行时使用一次。
+
+    Args:
+        statements: list[Stmt], 一段输入的语句列表
+
+    Returns:
+        list: 可以释放解析结果的节点
+    """
+    nodes = []
+    pending = list(statements)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, (Function, Lambda, Class)):
+            continue
+        nodes.append(node)
+        pending.extend(child_nodes(node))
+    return nodes
+
+
+class ReplSession:
+    """
+    支持多行输入的交互式会话
+    """
+
+    PROMPT = "> "
+    CONTINUATION_PROMPT = "... "
+
+    def __init__(self, runtime=None):
+        """
+        初始化会话
+
+        Args:
+            runtime: LoxRuntime, 执行输入的运行时（也可以是Lox类），默认新建一个
+        """
+        if runtime is None:
+            from pylox.lox import LoxRuntime
+            runtime = LoxRuntime()
+        self.runtime = runtime
+        self.buffer = []  # 尚未执行的输入行
+        self.resolver = None  # 在多次输入之间复用的变量解析器
+
+    @property
+    def pending(self):
+        """是否有尚未执行的不完整输入"""
+        return bool(self.buffer)
+
+    def feed(self, line):
+        """
+        输入一行
+
+        Args:
+            line: str, 不含换行符的一行输入
+
+        Returns:
+            bool: 已执行累积的输入时为True，需要继续输入时为False
+        """
+        self.buffer.append(line)
+        source = "\n".join(self.buffer)
+        complete, tokens = self.scan(source)
+        if not complete and line.strip():
+            return False
+
+        self.buffer = []
+        self.execute(source, tokens)
+        return True
+
+    def scan(self, source):
+        """
+        扫描源代码并判断输入是否完整
+
+        Args:
+            source: str, 累积的输入
+
+        Returns:
+            tuple: (是否完整, 标记列表)；有扫描错误时标记列表为None，
+                执行时重新扫描以正常报告错误
+        """
+        errors = ScanErrors()
+        tokens = Scanner(source, lox=errors).scan_tokens()
+        if INCOMPLETE_ERRORS.intersection(errors.messages):
+            return False, None
+
+        depth = 0
+        for token in tokens:
+            depth += OPENING.get(token.type, 0)
+        return depth <= 0, None if errors.messages else tokens
+
+    def execute(self, source, tokens=None):
+        """
+        执行一段完整的输入，然后释放不再需要的解析结果
+
+        Args:
+            source: str, 源代码
+            tokens: list[Token], 已经扫描好的标记，None表示重新扫描
+        """
+        runtime = self.runtime
+        runtime.init()
+        if self.resolver is None:
+            from pylox.resolver import Resolver
+            self.resolver = Resolver(runtime.interpreter, lox=runtime)
+
+        try:
+            statements = runtime.compile(source, tokens, self.resolver)
+        except Exception:
+            # 解析器的作用域栈可能处于中间状态，下次输入时重新创建
+            self.resolver = None
+            raise
+        if statements is not None:
+            runtime.execute_statements(statements, repl_mode=True)
+            runtime.interpreter.forget(transient_nodes(statements))
+        # 每段输入之后重置错误状态
+        runtime.had_error = False
+
+    def interact(self, read=input):
+        """
+        运行读取-执行循环，直到输入结束
+
+        Args:
+            read: callable, 以提示符调用并返回一行输入的函数
+        """
+        print("Lox 交互式模式 (Ctrl+D或Ctrl+Z退出)")
+        try:
+            while True:
+                line = read(self.CONTINUATION_PROMPT if self.pending else self.PROMPT)
+                if not line and not self.pending:
+                    break
+                self.feed(line)
+        except EOFError:
+            print("\nGoodbye!")
+        except KeyboardInterrupt:
+            print("\nREPL被中断")
+        except Exception as e:
+            self.runtime.report_exception(f"[异常]  REPL发生异常: {e}")
@@ -17,14 +17,19 @@ class OptimizedResolver(Visitor):
     使用数组索引代替映射查找，提高变量访问性能。
     """
     
-    def __init__(self, interpreter):
+    def __init__(self, interpreter, lox=None):
         """
         初始化解析器
         
         Args:
             interpreter: Interpreter, 解释器实例，用于存储解析结果
+            lox: 错误报告对象（LoxRuntime或Lox类），默认为pylox.lox.Lox
         """
         self.interpreter = interpreter
+        if lox is None:
+            from pylox.lox import Lox
+            lox = Lox
+        self.lox = lox  # 错误报告对象
         self.scopes = []  # 作用域栈
         self.current_function = 0  # 当前函数类型
         self.warn_unused = True  # 是否警告未使用的变量
@@ -74,12 +79,10 @@ class OptimizedResolver(Visitor):
         """结束当前作用域，检查未使用的变量"""
         if self.warn_unused and self.scopes:
             scope = self.scopes[-1]
-            from pylox.lox import Lox
-            
             # 检查作用域中是否有未使用的变量
             for name, (initialized, used, _) in scope.items():
                 if not used and initialized:
-                    Lox.warning(f"局部变量 '{name}' 已声明但从未使用。")
+                    self.lox.warning(f"局部变量 '{name}' 已声明但从未使用。")
         
         self.scopes.pop()
     
@@ -97,8 +100,7 @@ class OptimizedResolver(Visitor):
         
         # 检查变量是否已在当前作用域中声明
         if name.lexeme in scope:
-            from pylox.lox import Lox
-            Lox.error(name, f"已经在此作用域中声明了变量'{name.lexeme}'。")
+            self.lox.error_token(name, f"已经在此作用域中声明了变量'{name.lexeme}'。")
         
         # 分配新的索引
         index = self.next_index
@@ -212,8 +214,7 @@ class OptimizedResolver(Visitor):
         """访问return语句"""
         # 检查return语句是否在函数内部
         if self.current_function == 0:
-            from pylox.lox import Lox
-            Lox.error(stmt.keyword, "不能在函数外部使用return语句。")
+            self.lox.error_token(stmt.keyword, "不能在函数外部使用return语句。")
         
         if stmt.value is not None:
             self.resolve_expr(stmt.value)
@@ -287,8 +288,7 @@ class OptimizedResolver(Visitor):
         """访问变量表达式"""
         # 检查变量是否引用了它自己的初始化器
         if self.scopes and expr.name.lexeme in self.scopes[-1] and self.scopes[-1][expr.name.lexeme][0] == False:
-            from pylox.lox import Lox
-            Lox.error(expr.name, "不能在变量自己的初始化器中引用该变量。")
+            self.lox.error_token(expr.name, "不能在变量自己的初始化器中引用该变量。")
         
         # 解析变量引用
         self.resolve_local(expr, expr.name)
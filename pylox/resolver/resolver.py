@@ -10,6 +10,7 @@
 
 from pylox.syntax_tree.visitor import Visitor
 from pylox.syntax_tree.expr import Variable
+from pylox.parser.lazy import LazyFunction
 
 
 # 函数类型枚举
@@ -38,24 +39,29 @@ class Resolver(Visitor):
     实现了访问者模式接口。
     """
     
-    def __init__(self, interpreter):
+    def __init__(self, interpreter, lox=None):
         """
         初始化解析器
         
         Args:
             interpreter: Interpreter, 解释器实例，用于存储解析结果
+            lox: 错误报告对象（LoxRuntime或Lox类），默认为pylox.lox.Lox
         """
         self.interpreter = interpreter
+        if lox is None:
+            from pylox.lox import Lox
+            lox = Lox
+        self.lox = lox  # 错误报告对象
         self.scopes = []  # 作用域栈
         self.current_function = FunctionType.NONE  # 当前函数类型
         self.current_class = ClassType.NONE  # 当前类类型
         self.warn_unused = True  # 是否警告未使用的变量
+        # 拥有独立环境的块和函数栈，元素为[节点, 是否被闭包捕获]
+        self.frames = []
         # 特殊标记，当解析变量声明时，暂时允许引用外部同名变量
         self.in_var_declaration = False  
         # 当前正在声明的变量名
         self.current_var_name = None
-        from pylox.lox import Lox
-        self.lox = Lox  # Lox类引用，用于错误报告
     
     def resolve(self, statements):
         """
@@ -97,15 +103,37 @@ class Resolver(Visitor):
         """结束当前作用域，检查未使用的变量"""
         if self.warn_unused and self.scopes:
             scope = self.scopes[-1]
-            from pylox.lox import Lox
-            
             # 检查作用域中是否有未使用的变量
             for name, [initialized, used] in scope.items():
                 if not used and initialized:
-                    Lox.warning(f"局部变量 '{name}' 已声明但从未使用。")
+                    self.lox.warning(f"局部变量 '{name}' 已声明但从未使用。")
         
         self.scopes.pop()
     
+    def begin_frame(self, node):
+        """
+        开始一个拥有独立运行时环境的块或函数
+        
+        Args:
+            node: Block | Function | Lambda, 语法树节点
+        """
+        self.frames.append([node, False])
+    
+    def end_frame(self):
+        """结束当前块或函数，把环境是否逃逸告知解释器"""
+        node, captured = self.frames.pop()
+        self.interpreter.resolve_frame(node, captured)
+    
+    def capture_frames(self):
+        """
+        标记当前所有外层环境都被闭包捕获
+        
+        在函数声明、Lambda表达式和类声明处调用：新建的函数对象会持有当前
+        环境，进而通过enclosing链引用所有外层环境。
+        """
+        for frame in self.frames:
+            frame[1] = True
+    
     def declare(self, name):
         """
         声明变量
@@ -120,8 +148,7 @@ class Resolver(Visitor):
         
         # 检查变量是否已在当前作用域中声明
         if name.lexeme in scope:
-            from pylox.lox import Lox
-            Lox.error(name, f"已经在此作用域中声明了变量'{name.lexeme}'。")
+            self.lox.error_token(name, f"已经在此作用域中声明了变量'{name.lexeme}'。")
         
         # 变量状态：[是否已初始化, 是否已使用]
         scope[name.lexeme] = [False, False]
@@ -169,7 +196,8 @@ class Resolver(Visitor):
                 self.interpreter.resolve(expr, len(self.scopes) - 1 - i)
                 return
         
-        # 变量未找到，可能是全局变量，让解释器处理
+        # 变量未找到，视为全局变量，由解释器分配全局槽位
+        self.interpreter.resolve_global(expr, name)
     
     def resolve_function(self, function, type):
         """
@@ -184,6 +212,7 @@ class Resolver(Visitor):
         
         # 为函数创建新的作用域
         self.begin_scope()
+        self.begin_frame(function)
         
         # 声明并定义参数
         for param in function.params:
@@ -194,6 +223,7 @@ class Resolver(Visitor):
         self.resolve(function.body)
         
         # 结束函数作用域
+        self.end_frame()
         self.end_scope()
         
         # 恢复函数类型
@@ -203,7 +233,9 @@ class Resolver(Visitor):
     def visit_block_stmt(self, stmt):
         """访问块语句"""
         self.begin_scope()
+        self.begin_frame(stmt)
         self.resolve(stmt.statements)
+        self.end_frame()
         self.end_scope()
         return None
     
@@ -218,6 +250,13 @@ class Resolver(Visitor):
         self.declare(stmt.name)
         self.define(stmt.name)
         
+        # 函数对象会捕获当前环境
+        self.capture_frames()
+        
+        # 延迟解析的函数体在首次调用时解析
+        if isinstance(stmt, LazyFunction):
+            return None
+        
         # 解析函数体
         self.resolve_function(stmt, FunctionType.FUNCTION)
         return None
@@ -239,8 +278,7 @@ class Resolver(Visitor):
         """访问return语句"""
         # 检查return语句是否在函数内部
         if self.current_function == FunctionType.NONE:
-            from pylox.lox import Lox
-            Lox.error(stmt.keyword, "不能在函数外部使用return语句。")
+            self.lox.error_token(stmt.keyword, "不能在函数外部使用return语句。")
         
         if stmt.value is not None:
             self.resolve_expr(stmt.value)
@@ -297,6 +335,10 @@ class Resolver(Visitor):
         """访问break语句"""
         return None
     
+    def visit_import_stmt(self, stmt):
+        """访问import语句，模块在首次导入时单独解析"""
+        return None
+    
     def visit_assign_expr(self, expr):
         """访问赋值表达式"""
         # 先解析右侧表达式
@@ -353,15 +395,15 @@ class Resolver(Visitor):
                         break
                 else:
                     # 没找到外部作用域的同名变量，确认是自引用错误
-                    from pylox.lox import Lox
-                    Lox.error(expr.name, "不能在变量自己的初始化器中引用该变量。")
+                    self.lox.error_token(expr.name, "不能在变量自己的初始化器中引用该变量。")
                 
         self.resolve_local(expr, expr.name)
         return None
     
     def visit_lambda_expr(self, expr):
         """访问Lambda表达式"""
-        # 处理匿名函数表达式
+        # 处理匿名函数表达式，匿名函数对象会捕获当前环境
+        self.capture_frames()
         self.resolve_function(expr, FunctionType.FUNCTION)
         return None
 
@@ -381,10 +423,13 @@ class Resolver(Visitor):
         self.declare(stmt.name)
         self.define(stmt.name)
         
+        # 类的方法会捕获当前环境
+        self.capture_frames()
+        
         # 处理继承
         if stmt.superclass is not None:
             if stmt.name.lexeme == stmt.superclass.name.lexeme:
-                self.lox.error(stmt.superclass.name, "类不能继承自身。")
+                self.lox.error_token(stmt.superclass.name, "类不能继承自身。")
             
             self.resolve_expr(stmt.superclass)
             
@@ -453,9 +498,7 @@ class Resolver(Visitor):
             None
         """
         if self.current_class == ClassType.NONE:
-            from pylox.lox import Lox
-            self.lox = Lox
-            Lox.error(expr.keyword, "无法在类外部使用'this'。")
+            self.lox.error_token(expr.keyword, "无法在类外部使用'this'。")
             return None
             
         self.resolve_local(expr, expr.keyword)
@@ -471,11 +514,9 @@ class Resolver(Visitor):
         Returns:
             None
         """
-        from pylox.lox import Lox
-        
         # 检查是否在类中
         if self.current_class == ClassType.NONE:
-            Lox.error(expr.keyword, "不能在类外部使用'super'。")
+            self.lox.error_token(expr.keyword, "不能在类外部使用'super'。")
             return None
         
         # 检查是否在子类中
@@ -487,7 +528,7 @@ class Resolver(Visitor):
                 break
         
         if not found_super:
-            Lox.error(expr.keyword, "不能在没有超类的类中使用'super'。")
+            self.lox.error_token(expr.keyword, "不能在没有超类的类中使用'super'。")
             return None
         
         # 解析super关键字
@@ -504,11 +545,9 @@ class Resolver(Visitor):
         Returns:
             None
         """
-        from pylox.lox import Lox
-        
         # 检查是否在类中
         if self.current_class == ClassType.NONE:
-            Lox.error(expr.keyword, "不能在类外部使用'inner'。")
+            self.lox.error_token(expr.keyword, "不能在类外部使用'inner'。")
             return None
         
         # inner不需要特殊的词法环境，只需解析关键字
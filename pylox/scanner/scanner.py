@@ -31,17 +31,25 @@ class Scanner:
         "var": TokenType.VAR,
         "while": TokenType.WHILE,
         "break": TokenType.BREAK,
-        "continue": TokenType.CONTINUE
+        "continue": TokenType.CONTINUE,
+        "import": TokenType.IMPORT
     }
 
-    def __init__(self, source):
+    def __init__(self, source, lox=None, file=None):
         """
         初始化扫描器
         
         Args:
             source: str, 源代码字符串
+            lox: 错误报告对象（LoxRuntime或Lox类），默认为pylox.lox.Lox
+            file: str, 导入的模块文件路径，记录在每个词法单元和错误信息中；主程序为None
         """
         self.source = source
+        self.file = file
+        if lox is None:
+            from pylox.lox import Lox
+            lox = Lox
+        self.lox = lox  # 错误报告对象
         self.tokens = []  # 保存已扫描的词法单元
         
         # 追踪当前扫描位置
@@ -62,7 +70,7 @@ class Scanner:
             self.scan_token()
             
         # 添加EOF标记
-        self.tokens.append(Token(TokenType.EOF, "", None, self.line))
+        self.tokens.append(Token(TokenType.EOF, "", None, self.line, self.file))
         return self.tokens
     
     def is_at_end(self):
@@ -141,8 +149,19 @@ class Scanner:
                 self.identifier()
             else:
                 # 处理非法字符
-                from pylox.lox import Lox
-                Lox.error(self.line, f"Unexpected character: {c}")
+                self.error(f"Unexpected character: {c}")
+    
+    def error(self, message):
+        """
+        报告当前行的错误，扫描模块文件时带上文件路径
+        
+        Args:
+            message: str, 错误信息
+        """
+        if self.file is None:
+            self.lox.error(self.line, message)
+        else:
+            self.lox.error(self.line, message, self.file)
     
     def advance(self):
         """
@@ -205,8 +224,7 @@ class Scanner:
             
         # 处理未闭合的字符串
         if self.is_at_end():
-            from pylox.lox import Lox
-            Lox.error(self.line, "Unterminated string.")
+            self.error("Unterminated string.")
             return
             
         # 消费闭合的引号
@@ -308,8 +326,7 @@ class Scanner:
         
         # 如果在源代码结束前没有关闭块注释
         if self.is_at_end() and nesting_level > 0:
-            from pylox.lox import Lox
-            Lox.error(self.line, "Unterminated block comment.")
+            self.error("Unterminated block comment.")
     
     def add_token(self, token_type, literal=None):
         """
@@ -320,4 +337,4 @@ class Scanner:
             literal: 可选，字面量的值
         """
         text = self.source[self.start:self.current]
-        self.tokens.append(Token(token_type, text, literal, self.line))
\ No newline at end of file
+        self.tokens.append(Token(token_type, text, literal, self.line, self.file))
\ No newline at end of file
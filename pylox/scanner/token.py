@@ -6,10 +6,10 @@ class Token:
     """
     表示Lox语言中的词法单元
     
-    一个词法单元包含类型、词素、字面量值和行号信息。
+    一个词法单元包含类型、词素、字面量值、行号和所在文件信息。
     """
     
-    def __init__(self, token_type, lexeme, literal, line):
+    def __init__(self, token_type, lexeme, literal, line, file=None):
         """
         初始化Token对象
         
@@ -18,11 +18,13 @@ class Token:
             lexeme: str, 原始词素字符串
             literal: 任意类型，字面量的值（如果有）
             line: int, 词法单元在源码中的行号
+            file: str, 词法单元所在的模块文件，主程序为None
         """
         self.type = token_type
         self.lexeme = lexeme
         self.literal = literal
         self.line = line
+        self.file = file
 
     def __str__(self):
         """字符串表示，用于打印Token"""
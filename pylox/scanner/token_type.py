@@ -54,5 +54,6 @@ class TokenType(Enum):
     WHILE = auto()
     BREAK = auto()
     CONTINUE = auto()
+    IMPORT = auto()
 
     EOF = auto()
\ No newline at end of file
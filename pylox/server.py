@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+常驻解释器服务
+
+`pylox serve`启动一个预先加载好解释器的进程，在本地Unix套接字上监听；
+`pylox client`把脚本路径或源代码提交给它执行，并原样输出返回的标准
+输出、标准错误和退出码。这样成千上万次短脚本运行只需付出一次Python
+启动和pylox导入的开销。
+
+协议是每行一个JSON对象:
+
+    请求: {"path": "/abs/path/script.lox"} 或 {"source": "print 1;"}
+    响应: {"stdout": "...", "stderr": "...", "exit_code": 0}
+
+每个请求都在独立的LoxRuntime中执行，拥有全新的全局环境和各自的输出，
+因此不同任务之间不会共享状态，多个请求可以在不同线程中并发执行。
+
+客户端只依赖标准库的socket和json，不导入解释器。
+"""
+
+import json
+import os
+import socket
+import sys
+import tempfile
+
+
+# 请求格式错误时的退出码（EX_USAGE）
+EXIT_USAGE = 64
+
+# 无法连接服务时的退出码（EX_UNAVAILABLE）
+EXIT_UNAVAILABLE = 69
+
+
+def default_socket_path():
+    """
+    返回默认的套接字路径，每个用户一个
+
+    Returns:
+        str: 套接字路径
+    """
+    return os.path.join(tempfile.gettempdir(), f"pylox-{os.getuid()}.sock")
+
+
+def execute_request(request):
+    """
+    在新的LoxRuntime中执行一个请求
+
+    程序的输出和错误写入该运行时自己的缓冲区，不会触及进程的sys.stdout
+    和sys.stderr，因此可以在多个线程中同时调用。
+
+    请求可以包含limits字段（如{"timeout": 5, "max_steps": 1000000}）为本次
+    执行设置预算，避免一个不终止的脚本长期占用服务。
+
+    Args:
+        request: dict, 包含path或source的请求
+
+    Returns:
+        dict: 包含stdout、stderr和exit_code的响应
+    """
+    import io
+    from pylox.lox import LoxRuntime
+    from pylox.interpreter.output import OutputSink
+
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    budget = None
+    if request.get("limits") is not None:
+        from pylox.interpreter.budget import Budget
+        try:
+            if not isinstance(request["limits"], dict):
+                raise ValueError("limits必须是对象")
+            budget = Budget.from_dict(request["limits"])
+        except ValueError as error:
+            print(f"错误: {error}", file=stderr)
+            return {"stdout": "", "stderr": stderr.getvalue(), "exit_code": EXIT_USAGE}
+    runtime = LoxRuntime(output=OutputSink(stdout), error_stream=stderr, budget=budget)
+
+    if isinstance(request.get("path"), str):
+        exit_code = runtime.execute_file(request["path"])
+    elif isinstance(request.get("source"), str):
+        exit_code = runtime.execute_source(request["source"])
+    else:
+        print("错误: 请求必须包含字符串类型的path或source字段", file=stderr)
+        exit_code = EXIT_USAGE
+
+    return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "exit_code": exit_code}
+
+
+def create_server(socket_path):
+    """
+    创建监听socket_path的服务器
+
+    每个连接由单独的线程处理。
+
+    Args:
+        socket_path: str, Unix套接字路径，已存在的旧文件会被删除
+
+    Returns:
+        socketserver.ThreadingUnixStreamServer: 服务器对象
+    """
+    import socketserver
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        """处理一个连接上的所有请求"""
+
+        def handle(self):
+            for line in self.rfile:
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("请求必须是JSON对象")
+                except ValueError as error:
+                    response = {"stdout": "", "stderr": f"错误: 无效的请求: {error}\n",
+                                "exit_code": EXIT_USAGE}
+                else:
+                    response = execute_request(request)
+                self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                self.wfile.flush()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = socketserver.ThreadingUnixStreamServer(socket_path, RequestHandler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(socket_path=None):
+    """
+    启动常驻服务，直到被中断
+
+    Args:
+        socket_path: str, Unix套接字路径，默认为default_socket_path()
+    """
+    socket_path = socket_path or default_socket_path()
+
+    # 预先导入解释器并执行一次空程序，让后续请求不再付出加载开销
+    execute_request({"source": ""})
+
+    server = create_server(socket_path)
+    print(f"pylox服务已启动: {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def submit(request, socket_path=None):
+    """
+    向服务提交一个请求并等待响应
+
+    Args:
+        request: dict, 包含path或source的请求
+        socket_path: str, Unix套接字路径，默认为default_socket_path()
+
+    Returns:
+        dict: 包含stdout、stderr和exit_code的响应
+
+    Raises:
+        OSError: 无法连接服务
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socket_path or default_socket_path())
+        connection.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+        with connection.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise OSError("服务在返回响应前关闭了连接")
+    return json.loads(line)
+
+
+def run_client(script=None, source=None, socket_path=None):
+    """
+    提交脚本路径或源代码，输出结果并返回退出码
+
+    Args:
+        script: str, 脚本路径，相对路径按客户端的工作目录解析
+        source: str, 源代码，在script为None时使用
+        socket_path: str, Unix套接字路径，默认为default_socket_path()
+
+    Returns:
+        int: 脚本的退出码，无法连接服务时为69
+    """
+    if script is not None:
+        request = {"path": os.path.abspath(script)}
+    else:
+        request = {"source": source}
+
+    try:
+        response = submit(request, socket_path)
+    except OSError as error:
+        print(f"错误: 无法连接pylox服务: {error}", file=sys.stderr)
+        return EXIT_UNAVAILABLE
+
+    sys.stdout.write(response["stdout"])
+    sys.stdout.flush()
+    sys.stderr.write(response["stderr"])
+    return response["exit_code"]
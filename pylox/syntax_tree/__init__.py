@@ -11,11 +11,13 @@ from pylox.syntax_tree.expr import Expr
 from pylox.syntax_tree.visitor import Visitor
 from pylox.syntax_tree.expr import Binary, Grouping, Literal, Unary, Variable, Assign, Logical, Call, Get, Set, This, Inner, Lambda
 from pylox.syntax_tree.ast_printer import AstPrinter
-from pylox.syntax_tree.stmt import Stmt, Expression, Print, Var, Block, If, While, Break, Function, Return, Class
+from pylox.syntax_tree.stmt import Stmt, Expression, Print, Var, Block, If, While, Break, Function, Return, Class, Import
+from pylox.syntax_tree.locations import node_line, iter_nodes
 
 __all__ = [
     'Expr', 'Binary', 'Grouping', 'Literal', 'Unary', 'Visitor', 
     'AstPrinter', 'Variable', 'Assign', 'Stmt', 'Expression', 
     'Print', 'Var', 'Block', 'Logical', 'If', 'While', 'Break',
-    'Call', 'Function', 'Return', 'Lambda', 'Get', 'Set', 'This', 'Inner', 'Class'
+    'Call', 'Function', 'Return', 'Lambda', 'Get', 'Set', 'This', 'Inner', 'Class', 'Import',
+    'node_line', 'iter_nodes'
 ]
\ No newline at end of file
@@ -257,6 +257,18 @@ class AstPrinter(Visitor):
         
         return self._parenthesize("fun " + stmt.name.lexeme, *params) + " " + body_str
     
+    def visit_import_stmt(self, stmt):
+        """
+        访问import语句
+        
+        Args:
+            stmt: Import, import语句
+            
+        Returns:
+            str: 该语句的字符串表示
+        """
+        return self._parenthesize("import", f'"{stmt.path.literal}"')
+    
     def visit_return_stmt(self, stmt):
         """
         访问return语句
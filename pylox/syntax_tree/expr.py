@@ -19,6 +19,10 @@ class Expr(ABC):
     所有具体表达式类型都继承自这个类，并必须实现accept方法
     """
     
+    # 引用变量的表达式（变量、赋值、this、super）被解析为全局变量时，解析器在此
+    # 记录分配的全局槽位；局部变量或未经解析时为None
+    slot = None
+    
     @abstractmethod
     def accept(self, visitor):
         """
@@ -298,18 +302,21 @@ class Lambda(Expr):
     Attributes:
         params: list[Token], 参数列表
         body: list[Stmt], 函数体
+        keyword: Token, fun关键字标记，用于定位源代码行，可以为None
     """
     
-    def __init__(self, params, body):
+    def __init__(self, params, body, keyword=None):
         """
         初始化Lambda表达式
         
         Args:
             params: list[Token], 参数列表
             body: list[Stmt], 函数体
+            keyword: Token, fun关键字标记，默认为None
         """
         self.params = params
         self.body = body
+        self.keyword = keyword
         
     def accept(self, visitor):
         """
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+语法树节点的源代码位置和遍历
+
+节点本身不保存行号，行号和所在文件来自节点中的标记（关键字、名称、运算符等）。
+"""
+
+from pylox.syntax_tree.expr import Expr
+from pylox.syntax_tree.stmt import Stmt
+
+
+# 直接保存标记的属性，按优先级排列
+TOKEN_FIELDS = ("keyword", "name", "operator", "paren")
+
+# 可能包含标记的子节点属性，按源代码中出现的先后排列
+CHILD_FIELDS = ("expression", "condition", "initializer", "callee", "left", "object", "value", "right")
+
+
+def node_token(node):
+    """
+    获取代表节点位置的标记
+
+    先查找节点自身的标记，找不到时依次查找子节点。
+
+    Args:
+        node: Expr | Stmt, 语法树节点
+
+    Returns:
+        Token: 标记，无法确定时返回None
+    """
+    for field in TOKEN_FIELDS:
+        token = getattr(node, field, None)
+        if getattr(token, "line", None) is not None:
+            return token
+
+    for field in CHILD_FIELDS:
+        child = getattr(node, field, None)
+        if isinstance(child, (Expr, Stmt)):
+            token = node_token(child)
+            if token is not None:
+                return token
+
+    for statement in getattr(node, "statements", None) or ():
+        token = node_token(statement)
+        if token is not None:
+            return token
+
+    return None
+
+
+def node_line(node):
+    """
+    获取节点所在的源代码行
+
+    Args:
+        node: Expr | Stmt, 语法树节点
+
+    Returns:
+        int: 行号，无法确定时返回None
+    """
+    token = node_token(node)
+    return None if token is None else token.line
+
+
+def child_nodes(node):
+    """
+    返回节点的直接子节点
+
+    Args:
+        node: Expr | Stmt, 语法树节点
+
+    Returns:
+        list: 按属性定义顺序排列的子节点，包括语句列表和参数列表中的节点
+    """
+    children = []
+    for value in vars(node).values():
+        if isinstance(value, (Expr, Stmt)):
+            children.append(value)
+        elif isinstance(value, list):
+            children.extend(item for item in value if isinstance(item, (Expr, Stmt)))
+    return children
+
+
+def iter_nodes(nodes):
+    """
+    按先序深度优先遍历语法树
+
+    Args:
+        nodes: list[Stmt], 语句列表
+
+    Yields:
+        Expr | Stmt: 语法树节点
+    """
+    pending = list(reversed(nodes))
+    while pending:
+        node = pending.pop()
+        yield node
+        pending.extend(reversed(child_nodes(node)))
@@ -68,14 +68,16 @@ class Print(Stmt):
     表示一个打印语句，如'print "Hello, world!";'。
     """
     
-    def __init__(self, expression):
+    def __init__(self, expression, keyword=None):
         """
         初始化打印语句
         
         Args:
             expression: Expr, 要打印的表达式
+            keyword: Token, print关键字标记，用于定位源代码行，默认为None
         """
         self.expression = expression
+        self.keyword = keyword
     
     def accept(self, visitor):
         """
@@ -158,7 +160,7 @@ class If(Stmt):
     表示条件执行的语句，包含条件表达式和对应的执行分支。
     """
     
-    def __init__(self, condition, then_branch, else_branch=None):
+    def __init__(self, condition, then_branch, else_branch=None, keyword=None):
         """
         初始化条件语句
         
@@ -166,10 +168,12 @@ class If(Stmt):
             condition: Expr, 条件表达式
             then_branch: Stmt, 条件为真时执行的语句
             else_branch: Stmt, 条件为假时执行的语句，可以为None
+            keyword: Token, if关键字标记，用于定位源代码行，默认为None
         """
         self.condition = condition
         self.then_branch = then_branch
         self.else_branch = else_branch
+        self.keyword = keyword
     
     def accept(self, visitor):
         """
@@ -191,16 +195,18 @@ class While(Stmt):
     表示while循环执行的语句，包含循环条件和循环体。
     """
     
-    def __init__(self, condition, body):
+    def __init__(self, condition, body, keyword=None):
         """
         初始化while循环语句
         
         Args:
             condition: Expr, 循环条件表达式
             body: Stmt, 循环体语句
+            keyword: Token, while或for关键字标记，用于定位源代码行，默认为None
         """
         self.condition = condition
         self.body = body
+        self.keyword = keyword
     
     def accept(self, visitor):
         """
@@ -349,4 +355,39 @@ class Return(Stmt):
         Returns:
             访问者返回的结果
         """
-        return visitor.visit_return_stmt(self) 
\ No newline at end of file
+        return visitor.visit_return_stmt(self)
+
+
+class Import(Stmt):
+    """
+    import语句
+    
+    导入并执行一个模块文件，模块的全局定义对导入者可见。
+    
+    Attributes:
+        keyword: Token, import关键字
+        path: Token, 模块路径字符串标记
+    """
+    
+    def __init__(self, keyword, path):
+        """
+        初始化import语句
+        
+        Args:
+            keyword: Token, import关键字
+            path: Token, 模块路径字符串标记，路径为其literal
+        """
+        self.keyword = keyword
+        self.path = path
+        
+    def accept(self, visitor):
+        """
+        接受访问者
+        
+        Args:
+            visitor: 实现了相应visit方法的访问者
+            
+        Returns:
+            访问者返回的结果
+        """
+        return visitor.visit_import_stmt(self)
@@ -9,6 +9,9 @@ setup(
     description="A Python implementation of Lox language interpreter",
     author="aixiasang",
     packages=find_packages(),
+    extras_require={
+        "numpy": ["numpy"],
+    },
     entry_points={
         "console_scripts": [
             "pylox=pylox.cli:main",
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试批量执行脚本
+"""
+
+import unittest
+import os
+import tempfile
+from pylox.batch import expand_paths, run_batch
+
+
+class TestBatch(unittest.TestCase):
+    """测试批量执行"""
+    
+    def setUp(self):
+        """创建测试脚本"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.scripts = {}
+        for name, source in [("ok.lox", "print 1 + 1;"),
+                             ("syntax.lox", "print ;"),
+                             ("runtime.lox", 'print 1 - "x";')]:
+            path = os.path.join(self.directory.name, name)
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(source)
+            self.scripts[name] = path
+    
+    def tearDown(self):
+        """删除测试脚本"""
+        self.directory.cleanup()
+    
+    def test_expand_paths(self):
+        """测试展开目录和通配符并去除重复"""
+        pattern = os.path.join(self.directory.name, "*.lox")
+        paths = expand_paths([self.scripts["ok.lox"], pattern, self.directory.name])
+        
+        self.assertEqual(paths[0], self.scripts["ok.lox"])
+        self.assertEqual(sorted(paths), sorted(self.scripts.values()))
+    
+    def check_report(self, report):
+        """检查报告内容"""
+        results = {os.path.basename(result["path"]): result for result in report["files"]}
+        
+        self.assertEqual(results["ok.lox"]["exit_code"], 0)
+        self.assertTrue(results["ok.lox"]["stdout"].endswith("2\n"))
+        self.assertEqual(results["syntax.lox"]["exit_code"], 65)
+        self.assertEqual(results["runtime.lox"]["exit_code"], 70)
+        self.assertIn("运行时错误", results["runtime.lox"]["stderr"])
+        self.assertEqual(report["summary"]["total"], 3)
+        self.assertEqual(report["summary"]["passed"], 1)
+        self.assertEqual(report["summary"]["failed"], 2)
+    
+    def test_process_pool(self):
+        """测试在进程池中执行并按输入顺序返回结果"""
+        paths = list(self.scripts.values())
+        report = run_batch(paths, workers=2)
+        
+        self.assertEqual([result["path"] for result in report["files"]], paths)
+        self.check_report(report)
+    
+    def test_in_process(self):
+        """测试workers为1时在当前进程中执行"""
+        self.check_report(run_batch(list(self.scripts.values()), workers=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
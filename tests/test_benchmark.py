@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试基准测试运行器
+"""
+
+import unittest
+import io
+import os
+import tempfile
+from contextlib import redirect_stdout
+from unittest import mock
+from pylox.benchmark import (DEFAULT_DIRECTORY, find_benchmarks, load_engine, read_ops,
+                             run_benchmark, run_suite, format_report, confidence_interval,
+                             save_baseline, load_baseline, compare_to_baseline, main)
+from pylox.interpreter.interpreter import Interpreter
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """测试随源码分发的基准程序"""
+    
+    def test_standard_programs(self):
+        """测试标准基准程序齐全且都注明了操作数"""
+        paths = find_benchmarks()
+        names = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+        
+        for name in ["fib", "binary_trees", "equality", "instantiation", "invocation",
+                     "method_call", "properties", "string_equality", "trees", "zoo",
+                     "closures", "deep_inheritance"]:
+            self.assertIn(name, names)
+        for path in paths:
+            with open(path, encoding="utf-8") as file:
+                self.assertGreater(read_ops(file.read()), 1, path)
+    
+    def test_unknown_name(self):
+        """测试指定不存在的程序"""
+        with self.assertRaises(ValueError):
+            find_benchmarks(DEFAULT_DIRECTORY, ["no_such_benchmark"])
+
+
+class TestBenchmarkRunner(unittest.TestCase):
+    """测试计时和报告"""
+    
+    def setUp(self):
+        """创建只包含小程序的基准目录"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+    
+    def write(self, name, source):
+        """写入一个基准程序"""
+        path = os.path.join(self.directory.name, name + ".lox")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(source)
+        return path
+    
+    def test_run_benchmark(self):
+        """测试统计耗时和每秒操作数"""
+        path = self.write("loop", "// ops: 100\nfor (var i = 0; i < 100; i = i + 1) {}\n")
+        
+        result = run_benchmark(path, Interpreter, repeat=3, warmup=1)
+        
+        self.assertEqual(result["name"], "loop")
+        self.assertEqual(len(result["times"]), 3)
+        self.assertLessEqual(result["min"], result["median"])
+        self.assertAlmostEqual(result["ops_per_sec"], 100 / result["median"])
+    
+    def test_failing_program(self):
+        """测试程序出错时记录错误"""
+        path = self.write("broken", '1 - "x";\n')
+        
+        result = run_benchmark(path, Interpreter, repeat=1, warmup=0)
+        
+        self.assertIn("运行时错误", result["error"])
+    
+    def test_unavailable_engine(self):
+        """测试未实现完整的优化解释器报告为不可用"""
+        engine, reason = load_engine("optimized")
+        self.assertIsNone(engine)
+        self.assertIn("visit_binary_expr", reason)
+        
+        report = run_suite([self.write("noop", "// ops: 1\nvar a = 1;\n")], repeat=1, warmup=0)
+        
+        self.assertEqual([result["name"] for result in report["engines"]["interpreter"]], ["noop"])
+        self.assertIn("optimized", report["unavailable"])
+        self.assertIn("[optimized] 不可用", format_report(report))
+
+
+
+def make_report(**means):
+    """构造每个程序耗时固定为给定值的报告"""
+    results = [{"name": name, "times": [mean] * 3, "median": mean, "mean": mean, "ci": ci}
+               for name, (mean, ci) in means.items()]
+    return {"python": "3", "engines": {"interpreter": results}, "unavailable": {}}
+
+
+class TestBaseline(unittest.TestCase):
+    """测试基线的保存和比较"""
+    
+    def test_confidence_interval(self):
+        """测试t分布置信区间"""
+        mean, ci = confidence_interval([1.0, 2.0, 3.0])
+        
+        self.assertEqual(mean, 2.0)
+        self.assertAlmostEqual(ci, 4.303 / 3 ** 0.5)
+        self.assertEqual(confidence_interval([5.0]), (5.0, 0.0))
+    
+    def test_save_and_load(self):
+        """测试基线文件往返"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            save_baseline(make_report(fib=(1.0, 0.1)), path)
+            baseline = load_baseline(path)
+        
+        self.assertEqual(baseline["engines"]["interpreter"]["fib"]["mean"], 1.0)
+    
+    def test_compare(self):
+        """测试只有超过阈值且置信区间不重叠的变化才判定为回退或改进"""
+        baseline = {"engines": {"interpreter": {
+            "slow": {"mean": 1.0, "ci": 0.01}, "noisy": {"mean": 1.0, "ci": 0.5},
+            "small": {"mean": 1.0, "ci": 0.01}, "fast": {"mean": 1.0, "ci": 0.01},
+        }}}
+        report = make_report(slow=(1.5, 0.01), noisy=(1.5, 0.5), small=(1.05, 0.01),
+                             fast=(0.5, 0.01), added=(1.0, 0.0))
+        
+        statuses = {entry["name"]: entry["status"]
+                    for entry in compare_to_baseline(report, baseline, threshold=0.1)}
+        
+        self.assertEqual(statuses, {"slow": "regression", "noisy": "unchanged", "small": "unchanged",
+                                    "fast": "improvement", "added": "new"})
+    
+    def test_gate_exit_code(self):
+        """测试命令行在回退时返回1"""
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "loop.lox"), "w", encoding="utf-8") as file:
+                file.write("// ops: 10\nvar a = 1;\n")
+            path = os.path.join(directory, "baseline.json")
+            options = ["--dir", directory, "-e", "interpreter", "-r", "3", "--warmup", "0"]
+            
+            with redirect_stdout(io.StringIO()):
+                with mock.patch("pylox.benchmark.run_once", return_value=(1.0, 0, "")):
+                    self.assertEqual(main(options + ["--save-baseline", path]), 0)
+                    self.assertEqual(main(options + ["--baseline", path]), 0)
+                with mock.patch("pylox.benchmark.run_once", return_value=(2.0, 0, "")):
+                    self.assertEqual(main(options + ["--baseline", path]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试执行预算
+"""
+
+import unittest
+import io
+from unittest import mock
+from pylox.lox import LoxRuntime
+from pylox.server import execute_request, EXIT_USAGE
+from pylox.interpreter.output import OutputSink
+from pylox.interpreter.budget import Budget
+from pylox.interpreter.runtime_error import BudgetExceededError
+
+
+class FakeClock:
+    """每次读取前进固定时间的时钟"""
+    
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+    
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+class TestBudget(unittest.TestCase):
+    """测试各项上限"""
+    
+    def run_limited(self, source, **limits):
+        """在设置了预算的运行时中执行代码，返回报告的运行时错误"""
+        runtime = LoxRuntime(output=OutputSink(io.StringIO()), error_stream=io.StringIO(),
+                             budget=Budget(**limits))
+        with mock.patch.object(runtime, "runtime_error") as runtime_error:
+            runtime.execute_source(source)
+        if not runtime_error.called:
+            return None
+        return runtime_error.call_args[0][0]
+    
+    def test_max_steps_loop(self):
+        """测试无限循环在回边处被终止"""
+        error = self.run_limited("while (true) {}", max_steps=1000)
+        
+        self.assertIsInstance(error, BudgetExceededError)
+        self.assertIn("执行步数超过1000", str(error))
+    
+    def test_max_steps_calls(self):
+        """测试调用计入步数"""
+        source = "fun f(n) { if (n > 0) f(n - 1); } f(30);"
+        
+        self.assertIsNone(self.run_limited(source, max_steps=31))
+        self.assertIsInstance(self.run_limited(source, max_steps=30), BudgetExceededError)
+    
+    def test_timeout(self):
+        """测试运行时间上限"""
+        error = self.run_limited("while (true) {}", timeout=10, clock=FakeClock(1.0))
+        
+        self.assertIsInstance(error, BudgetExceededError)
+        self.assertIn("运行时间超过10秒", str(error))
+    
+    def test_allocations(self):
+        """测试实例和环境分配上限"""
+        error = self.run_limited("class A {} while (true) A();", max_allocations=100)
+        
+        self.assertIn("分配的实例和环境超过100个", str(error))
+    
+    def test_string_chars(self):
+        """测试字符串拼接上限在拼接处立即检查"""
+        error = self.run_limited('var s = "ab";\nwhile (true) s = s + s;', max_string_chars=1000)
+        
+        self.assertIn("字符串拼接超过1000个字符", str(error))
+        self.assertEqual(error.token.lexeme, "+")
+    
+    def test_native_calls_count_as_steps(self):
+        """测试原生函数调用不走快速路径，同样计步"""
+        source = "for (var i = 0; i < 1; i = i + 1) { clock(); clock(); clock(); }"
+        
+        self.assertIsNone(self.run_limited(source, max_steps=4))
+        self.assertIsInstance(self.run_limited(source, max_steps=3), BudgetExceededError)
+    
+    def test_container_growth(self):
+        """测试原生容器的创建和增长计入分配并立即检查"""
+        error = self.run_limited("var list = List();\nwhile (true) list.append(1);",
+                                 max_allocations=100)
+        
+        self.assertIn("分配的实例和环境超过100个", str(error))
+        self.assertEqual(error.token.line, 2)
+        
+        error = self.run_limited("var map = Map(); for (var i = 0; i < 50; i = i + 1) map.set(i, i);"
+                                 "map.keys(); map.keys();", max_allocations=100)
+        self.assertIn("分配的实例和环境超过100个", str(error))
+    
+    def test_native_strings(self):
+        """测试List.join产生的字符串计入字符串上限"""
+        source = """
+        var list = List();
+        list.append("ab");
+        while (true) {
+          var text = list.join("");
+          list.append(text);
+        }
+        """
+        error = self.run_limited(source, max_string_chars=1000)
+        
+        self.assertIsInstance(error, BudgetExceededError)
+        self.assertIn("字符串拼接超过1000个字符", str(error))
+        self.assertEqual(error.token.line, 5)
+    
+    def test_within_budget(self):
+        """测试预算内的程序正常完成，每次运行重新计数"""
+        output = io.StringIO()
+        runtime = LoxRuntime(output=OutputSink(output), budget=Budget(max_steps=10))
+        
+        for _ in range(3):
+            self.assertEqual(runtime.execute_source("var n = 0; while (n < 10) n = n + 1; print n;"), 0)
+        self.assertEqual(output.getvalue(), "10\n" * 3)
+    
+    def test_from_dict(self):
+        """测试从请求中的字典创建预算"""
+        self.assertEqual(Budget.from_dict({"timeout": 1.5}).timeout, 1.5)
+        with self.assertRaises(ValueError):
+            Budget.from_dict({"steps": 1})
+        with self.assertRaises(ValueError):
+            Budget.from_dict({"max_steps": -1})
+
+
+class TestServerLimits(unittest.TestCase):
+    """测试服务请求中的预算"""
+    
+    def test_request_limits(self):
+        """测试请求中的limits终止不终止的脚本"""
+        response = execute_request({"source": "while (true) {}", "limits": {"max_steps": 100}})
+        
+        self.assertEqual(response["exit_code"], 70)
+        self.assertIn("超出执行预算", response["stderr"])
+    
+    def test_invalid_limits(self):
+        """测试无效的limits"""
+        response = execute_request({"source": "print 1;", "limits": {"steps": 1}})
+        
+        self.assertEqual(response["exit_code"], EXIT_USAGE)
+        self.assertIn("未知的预算项", response["stderr"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试Lox调用栈深度控制和深栈执行模式
+"""
+
+import unittest
+import io
+import sys
+from pylox.lox import Lox
+from pylox.interpreter.deep_stack import run_with_deep_stack
+
+
+RECURSION = """
+fun depth(n) {
+  if (n == 0) return 0;
+  return depth(n - 1) + 1;
+}
+print depth(%d);
+"""
+
+
+class TestCallStack(unittest.TestCase):
+    """测试调用栈深度"""
+    
+    def setUp(self):
+        """测试前准备"""
+        Lox.had_error = False
+        Lox.had_runtime_error = False
+        Lox.init()
+        self.max_call_depth = Lox.interpreter.max_call_depth
+        
+        # 捕获标准输出和标准错误
+        self.stdout_backup = sys.stdout
+        self.stderr_backup = sys.stderr
+        self.captured_output = io.StringIO()
+        self.captured_error = io.StringIO()
+        sys.stdout = self.captured_output
+        sys.stderr = self.captured_error
+    
+    def tearDown(self):
+        """测试后清理"""
+        sys.stdout = self.stdout_backup
+        sys.stderr = self.stderr_backup
+        Lox.interpreter.max_call_depth = self.max_call_depth
+    
+    def test_python_recursion_limit_is_runtime_error(self):
+        """测试耗尽Python递归限制时报告Lox运行时错误"""
+        Lox.run(RECURSION % 100000)
+        
+        self.assertTrue(Lox.had_runtime_error)
+        self.assertIn("栈溢出", self.captured_error.getvalue())
+        self.assertEqual(Lox.interpreter.call_depth, 0)
+    
+    def test_max_call_depth(self):
+        """测试超过配置的最大调用深度"""
+        Lox.interpreter.max_call_depth = 10
+        Lox.run(RECURSION % 20)
+        
+        self.assertTrue(Lox.had_runtime_error)
+        self.assertIn("调用深度超过10层", self.captured_error.getvalue())
+    
+    def test_deep_stack(self):
+        """测试深栈模式支持远超递归限制的Lox递归"""
+        Lox.interpreter.max_call_depth = 20000
+        run_with_deep_stack(Lox.run, RECURSION % 5000, max_call_depth=20000)
+        
+        self.assertFalse(Lox.had_runtime_error)
+        self.assertEqual(self.captured_output.getvalue().strip(), "5000")
+
+
+if __name__ == "__main__":
+    unittest.main()
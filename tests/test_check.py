@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试并行分析源文件
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from pylox.check import parse_files, check_files, format_errors, main
+from pylox.lox import LoxRuntime
+from pylox.interpreter.output import OutputSink
+from pylox.modules import ModuleLoader
+from pylox.syntax_tree import AstPrinter, Function
+
+
+class TestCheck(unittest.TestCase):
+    """测试parse_files和check_files"""
+
+    def setUp(self):
+        """创建测试文件"""
+        self.directory = tempfile.TemporaryDirectory()
+        sources = {
+            "good.lox": "fun add(a, b) { return a + b; }\nprint add(1, 2);\n",
+            "syntax.lox": "print 1;\nvar x = ;\n",
+            "resolve.lox": "return 1;\n",
+            "lib/util.lox": "var name = \"util\";\n",
+        }
+        self.paths = {}
+        for name, source in sources.items():
+            path = os.path.join(self.directory.name, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(source)
+            self.paths[name] = path
+
+    def tearDown(self):
+        """删除测试文件"""
+        self.directory.cleanup()
+
+    def test_parse_files(self):
+        """进程池返回的语法树与在当前进程中分析的结果相同"""
+        paths = list(self.paths.values())
+        serial = parse_files(paths, workers=1)
+        parallel = parse_files(paths, workers=2)
+        self.assertEqual([result["path"] for result in parallel], paths)
+
+        printer = AstPrinter()
+        for expected, result in zip(serial, parallel):
+            self.assertEqual(expected["errors"], result["errors"])
+            if expected["statements"] is None:
+                self.assertIsNone(result["statements"])
+            else:
+                self.assertEqual([stmt.accept(printer) for stmt in expected["statements"]],
+                                 [stmt.accept(printer) for stmt in result["statements"]])
+
+        good = parallel[0]
+        self.assertIsInstance(good["statements"][0], Function)
+        self.assertEqual(parallel[1]["statements"], None)
+        self.assertIn("期望表达式。", parallel[1]["errors"])
+        # 只做语法分析，不检查变量解析错误
+        self.assertIsNotNone(parallel[2]["statements"])
+
+    def test_deep_files(self):
+        """嵌套过深的文件记录为该文件的错误，不影响同一批的其他文件"""
+        sources = {
+            "long.lox": "print " + " + ".join(["1"] * 20000) + ";\n",
+            "nested.lox": "print " + "(" * 5000 + "1" + ")" * 5000 + ";\n",
+        }
+        for name, source in sources.items():
+            with open(os.path.join(self.directory.name, name), "w", encoding="utf-8") as file:
+                file.write(source)
+        paths = [os.path.join(self.directory.name, name) for name in sources]
+        paths.append(self.paths["good.lox"])
+
+        for workers in (1, 2):
+            results = parse_files(paths, workers)
+            self.assertIsNone(results[1]["statements"])
+            self.assertIn("嵌套过深", results[1]["errors"])
+            self.assertIsNotNone(results[2]["statements"])
+        # 在进程池中，无法pickle的语法树同样记录为错误
+        self.assertIsNone(results[0]["statements"])
+        self.assertIn("嵌套过深", results[0]["errors"])
+        self.assertEqual(ModuleLoader().preload(paths, 2), 1)
+
+    def test_check_files(self):
+        """检查语法和变量解析错误，报告按输入顺序排列"""
+        paths = list(self.paths.values()) + [os.path.join(self.directory.name, "missing.lox")]
+        for workers in (1, 2):
+            report = check_files(paths, workers)
+            self.assertEqual([result["exit_code"] for result in report["files"]], [0, 65, 65, 0, 65])
+            self.assertEqual(report["summary"]["total"], 5)
+            self.assertEqual(report["summary"]["failed"], 3)
+
+        errors = format_errors(report).splitlines()
+        self.assertTrue(errors[0].startswith(self.paths["syntax.lox"] + ": [行 2]"))
+        self.assertEqual(len(errors), 3)
+
+    def test_main(self):
+        """pylox check有错误时以65退出"""
+        with mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            self.assertEqual(main([self.directory.name, "-j", "1"]), 65)
+            self.assertIn("检查了4个文件，2个有错误", stderr.getvalue())
+            self.assertEqual(main([self.paths["good.lox"], "-j", "1"]), 0)
+
+    def test_preload_modules(self):
+        """预先并行分析的模块在导入时不再分析"""
+        loader = ModuleLoader()
+        self.assertEqual(loader.preload([self.paths["lib/util.lox"], self.paths["syntax.lox"]], 2), 1)
+
+        main_path = os.path.join(self.directory.name, "main.lox")
+        with open(main_path, "w", encoding="utf-8") as file:
+            file.write('import "lib/util.lox"; print name;')
+        output = io.StringIO()
+        runtime = LoxRuntime(output=OutputSink(output), error_stream=io.StringIO(),
+                             module_loader=loader)
+        with mock.patch.object(loader, "parse") as parse:
+            self.assertEqual(runtime.execute_file(main_path), 0)
+            parse.assert_not_called()
+        self.assertEqual(output.getvalue().splitlines()[1:], ["util"])
+
+
+if __name__ == "__main__":
+    unittest.main()
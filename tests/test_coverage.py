@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试行级执行计数和覆盖率
+"""
+
+import unittest
+import io
+import json
+import os
+import tempfile
+from pylox.lox import LoxRuntime
+from pylox.interpreter.output import OutputSink
+from pylox.interpreter.coverage import CoverageInterpreter
+
+
+SOURCE = """fun f(n) {
+  if (n > 100) {
+    print "big";
+  }
+  return n;
+}
+class A {
+  used() { return 1; }
+  unused() { return 2; }
+}
+for (var i = 0; i < 3; i = i + 1) f(i);
+A().used();
+"""
+
+
+class TestCoverage(unittest.TestCase):
+    """测试按行统计执行次数"""
+    
+    def run_covered(self, source):
+        """在启用覆盖率统计的运行时中执行代码"""
+        runtime = LoxRuntime(output=OutputSink(io.StringIO()), error_stream=io.StringIO(), coverage=True)
+        self.assertEqual(runtime.execute_source(source), 0)
+        return runtime
+    
+    def test_line_hits(self):
+        """测试执行次数和未执行的行"""
+        runtime = self.run_covered(SOURCE)
+        hits = runtime.interpreter.coverage.hits
+        
+        self.assertIsInstance(runtime.interpreter, CoverageInterpreter)
+        self.assertEqual(hits[1], 1)   # 函数声明
+        self.assertEqual(hits[2], 3)   # if语句
+        self.assertEqual(hits[3], 0)   # 从未执行的print
+        self.assertEqual(hits[5], 3)   # return
+        self.assertEqual(hits[8], 1)   # 执行过的方法体
+        self.assertEqual(hits[9], 0)   # 从未调用的方法体
+        self.assertNotIn(4, hits)      # 只有右花括号的行不可执行
+    
+    def test_loop_bodies(self):
+        """测试执行过的循环体不会因为所在的代码块被重复计数"""
+        runtime = self.run_covered("""var i = 0;
+while (i < 3) {
+  i = i + 1;
+}
+for (var j = 0; j < 2; j = j + 1) {
+  print j;
+}
+""")
+        hits = runtime.interpreter.coverage.hits
+        self.assertEqual(hits[2], 1)   # while语句
+        self.assertEqual(hits[3], 3)   # while循环体
+        self.assertEqual(hits[6], 2)   # for循环体
+    
+    def test_reports(self):
+        """测试lcov和JSON报告"""
+        runtime = self.run_covered(SOURCE)
+        coverage = runtime.interpreter.coverage
+        
+        lcov = coverage.format_lcov("script.lox")
+        self.assertTrue(lcov.startswith("TN:\nSF:script.lox\n"))
+        self.assertIn("DA:3,0\n", lcov)
+        self.assertIn("LF:9\nLH:7\n", lcov)
+        self.assertTrue(lcov.endswith("end_of_record\n"))
+        
+        report = coverage.to_dict("script.lox")
+        self.assertEqual(report["lines"]["2"], 3)
+        self.assertEqual(report["summary"]["lines"], 9)
+        self.assertEqual(report["summary"]["covered"], 7)
+        self.assertAlmostEqual(report["summary"]["percent"], 700 / 9)
+    
+    def test_write_by_extension(self):
+        """测试按文件扩展名选择报告格式"""
+        runtime = self.run_covered(SOURCE)
+        with tempfile.TemporaryDirectory() as directory:
+            runtime.coverage_output = os.path.join(directory, "coverage.json")
+            runtime.write_coverage("script.lox")
+            with open(runtime.coverage_output, encoding="utf-8") as file:
+                self.assertEqual(json.load(file)["file"], "script.lox")
+            
+            runtime.coverage_output = os.path.join(directory, "coverage.info")
+            runtime.write_coverage("script.lox")
+            with open(runtime.coverage_output, encoding="utf-8") as file:
+                self.assertIn("SF:script.lox", file.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
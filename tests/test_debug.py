@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试调试模式
+"""
+
+import unittest
+import io
+import os
+import sys
+import tempfile
+from pylox.lox import Lox
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.debug_interpreter import DebugInterpreter
+
+
+class TestDebugMode(unittest.TestCase):
+    """测试调试模式使用DebugInterpreter输出跟踪信息"""
+    
+    def setUp(self):
+        """测试前准备"""
+        Lox.interpreter = None
+        self.stdout_backup = sys.stdout
+        self.captured_output = io.StringIO()
+        sys.stdout = self.captured_output
+    
+    def tearDown(self):
+        """测试后清理"""
+        sys.stdout = self.stdout_backup
+        Lox.debug_mode = False
+        Lox.interpreter = None
+    
+    def run_script(self, source, debug):
+        """将源代码写入临时文件并执行"""
+        with tempfile.NamedTemporaryFile("w", suffix=".lox", delete=False,
+                                         encoding="utf-8") as file:
+            file.write(source)
+        try:
+            Lox.run_file(file.name, debug=debug)
+        finally:
+            os.unlink(file.name)
+        return self.captured_output.getvalue()
+    
+    def test_debug_output(self):
+        """测试-d模式输出打印值的调试信息"""
+        output = self.run_script("print 1 + 2;", debug=True)
+        
+        self.assertIsInstance(Lox.interpreter, DebugInterpreter)
+        self.assertIn("[调试] 打印值: 3\n3\n", output)
+    
+    def test_production_interpreter(self):
+        """测试普通模式使用不含调试判断的解释器"""
+        output = self.run_script("print 1 + 2;", debug=False)
+        
+        self.assertIs(type(Lox.interpreter), Interpreter)
+        self.assertNotIn("[调试]", output)
+        self.assertIn("3\n", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试环境与全局变量槽位
+"""
+
+import unittest
+import io
+import sys
+from pylox.lox import Lox
+from pylox.scanner.token import Token
+from pylox.scanner.token_type import TokenType
+from pylox.interpreter.environment import Environment, GlobalEnvironment, EnvironmentPool
+from pylox.interpreter import Interpreter
+from pylox.interpreter.runtime_error import RuntimeError
+
+
+def name_token(name):
+    """创建变量名标记"""
+    return Token(TokenType.IDENTIFIER, name, None, 1)
+
+
+class TestGlobalEnvironment(unittest.TestCase):
+    """测试全局变量槽位"""
+    
+    def test_slot_lookup(self):
+        """测试按槽位和按名访问得到相同的值"""
+        globals = GlobalEnvironment()
+        globals.define("a", 1.0)
+        slot = globals.slot_for("a")
+        
+        self.assertEqual(globals.get_slot(slot, name_token("a")), 1.0)
+        globals.assign_slot(slot, name_token("a"), 2.0)
+        self.assertEqual(globals.get(name_token("a")), 2.0)
+        self.assertEqual(globals.values, {"a": 2.0})
+    
+    def test_values_view(self):
+        """测试values与槽位共享数据，通过它写入的值不会丢失"""
+        globals = GlobalEnvironment()
+        values = globals.values
+        values["a"] = 1.0
+        slot = globals.slot_for("b")
+        
+        self.assertEqual(globals.get(name_token("a")), 1.0)
+        self.assertNotIn("b", values)
+        globals.define("b", None)
+        self.assertIn("b", values)
+        self.assertEqual(dict(values), {"a": 1.0, "b": None})
+        
+        globals.assign_slot(slot, name_token("b"), 3.0)
+        self.assertEqual(values["b"], 3.0)
+        self.assertEqual(Environment(globals).get_from_enclosing("b"), 3.0)
+        self.assertIsNone(Environment(globals).get_from_enclosing("c"))
+        
+        del values["a"]
+        self.assertEqual(len(values), 1)
+        with self.assertRaises(KeyError):
+            values["a"]
+    
+    def test_late_definition(self):
+        """测试先分配槽位、后定义的全局变量"""
+        globals = GlobalEnvironment()
+        slot = globals.slot_for("late")
+        
+        with self.assertRaises(RuntimeError) as context:
+            globals.get_slot(slot, name_token("late"))
+        self.assertIn("未定义的变量", str(context.exception))
+        with self.assertRaises(RuntimeError):
+            globals.assign_slot(slot, name_token("late"), 1.0)
+        
+        globals.define("late", "value")
+        self.assertEqual(globals.get_slot(slot, name_token("late")), "value")
+    
+    def test_uninitialized(self):
+        """测试未初始化的全局变量"""
+        globals = GlobalEnvironment()
+        globals.define("b", None)
+        
+        with self.assertRaises(RuntimeError) as context:
+            globals.get(name_token("b"))
+        self.assertIn("未初始化的变量", str(context.exception))
+
+
+class TestAncestor(unittest.TestCase):
+    """测试祖先环境查找"""
+    
+    def test_ancestor_matches_enclosing_chain(self):
+        """测试通过显示表得到的祖先与逐层查找的结果一致"""
+        chain = [GlobalEnvironment()]
+        for _ in range(8):
+            chain.append(Environment(chain[-1]))
+        innermost = chain[-1]
+        
+        for distance in range(len(chain)):
+            self.assertIs(innermost.ancestor(distance), chain[-1 - distance])
+        
+        # 中间环境复用已构建的显示表
+        self.assertIs(chain[5].ancestor(4), chain[1])
+        self.assertEqual(chain[5].display, tuple(chain[:5]))
+    
+    def test_display_has_no_cycle(self):
+        """测试显示表不引用环境自身，环境由引用计数立即释放"""
+        import gc
+        import weakref
+        outer = Environment(Environment(GlobalEnvironment()))
+        inner = Environment(Environment(outer))
+        self.assertIs(inner.ancestor(3), outer.enclosing)
+        
+        reference = weakref.ref(inner)
+        gc.disable()
+        try:
+            del inner
+            self.assertIsNone(reference())
+        finally:
+            gc.enable()
+
+
+class TestGlobalSlotsInterpreter(unittest.TestCase):
+    """测试解释器中的全局变量槽位"""
+    
+    def setUp(self):
+        """测试前准备"""
+        Lox.had_error = False
+        Lox.had_runtime_error = False
+        
+        self.stdout_backup = sys.stdout
+        self.stderr_backup = sys.stderr
+        self.captured_output = io.StringIO()
+        self.captured_error = io.StringIO()
+        sys.stdout = self.captured_output
+        sys.stderr = self.captured_error
+    
+    def tearDown(self):
+        """测试后清理"""
+        sys.stdout = self.stdout_backup
+        sys.stderr = self.stderr_backup
+    
+    def test_function_calls_later_defined_global(self):
+        """测试函数体引用在其之后定义的全局变量"""
+        Lox.run("""
+        fun show() { print laterGlobal; }
+        var laterGlobal = "late";
+        show();
+        laterGlobal = "changed";
+        show();
+        """)
+        
+        self.assertEqual(self.captured_output.getvalue().split(), ["late", "changed"])
+    
+    def test_shared_tree_across_interpreters(self):
+        """测试多个解释器执行同一棵语法树时各自读写自己的全局变量"""
+        from pylox.scanner import Scanner
+        from pylox.parser import Parser
+        from pylox.resolver import Resolver
+        statements = Parser(Scanner("shared = shared + 1; print shared;").scan_tokens()).parse()
+        first = Interpreter()
+        second = Interpreter()
+        second.globals.define("otherGlobal", 1.0)
+        first.globals.define("shared", 10.0)
+        second.globals.define("shared", 20.0)
+        
+        for interpreter in (first, second, first):
+            Resolver(interpreter).resolve(statements)
+            interpreter.interpret(statements)
+        
+        self.assertEqual(self.captured_output.getvalue().split(), ["11", "21", "12"])
+        self.assertIsNotNone(statements[0].expression.slot)
+        self.assertEqual(first.locals, {})
+    
+    def test_undefined_global(self):
+        """测试访问未定义的全局变量"""
+        Lox.run("print neverDefinedGlobal;")
+        
+        self.assertTrue(Lox.had_runtime_error)
+        self.assertIn("未定义的变量 'neverDefinedGlobal'", self.captured_error.getvalue())
+
+
+class TestEnvironmentPool(unittest.TestCase):
+    """测试环境对象池"""
+    
+    def setUp(self):
+        """测试前准备"""
+        Lox.had_error = False
+        Lox.had_runtime_error = False
+        self.interpreter_backup = Lox.interpreter
+        Lox.interpreter = Interpreter()
+        
+        self.stdout_backup = sys.stdout
+        self.captured_output = io.StringIO()
+        sys.stdout = self.captured_output
+    
+    def tearDown(self):
+        """测试后清理"""
+        sys.stdout = self.stdout_backup
+        Lox.interpreter = self.interpreter_backup
+    
+    def test_release_and_reuse(self):
+        """测试回收的环境被清空后复用"""
+        pool = EnvironmentPool()
+        outer = Environment()
+        environment = pool.acquire(outer)
+        environment.define("a", 1.0)
+        pool.release(environment)
+        
+        reused = pool.acquire(outer)
+        self.assertIs(reused, environment)
+        self.assertEqual(reused.values, {})
+        self.assertIs(reused.enclosing, outer)
+        self.assertEqual(pool.stats()["allocated"], 1)
+        self.assertEqual(pool.stats()["reused"], 1)
+    
+    def test_non_escaping_frames_are_reused(self):
+        """测试不逃逸的块和调用环境在循环中被复用"""
+        Lox.run("""
+        fun add(a, b) { var t = a + b; return t; }
+        var sum = 0;
+        for (var i = 0; i < 100; i = i + 1) { sum = add(sum, i); }
+        print sum;
+        """)
+        
+        stats = Lox.interpreter.environment_pool.stats()
+        self.assertEqual(self.captured_output.getvalue().strip(), "4950")
+        self.assertGreater(stats["reused"], 100)
+        self.assertLess(stats["allocated"], 10)
+    
+    def test_captured_frames_are_not_reused(self):
+        """测试被闭包捕获的环境不会被回收"""
+        Lox.run("""
+        fun makeCounter() {
+          var count = 0;
+          fun counter() { count = count + 1; return count; }
+          return counter;
+        }
+        var first = makeCounter();
+        var second = makeCounter();
+        first();
+        first();
+        second();
+        print first();
+        print second();
+        """)
+        
+        self.assertEqual(self.captured_output.getvalue().split(), ["3", "2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
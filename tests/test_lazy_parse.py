@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试延迟解析函数体
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from pylox.lox import LoxRuntime
+from pylox.interpreter.output import OutputSink
+from pylox.parser import Parser
+from pylox.parser.lazy import LazyFunction
+from pylox.scanner import Scanner
+from pylox.syntax_tree import Function, Class
+
+
+LIBRARY = """
+fun fib(n) {
+  if (n < 2) { return n; }
+  return fib(n - 1) + fib(n - 2);
+}
+fun make_counter() {
+  var count = 0;
+  fun increment() {
+    count = count + 1;
+    return count;
+  }
+  return increment;
+}
+fun broken() {
+  var x = ;
+  return x;
+}
+"""
+
+
+class TestLazyParser(unittest.TestCase):
+    """测试解析器的延迟模式"""
+
+    def parse(self, source, lazy):
+        """解析源代码，返回语句列表和运行时"""
+        runtime = LoxRuntime(output=OutputSink(io.StringIO()), error_stream=io.StringIO())
+        tokens = Scanner(source, lox=runtime).scan_tokens()
+        return Parser(tokens, lox=runtime, lazy=lazy).parse(), runtime
+
+    def test_top_level_bodies_are_skipped(self):
+        """顶层函数体只做括号匹配，其中的语法错误不在解析时报告"""
+        statements, runtime = self.parse(LIBRARY, lazy=True)
+        self.assertEqual([type(stmt) for stmt in statements], [LazyFunction] * 3)
+        self.assertEqual([stmt.name.lexeme for stmt in statements], ["fib", "make_counter", "broken"])
+        self.assertFalse(runtime.had_error)
+
+        statements, runtime = self.parse(LIBRARY, lazy=False)
+        self.assertEqual([type(stmt) for stmt in statements], [Function] * 3)
+        self.assertTrue(runtime.had_error)
+
+    def test_methods_are_parsed_eagerly(self):
+        """类的方法依赖外层作用域，不延迟解析"""
+        statements, _ = self.parse("class A { method() { return 1; } }", lazy=True)
+        self.assertIsInstance(statements[0], Class)
+        self.assertIs(type(statements[0].methods[0]), Function)
+
+    def test_unterminated_body(self):
+        """没有结束的函数体与立即解析时报告同样的错误"""
+        for lazy in (True, False):
+            _, runtime = self.parse("fun f() { if (true) { print 1; }", lazy=lazy)
+            self.assertTrue(runtime.had_error)
+            self.assertIn("代码块后需要'}'。", runtime.error_stream.getvalue())
+
+
+class TestLazyRuntime(unittest.TestCase):
+    """测试延迟解析模式下的执行"""
+
+    def run_source(self, source, lazy_parse=True):
+        """执行代码，返回退出码、输出和错误输出"""
+        output = io.StringIO()
+        errors = io.StringIO()
+        runtime = LoxRuntime(output=OutputSink(output), error_stream=errors, lazy_parse=lazy_parse)
+        status = runtime.execute_source(source)
+        return status, output.getvalue(), errors.getvalue()
+
+    def test_functions_run_normally(self):
+        """函数体在首次调用时解析，闭包和递归照常工作"""
+        status, output, _ = self.run_source(
+            "fun f() {} fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }"
+            "fun make_counter() { var count = 0;"
+            "  fun increment() { count = count + 1; return count; } return increment; }"
+            "var counter = make_counter(); counter(); print counter(); print fib(15);")
+        self.assertEqual(status, 0)
+        self.assertEqual(output, "2\n610\n")
+
+    def test_uncalled_broken_function(self):
+        """从未调用的函数中的错误不会被报告"""
+        status, output, errors = self.run_source(LIBRARY + "print fib(10);")
+        self.assertEqual(status, 0)
+        self.assertEqual(output, "55\n")
+        self.assertEqual(errors, "")
+
+    def test_error_reported_on_first_call(self):
+        """函数体的错误在首次调用时以同样的方式报告，之后每次调用都是运行时错误"""
+        status, output, errors = self.run_source(LIBRARY + "print fib(10); print broken();")
+        _, _, eager_errors = self.run_source(LIBRARY, lazy_parse=False)
+        self.assertEqual(status, 65)
+        self.assertEqual(output, "55\n")
+        self.assertTrue(errors.startswith(eager_errors))
+        self.assertIn("函数'broken'的函数体有错误，无法调用。", errors)
+
+        status, _, errors = self.run_source(
+            "fun g() { return this; } fun call() { g(); } call();")
+        self.assertEqual(status, 65)
+        self.assertIn("函数'g'的函数体有错误", errors)
+
+    def test_body_becomes_plain_function(self):
+        """解析后的节点变回普通的Function"""
+        runtime = LoxRuntime(output=OutputSink(io.StringIO()), lazy_parse=True)
+        statements = runtime.compile("fun f(a) { return a * 2; }")
+        self.assertIs(type(statements[0]), LazyFunction)
+        runtime.execute_statements(statements + runtime.compile("print f(21);"))
+        self.assertIs(type(statements[0]), Function)
+        self.assertEqual(len(statements[0].body), 1)
+
+
+class TestValidate(unittest.TestCase):
+    """测试只检查不执行"""
+
+    def test_validate_reports_all_errors(self):
+        """validate总是立即解析所有函数体"""
+        output = io.StringIO()
+        errors = io.StringIO()
+        runtime = LoxRuntime(output=OutputSink(output), error_stream=errors, lazy_parse=True)
+        self.assertEqual(runtime.validate_source(LIBRARY + "print 1;"), 65)
+        self.assertIn("期望表达式。", errors.getvalue())
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(runtime.validate_source("print 1;"), 0)
+
+    def test_validate_file(self):
+        """检查文件，找不到文件时返回65"""
+        runtime = LoxRuntime(output=OutputSink(io.StringIO()), error_stream=io.StringIO())
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ok.lox")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("fun f() { return 1; }\n")
+            self.assertEqual(runtime.validate_file(path), 0)
+            self.assertEqual(runtime.validate_file(os.path.join(directory, "missing.lox")), 65)
+
+    def test_validate_too_deep(self):
+        """嵌套过深的代码报告为错误，返回65"""
+        errors = io.StringIO()
+        runtime = LoxRuntime(output=OutputSink(io.StringIO()), error_stream=errors)
+        self.assertEqual(runtime.validate_source("print " + " + ".join(["1"] * 20000) + ";"), 65)
+        self.assertIn("嵌套过深", errors.getvalue())
+
+
+class TestLazyCoverage(unittest.TestCase):
+    """测试延迟解析与覆盖率统计"""
+
+    def test_rejected(self):
+        """延迟解析的函数体不在语法树中，不能统计覆盖率"""
+        with self.assertRaises(ValueError):
+            LoxRuntime(coverage=True, lazy_parse=True)
+        with self.assertRaises(ValueError):
+            LoxRuntime().run_file("script.lox", coverage_output="out.info", lazy_parse=True)
+
+        from pylox.cli import main
+        with mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            with self.assertRaises(SystemExit) as raised:
+                main(["--coverage", "out.info", "--lazy-parse", "script.lox"])
+        self.assertEqual(raised.exception.code, 2)
+        self.assertIn("--coverage不能与--lazy-parse同时使用", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试运行统计
+"""
+
+import unittest
+import io
+from pylox.lox import LoxRuntime
+from pylox.scanner.scanner import Scanner
+from pylox.parser.parser import Parser
+from pylox.interpreter.output import OutputSink
+from pylox.interpreter.metrics import Metrics, MetricsInterpreter, count_nodes, PHASES
+
+
+class TestMetrics(unittest.TestCase):
+    """测试统计数据本身"""
+    
+    def test_count_nodes(self):
+        """测试语法树节点计数"""
+        statements = Parser(Scanner("print 1 + 2;").scan_tokens()).parse()
+        
+        # Print、Binary和两个Literal
+        self.assertEqual(count_nodes(statements), 4)
+    
+    def test_laps(self):
+        """测试阶段耗时按上次计时累计"""
+        ticks = iter([0.0, 1.0, 3.0, 6.0])
+        metrics = Metrics(clock=lambda: next(ticks))
+        
+        metrics.start_lap()
+        metrics.lap("scan")
+        metrics.lap("parse")
+        metrics.lap("scan")
+        
+        self.assertEqual(metrics.to_dict()["phases"],
+                         {"scan": 4.0, "parse": 2.0, "resolve": 0.0, "interpret": 0.0})
+
+
+class TestRuntimeMetrics(unittest.TestCase):
+    """测试运行时收集的统计"""
+    
+    def run_with_stats(self, source):
+        """在启用统计的运行时中执行代码"""
+        runtime = LoxRuntime(output=OutputSink(io.StringIO()), error_stream=io.StringIO(), stats=True)
+        self.assertEqual(runtime.execute_source(source), 0)
+        return runtime
+    
+    def test_counters(self):
+        """测试调用、实例、属性读取和控制流异常计数"""
+        runtime = self.run_with_stats("""
+        class Point { init(x) { this.x = x; } get() { return this.x; } }
+        var p = Point(1);
+        for (var i = 0; i < 3; i = i + 1) {
+          p.get();
+          if (i == 1) break;
+        }
+        """)
+        stats = runtime.metrics.to_dict()
+        
+        self.assertIsInstance(runtime.interpreter, MetricsInterpreter)
+        self.assertEqual(stats["calls"], 3)
+        self.assertEqual(stats["instances"], 1)
+        # p.get两次，get方法中的this.x两次
+        self.assertEqual(stats["property_lookups"], 4)
+        # get方法中的return两次，break一次
+        self.assertEqual(stats["control_exceptions"], 3)
+        self.assertGreater(stats["tokens"], 0)
+        self.assertGreater(stats["ast_nodes"], 0)
+        self.assertGreater(stats["resolved_locals"], 0)
+        self.assertGreater(stats["environments"], 0)
+        self.assertEqual(set(stats["phases"]), set(PHASES))
+        self.assertGreater(stats["phases"]["interpret"], 0)
+    
+    def test_environment_pool(self):
+        """测试报告区分环境池新建和复用的环境"""
+        runtime = self.run_with_stats("""
+        fun add(a, b) { return a + b; }
+        var total = 0;
+        for (var i = 0; i < 10; i = i + 1) { total = add(total, i); }
+        """)
+        stats = runtime.metrics.to_dict()
+        pool = stats["environment_pool"]
+        
+        self.assertEqual(pool, runtime.interpreter.environment_pool.stats())
+        self.assertGreater(pool["reused"], pool["allocated"])
+        self.assertLessEqual(pool["allocated"] + pool["reused"], stats["environments"])
+        self.assertIn(f"环境池: 新建{pool['allocated']}，复用{pool['reused']}",
+                      runtime.metrics.format_report())
+    
+    def test_disabled_by_default(self):
+        """测试默认不创建统计数据"""
+        runtime = LoxRuntime(output=OutputSink(io.StringIO()))
+        runtime.execute_source("print 1;")
+        
+        self.assertIsNone(runtime.metrics)
+        self.assertFalse(hasattr(runtime.interpreter, "metrics"))
+
+
+if __name__ == "__main__":
+    unittest.main()
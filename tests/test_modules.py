@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试模块系统
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from pylox.lox import LoxRuntime
+from pylox.interpreter.output import OutputSink
+from pylox.modules import ModuleLoader
+
+
+class ModuleTestCase(unittest.TestCase):
+    """在临时目录中创建模块文件"""
+
+    def setUp(self):
+        """创建临时目录和加载器"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.loader = ModuleLoader()
+
+    def tearDown(self):
+        """删除临时目录"""
+        self.directory.cleanup()
+
+    def write(self, name, source):
+        """写入模块文件，返回其路径"""
+        path = os.path.join(self.directory.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(source)
+        return path
+
+    def run_file(self, path):
+        """在新的运行时中执行脚本，返回退出码、输出和错误输出"""
+        output = io.StringIO()
+        errors = io.StringIO()
+        runtime = LoxRuntime(output=OutputSink(output), error_stream=errors,
+                             module_loader=self.loader)
+        status = runtime.execute_file(path)
+        lines = output.getvalue().splitlines()[1:]  # 去掉[执行文件]提示
+        return status, lines, errors.getvalue()
+
+
+class TestImport(ModuleTestCase):
+    """测试import语句"""
+
+    def test_module_globals_are_visible(self):
+        """模块的全局定义对导入者可见，相对路径相对于导入者所在目录"""
+        self.write("lib/math.lox", 'import "consts.lox"; fun area(r) { return PI * r * r; }')
+        self.write("lib/consts.lox", "var PI = 3;")
+        path = self.write("main.lox", 'import "lib/math.lox"; print area(2); print PI;')
+        status, lines, errors = self.run_file(path)
+        self.assertEqual((status, errors), (0, ""))
+        self.assertEqual(lines, ["12", "3"])
+
+    def test_module_executes_once(self):
+        """重复导入和循环导入不会重复执行模块"""
+        self.write("a.lox", 'import "b.lox"; print "a";')
+        self.write("b.lox", 'import "a.lox"; print "b";')
+        path = self.write("main.lox", 'import "a.lox"; import "b.lox"; import "a.lox";')
+        status, lines, _ = self.run_file(path)
+        self.assertEqual(status, 0)
+        self.assertEqual(lines, ["b", "a"])
+
+    def test_missing_module(self):
+        """找不到模块时报告运行时错误"""
+        path = self.write("main.lox", 'import "missing.lox";')
+        status, _, errors = self.run_file(path)
+        self.assertEqual(status, 70)
+        self.assertIn("无法读取模块'missing.lox'。", errors)
+
+    def test_module_with_errors(self):
+        """模块中的语法和变量解析错误以通常的格式报告，退出码为65"""
+        self.write("syntax.lox", "var x = ;")
+        self.write("resolve.lox", "return 1;")
+        for name in ("syntax.lox", "resolve.lox"):
+            path = self.write("main.lox", f'import "{name}"; print "unreachable";')
+            status, lines, errors = self.run_file(path)
+            self.assertEqual(status, 65)
+            self.assertEqual(lines, [])
+            self.assertIn(f"模块'{name}'有错误，无法导入。", errors)
+
+    def test_errors_name_the_module(self):
+        """模块中的错误信息带有模块文件的路径"""
+        syntax = self.write("syntax.lox", "\nvar x = ;")
+        runtime = self.write("runtime.lox", 'fun fail() { return -"a"; }')
+        path = self.write("main.lox", 'import "syntax.lox";')
+        errors = self.run_file(path)[2]
+        self.assertIn(f"[{syntax} 行 2] 错误 at ';': 期望表达式。", errors)
+
+        path = self.write("main.lox", 'import "runtime.lox";\nfail();')
+        status, _, errors = self.run_file(path)
+        self.assertEqual(status, 70)
+        self.assertTrue(errors.startswith(f"[{runtime} 行 1] 运行时错误"))
+
+    def test_coverage_and_profile_by_file(self):
+        """覆盖率和性能报告按文件区分模块中的代码"""
+        lib = self.write("lib.lox", "fun twice(x) {\n  return x * 2;\n}\nvar unused = 0;\n")
+        path = self.write("main.lox", 'import "lib.lox";\nprint twice(1);\nprint twice(2);\n')
+        runtime = LoxRuntime(output=OutputSink(io.StringIO()), error_stream=io.StringIO(),
+                             module_loader=self.loader, coverage=True, profile=True)
+        self.assertEqual(runtime.execute_file(path), 0)
+
+        coverage = runtime.interpreter.coverage
+        self.assertEqual(coverage.hits, {1: 1, 2: 1, 3: 1})
+        self.assertEqual(coverage.files[lib], {1: 1, 2: 2, 4: 1})
+        report = coverage.to_dict("main.lox")
+        self.assertEqual([module["file"] for module in report["modules"]], [lib])
+        self.assertEqual(coverage.format_lcov("main.lox").count("end_of_record"), 2)
+
+        self.assertIn(f"twice ({lib} 行 1)", runtime.interpreter.profiler.format_report())
+
+    def test_import_only_at_top_level(self):
+        """import不能出现在块或函数中"""
+        path = self.write("main.lox", '{ import "a.lox"; }')
+        status, _, errors = self.run_file(path)
+        self.assertEqual(status, 65)
+        self.assertIn("import只能出现在顶层。", errors)
+
+
+class TestModuleLoader(ModuleTestCase):
+    """测试语法树缓存"""
+
+    def test_ast_shared_between_runtimes(self):
+        """多个运行时共享同一份语法树，文件变化后重新分析"""
+        self.write("lib.lox", "fun twice(x) { return x * 2; }")
+        path = self.write("main.lox", 'import "lib.lox"; print twice(21);')
+        with mock.patch.object(self.loader, "parse", wraps=self.loader.parse) as parse:
+            for _ in range(3):
+                self.assertEqual(self.run_file(path)[1], ["42"])
+            self.assertEqual(parse.call_count, 1)
+
+            self.write("lib.lox", "fun twice(x) { return x + x + 0; }")
+            os.utime(os.path.join(self.directory.name, "lib.lox"), ns=(0, 0))
+            self.assertEqual(self.run_file(path)[1], ["42"])
+            self.assertEqual(parse.call_count, 2)
+
+    def test_disk_cache(self):
+        """磁盘缓存可以被新的加载器读取，损坏的缓存被忽略"""
+        cache_dir = os.path.join(self.directory.name, "cache")
+        self.write("lib.lox", 'var name = "lib";')
+        path = self.write("main.lox", 'import "lib.lox"; print name;')
+
+        self.loader = ModuleLoader(cache_dir=cache_dir)
+        self.assertEqual(self.run_file(path)[1], ["lib"])
+        cache_files = os.listdir(cache_dir)
+        self.assertEqual(len(cache_files), 1)
+
+        self.loader = ModuleLoader(cache_dir=cache_dir)
+        with mock.patch.object(self.loader, "parse") as parse:
+            self.assertEqual(self.run_file(path)[1], ["lib"])
+            parse.assert_not_called()
+
+        with open(os.path.join(cache_dir, cache_files[0]), "wb") as file:
+            file.write(b"not a pickle")
+        self.loader = ModuleLoader(cache_dir=cache_dir)
+        self.assertEqual(self.run_file(path)[1], ["lib"])
+
+
+if __name__ == "__main__":
+    unittest.main()
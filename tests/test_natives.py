@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试原生函数和原生容器类型
+"""
+
+import unittest
+import importlib.util
+import io
+import sys
+from unittest import mock
+from pylox.lox import Lox, LoxRuntime
+from pylox.interpreter.output import OutputSink
+from pylox.interpreter.natives.native_object import NativeError
+from pylox.interpreter.natives.numarray import NumArray
+from pylox.interpreter.natives.registry import NativeFunction, registry
+
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+class NativeTestCase(unittest.TestCase):
+    """原生功能测试基类"""
+    
+    def setUp(self):
+        """测试前准备"""
+        Lox.had_error = False
+        Lox.had_runtime_error = False
+        
+        self.stdout_backup = sys.stdout
+        self.stderr_backup = sys.stderr
+        self.captured_output = io.StringIO()
+        self.captured_error = io.StringIO()
+        sys.stdout = self.captured_output
+        sys.stderr = self.captured_error
+    
+    def tearDown(self):
+        """测试后清理"""
+        sys.stdout = self.stdout_backup
+        sys.stderr = self.stderr_backup
+    
+    def run_lines(self, code):
+        """执行代码并返回输出的各行"""
+        Lox.run(code)
+        return self.captured_output.getvalue().strip().split('\n')
+
+
+class TestNativeRegistry(NativeTestCase):
+    """测试原生函数注册表"""
+    
+    def setUp(self):
+        """注册测试用的原生函数"""
+        super().setUp()
+        
+        @registry.native("hostAdd")
+        def host_add(a, b):
+            return a + b
+        
+        @registry.native("hostFail")
+        def host_fail():
+            raise NativeError("宿主函数失败。")
+        
+        # 原生值在创建解释器时安装
+        Lox.interpreter = None
+    
+    def tearDown(self):
+        """移除测试用的原生函数"""
+        registry.natives.pop("hostAdd", None)
+        registry.natives.pop("hostFail", None)
+        Lox.interpreter = None
+        super().tearDown()
+    
+    def test_arity_from_signature(self):
+        """测试参数数量根据函数签名预先计算"""
+        self.assertIsInstance(registry.natives["hostAdd"], NativeFunction)
+        self.assertEqual(registry.natives["hostAdd"].arity(), 2)
+        self.assertEqual(registry.natives["clock"].arity(), 0)
+    
+    def test_arity_of_other_callables(self):
+        """测试内置函数、绑定方法和带默认值的函数按必需的位置参数计数"""
+        import math
+        
+        class Host:
+            def scale(self, x, factor=2):
+                return x * factor
+        
+        natives = registry.copy()
+        natives.register("sqrt", NativeFunction("sqrt", math.sqrt))
+        natives.native("absolute")(abs)
+        natives.native("scale")(Host().scale)
+        natives.native("pad")(lambda text, width=8: text)
+        
+        self.assertEqual(natives.natives["sqrt"].arity(), 1)
+        self.assertEqual(natives.natives["absolute"].arity(), 1)
+        self.assertEqual(natives.natives["scale"].arity(), 1)
+        self.assertEqual(natives.natives["pad"].arity(), 1)
+        self.assertEqual(natives.natives["absolute"].call(None, [-3.0]), 3.0)
+        
+        with self.assertRaises(TypeError) as context:
+            NativeFunction("biggest", max)
+        self.assertIn("请显式指定arity", str(context.exception))
+        self.assertEqual(NativeFunction("biggest", max, arity=2).arity(), 2)
+    
+    def test_call_registered_function(self):
+        """测试调用注册的原生函数"""
+        output = self.run_lines("""
+        print hostAdd(1, 2);
+        var f = hostAdd;
+        print f(3, 4);
+        print hostAdd;
+        """)
+        
+        self.assertEqual(output, ["3", "7", "<native fn: hostAdd>"])
+    
+    def test_wrong_argument_count(self):
+        """测试参数数量不符报告运行时错误"""
+        Lox.run("hostAdd(1);")
+        
+        self.assertTrue(Lox.had_runtime_error)
+        self.assertIn("需要2个参数但得到1个", self.captured_error.getvalue())
+    
+    def test_native_error(self):
+        """测试原生函数抛出的NativeError转换为运行时错误"""
+        Lox.run("hostFail();")
+        
+        self.assertTrue(Lox.had_runtime_error)
+        self.assertIn("宿主函数失败", self.captured_error.getvalue())
+    
+    def test_per_interpreter_natives(self):
+        """测试在解释器的注册表副本上注册的原生值只对该解释器可见"""
+        first = LoxRuntime(output=OutputSink(io.StringIO()), error_stream=io.StringIO())
+        second = LoxRuntime(output=OutputSink(io.StringIO()), error_stream=io.StringIO())
+        first.init()
+        
+        @first.interpreter.natives.native("hostTwice")
+        def host_twice(x):
+            return x * 2
+        
+        self.assertEqual(first.execute_source("print hostTwice(21);"), 0)
+        self.assertEqual(first.output.stream.getvalue(), "42\n")
+        self.assertNotIn("hostTwice", registry.natives)
+        self.assertEqual(second.execute_source("hostTwice(1);"), 70)
+        self.assertIn("未定义的变量 'hostTwice'", second.error_stream.getvalue())
+        # 默认注册表中的原生值对所有解释器可见
+        self.assertEqual(second.execute_source("print hostAdd(1, 2);"), 0)
+
+
+class TestList(NativeTestCase):
+    """测试List原生类型"""
+    
+    def test_basic_operations(self):
+        """测试追加、下标访问和长度"""
+        output = self.run_lines("""
+        var list = List();
+        for (var i = 0; i < 5; i = i + 1) list.append(i * 2);
+        list.set(0, "first");
+        print list.length();
+        print list.get(3);
+        print list;
+        print list.pop();
+        print list.contains(4);
+        """)
+        
+        self.assertEqual(output, ["5", "6", '["first", 2, 4, 6, 8]', "8", "true"])
+    
+    def test_iteration_helpers(self):
+        """测试forEach、map、filter和join"""
+        output = self.run_lines("""
+        var list = List();
+        list.append(1);
+        list.append(2);
+        list.append(3);
+        var total = 0;
+        list.forEach(fun (item) { total = total + item; });
+        print total;
+        print list.map(fun (item) { return item * 10; });
+        print list.filter(fun (item) { return item > 1; }).join(",");
+        """)
+        
+        self.assertEqual(output, ["6", "[10, 20, 30]", "2,3"])
+    
+    def test_index_out_of_range(self):
+        """测试下标越界报告运行时错误"""
+        Lox.run("var list = List(); list.get(0);")
+        
+        self.assertTrue(Lox.had_runtime_error)
+        self.assertIn("越界", self.captured_error.getvalue())
+    
+    def test_non_finite_index(self):
+        """测试无穷大和NaN下标报告运行时错误"""
+        Lox.run("var inf = 1; while (inf * 10 > inf) inf = inf * 10;"
+                "var list = List(); list.append(1);")
+        for index in ("inf", "-inf", "inf - inf"):
+            Lox.had_runtime_error = False
+            Lox.run(f"list.get({index});")
+            
+            self.assertTrue(Lox.had_runtime_error)
+        self.assertEqual(self.captured_error.getvalue().count("列表下标必须是整数。"), 3)
+
+
+class TestMap(NativeTestCase):
+    """测试Map原生类型"""
+    
+    def test_basic_operations(self):
+        """测试设置、读取、删除和遍历"""
+        output = self.run_lines("""
+        var map = Map();
+        map.set("a", 1);
+        map.set("b", 2);
+        print map.get("a");
+        print map.has("c");
+        print map.length();
+        map.remove("a");
+        print map.keys();
+        map.forEach(fun (key, value) { print key + "=" + value; });
+        """)
+        
+        self.assertEqual(output, ["1", "false", "2", '["b"]', "b=2"])
+    
+    def test_keys_keep_their_type(self):
+        """测试true和1是不同的键"""
+        output = self.run_lines("""
+        var map = Map();
+        map.set(1, "one");
+        map.set(true, "yes");
+        print map.length();
+        print map.get(1);
+        print map.keys();
+        print map;
+        """)
+        
+        self.assertEqual(output, ["2", "one", "[1, true]", '{1: "one", true: "yes"}'])
+    
+    def test_unknown_method(self):
+        """测试访问不存在的方法"""
+        Lox.run("var map = Map(); map.push(1);")
+        
+        self.assertTrue(Lox.had_runtime_error)
+        self.assertIn("未定义的属性 'push'", self.captured_error.getvalue())
+
+
+@unittest.skipUnless(HAS_NUMPY, "未安装NumPy")
+class TestNumArray(NativeTestCase):
+    """测试NumArray原生类型"""
+    
+    def test_vectorized_operations(self):
+        """测试逐元素运算和归约"""
+        output = self.run_lines("""
+        var list = List();
+        for (var i = 1; i <= 4; i = i + 1) list.append(i);
+        var a = NumArray(list);
+        print a.mul(2).add(1);
+        print a.add(a).sum();
+        print a.min() + a.max();
+        print a.mean();
+        print a.dot(a);
+        print a.slice(1, 3).toList();
+        print NumArray(3).length();
+        """)
+        
+        self.assertEqual(output, ["NumArray[3, 5, 7, 9]", "20", "5", "2.5", "30",
+                                  "[2, 3]", "3"])
+    
+    def test_length_mismatch(self):
+        """测试长度不一致的数组运算报告运行时错误"""
+        Lox.run("NumArray(2).add(NumArray(3));")
+        
+        self.assertTrue(Lox.had_runtime_error)
+        self.assertIn("数组长度不一致", self.captured_error.getvalue())
+    
+    def test_allocation_failure(self):
+        """测试无法分配的长度报告运行时错误"""
+        Lox.run("NumArray(100000000000000000000);")
+        
+        self.assertTrue(Lox.had_runtime_error)
+        self.assertIn("无法分配长度为100000000000000000000的数组", self.captured_error.getvalue())
+
+
+class TestNumArrayWithoutNumpy(NativeTestCase):
+    """测试未安装NumPy时的降级行为"""
+    
+    def test_missing_numpy(self):
+        """测试未安装NumPy时创建NumArray报告运行时错误"""
+        with mock.patch.dict(sys.modules, {"numpy": None}):
+            Lox.run("var a = NumArray(3);")
+        
+        self.assertTrue(Lox.had_runtime_error)
+        self.assertIn("NumArray需要NumPy", self.captured_error.getvalue())
+    
+    def test_arguments_checked_before_numpy(self):
+        """测试非法参数在导入NumPy之前报告"""
+        with mock.patch.dict(sys.modules, {"numpy": None}):
+            for source in ("-1", "1.5", "inf", "inf - inf", '"3"'):
+                Lox.had_runtime_error = False
+                Lox.run("var inf = 1; while (inf * 10 > inf) inf = inf * 10;"
+                        f"NumArray({source});")
+                
+                self.assertTrue(Lox.had_runtime_error)
+        
+        errors = self.captured_error.getvalue()
+        self.assertEqual(errors.count("数组长度必须是非负整数。"), 4)
+        self.assertIn("NumArray的参数必须是List或长度。", errors)
+        self.assertNotIn("NumPy", errors)
+    
+    def test_set_requires_number(self):
+        """测试set的值必须是数字，下标不能是无穷大"""
+        array = NumArray([0.0, 0.0])
+        
+        with self.assertRaisesRegex(NativeError, "元素必须是数字"):
+            array.set_item(None, 0, NumArray([1.0, 2.0]))
+        with self.assertRaisesRegex(NativeError, "下标必须是整数"):
+            array.set_item(None, float("inf"), 1.0)
+        self.assertEqual(array.set_item(None, 1, 2.0), 2.0)
+        self.assertEqual(array.array, [0.0, 2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试print语句的输出目标
+"""
+
+import unittest
+import io
+import sys
+from pylox.lox import Lox
+from pylox.scanner.scanner import Scanner
+from pylox.parser.parser import Parser
+from pylox.resolver import Resolver
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.output import OutputSink
+
+
+class TestOutputSink(unittest.TestCase):
+    """测试OutputSink的缓冲策略"""
+    
+    def test_block_buffered(self):
+        """测试块缓冲模式在flush前不写出"""
+        stream = io.StringIO()
+        sink = OutputSink(stream)
+        sink.write_line("a")
+        sink.write_line("b")
+        
+        self.assertEqual(stream.getvalue(), "")
+        sink.flush()
+        self.assertEqual(stream.getvalue(), "a\nb\n")
+    
+    def test_buffer_size(self):
+        """测试缓冲区写满时自动写出"""
+        stream = io.StringIO()
+        sink = OutputSink(stream, buffer_size=4)
+        sink.write_line("ab")
+        self.assertEqual(stream.getvalue(), "")
+        sink.write_line("cd")
+        self.assertEqual(stream.getvalue(), "ab\ncd\n")
+    
+    def test_line_buffered(self):
+        """测试行缓冲模式立即写出"""
+        stream = io.StringIO()
+        sink = OutputSink(stream, line_buffered=True)
+        sink.write_line("a")
+        
+        self.assertEqual(stream.getvalue(), "a\n")
+
+
+class TestInterpreterOutput(unittest.TestCase):
+    """测试解释器通过输出目标打印"""
+    
+    def setUp(self):
+        """测试前准备"""
+        Lox.had_error = False
+        Lox.had_runtime_error = False
+        self.stderr_backup = sys.stderr
+        self.captured_error = io.StringIO()
+        sys.stderr = self.captured_error
+    
+    def tearDown(self):
+        """测试后清理"""
+        sys.stderr = self.stderr_backup
+    
+    def interpret(self, source, stream):
+        """使用写入stream的解释器执行源代码"""
+        interpreter = Interpreter(output=OutputSink(stream))
+        statements = Parser(Scanner(source).scan_tokens()).parse()
+        Resolver(interpreter).resolve(statements)
+        interpreter.interpret(statements)
+        return interpreter
+    
+    def test_custom_stream(self):
+        """测试输出写入指定的流并在程序结束时刷新"""
+        stream = io.StringIO()
+        self.interpret('print 1; print "two";', stream)
+        
+        self.assertEqual(stream.getvalue(), "1\ntwo\n")
+    
+    def test_flush_before_runtime_error(self):
+        """测试报告运行时错误前写出已缓冲的输出"""
+        stream = io.StringIO()
+        
+        class OrderedError(io.StringIO):
+            def write(error_stream, text):
+                error_stream.seen_output = stream.getvalue()
+                return super().write(text)
+        
+        sys.stderr = OrderedError()
+        self.interpret('print "before"; print 1 - "x";', stream)
+        
+        self.assertTrue(Lox.had_runtime_error)
+        self.assertEqual(sys.stderr.seen_output, "before\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
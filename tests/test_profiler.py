@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试Lox函数级性能分析
+"""
+
+import unittest
+import io
+from pylox.lox import LoxRuntime
+from pylox.interpreter.output import OutputSink
+from pylox.interpreter.profiler import Profiler, FunctionProfile, ProfilingInterpreter
+from pylox.interpreter.debug_interpreter import DebugInterpreter
+
+
+class FakeClock:
+    """每次读取前进固定时间的时钟"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+class TestProfiler(unittest.TestCase):
+    """测试计时统计"""
+    
+    def test_inclusive_and_exclusive(self):
+        """测试递归调用不重复计入总时间，自身时间扣除子调用"""
+        profiler = Profiler(clock=FakeClock())
+        outer = FunctionProfile("outer", 1, "function")
+        inner = FunctionProfile("inner", 2, "function")
+        
+        profiler.enter(outer)      # t=1
+        profiler.enter(outer)      # t=2
+        profiler.enter(inner)      # t=3
+        profiler.exit()            # t=4，inner耗时1
+        profiler.exit()            # t=5，内层outer耗时3
+        profiler.exit()            # t=6，外层outer耗时5
+        
+        self.assertEqual((outer.calls, outer.inclusive, outer.exclusive), (2, 5.0, 4.0))
+        self.assertEqual((inner.calls, inner.inclusive, inner.exclusive), (1, 1.0, 1.0))
+
+
+class TestProfilingInterpreter(unittest.TestCase):
+    """测试在解释器中统计Lox函数"""
+    
+    def run_profiled(self, source, **options):
+        """在启用性能分析的运行时中执行代码"""
+        runtime = LoxRuntime(output=OutputSink(io.StringIO()), error_stream=io.StringIO(),
+                             profile=True, **options)
+        self.assertEqual(runtime.execute_source(source), 0)
+        return runtime
+    
+    def test_call_counts(self):
+        """测试函数、方法、匿名函数和类的调用次数"""
+        runtime = self.run_profiled("""
+        fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+        class Point {
+          init(x) { this.x = x; }
+          twice() { return this.x * 2; }
+        }
+        var square = fun (v) { return v * v; };
+        fib(5);
+        for (var i = 0; i < 3; i = i + 1) Point(i).twice();
+        square(4);
+        clock();
+        """)
+        
+        counts = {(result["name"], result["line"], result["kind"]): result["calls"]
+                  for result in runtime.interpreter.profiler.results()}
+        
+        self.assertEqual(counts, {
+            ("fib", 2, "function"): 15,
+            ("Point", 3, "class"): 3,
+            ("twice", 5, "function"): 3,
+            ("<lambda>", 7, "lambda"): 1,
+        })
+        self.assertIn("fib (行 2)", runtime.interpreter.profiler.format_report())
+    
+    def test_combined_with_debug(self):
+        """测试同时启用调试模式时组合两个解释器子类"""
+        runtime = self.run_profiled("fun f() {} f();", debug=True)
+        
+        self.assertIsInstance(runtime.interpreter, ProfilingInterpreter)
+        self.assertIsInstance(runtime.interpreter, DebugInterpreter)
+        self.assertEqual(runtime.interpreter.profiler.results()[0]["calls"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
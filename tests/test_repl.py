@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试交互式会话
+"""
+
+import unittest
+import io
+from unittest import mock
+from pylox.lox import LoxRuntime
+from pylox.repl import ReplSession
+from pylox.interpreter.output import OutputSink
+
+
+class TestReplSession(unittest.TestCase):
+    """测试多行输入和解析结果的释放"""
+    
+    def setUp(self):
+        """创建输出到缓冲区的会话"""
+        self.output = io.StringIO()
+        self.errors = io.StringIO()
+        runtime = LoxRuntime(output=OutputSink(self.output), error_stream=self.errors)
+        self.session = ReplSession(runtime)
+    
+    def feed(self, *lines):
+        """依次输入多行，返回每行是否触发了执行"""
+        return [self.session.feed(line) for line in lines]
+    
+    def test_multiline_function(self):
+        """测试花括号未闭合时继续输入"""
+        self.assertEqual(self.feed("fun f(n) {", "  return n * 2;", "}"), [False, False, True])
+        self.feed("f(21);")
+        
+        self.assertEqual(self.output.getvalue(), "42\n")
+    
+    def test_unterminated_string(self):
+        """测试字符串未结束时继续输入"""
+        self.assertEqual(self.feed('print "a', 'b";'), [False, True])
+        self.assertEqual(self.output.getvalue(), "a\nb\n")
+    
+    def test_blank_line_forces_execution(self):
+        """测试继续输入时空行立即执行并报告错误"""
+        self.assertEqual(self.feed("{", ""), [False, True])
+        
+        self.assertFalse(self.session.pending)
+        self.assertIn("错误", self.errors.getvalue())
+        self.feed("print 1;")
+        self.assertEqual(self.output.getvalue(), "1\n")
+    
+    def test_runtime_error_keeps_session(self):
+        """测试表达式的运行时错误不会结束会话"""
+        self.feed('1 - "x";', "1 + 1;")
+        
+        self.assertIn("运行时错误", self.errors.getvalue())
+        self.assertEqual(self.output.getvalue(), "2\n")
+    
+    def test_resolution_data_released(self):
+        """测试执行过的顶层代码不再占用解析结果，函数体仍然可用"""
+        self.feed("var total = 0;", "fun add(n) { var t = total + n; return t; }")
+        interpreter = self.session.runtime.interpreter
+        self.feed("{ var a = 1; total = add(a); }")
+        baseline = len(interpreter.locals)
+        
+        for _ in range(50):
+            self.feed("{ var a = 1; total = add(a); }")
+        
+        self.assertEqual(len(interpreter.locals), baseline)
+        self.feed("total;")
+        self.assertEqual(self.output.getvalue(), "51\n")
+    
+    def test_interact(self):
+        """测试读取-执行循环在空行处结束"""
+        lines = iter(["var a = 1;", "a;", ""])
+        prompts = []
+        
+        def read(prompt):
+            prompts.append(prompt)
+            return next(lines)
+        
+        with mock.patch("sys.stdout", io.StringIO()):
+            self.session.interact(read)
+        
+        self.assertEqual(prompts, ["> ", "> ", "> "])
+        self.assertEqual(self.output.getvalue(), "1\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
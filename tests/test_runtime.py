@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试相互隔离的LoxRuntime实例
+"""
+
+import unittest
+import io
+import os
+import tempfile
+import threading
+from pylox.lox import Lox, LoxRuntime
+from pylox.interpreter.metrics import MetricsInterpreter
+from pylox.interpreter.output import OutputSink
+from pylox.interpreter.profiler import ProfilingInterpreter
+
+
+def make_runtime():
+    """创建输出写入内存的运行时"""
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    runtime = LoxRuntime(output=OutputSink(stdout), error_stream=stderr)
+    return runtime, stdout, stderr
+
+
+class TestLoxRuntime(unittest.TestCase):
+    """测试运行时之间不共享状态"""
+    
+    def setUp(self):
+        """测试前准备"""
+        Lox.had_error = False
+        Lox.had_runtime_error = False
+    
+    def test_separate_globals(self):
+        """测试每个运行时拥有自己的全局环境"""
+        first, first_out, _ = make_runtime()
+        second, _, second_err = make_runtime()
+        
+        first.run("var shared = 1;")
+        second.run("print shared;")
+        first.run("print shared;")
+        
+        self.assertEqual(first_out.getvalue(), "1\n")
+        self.assertIn("未定义的变量 'shared'", second_err.getvalue())
+    
+    def test_separate_error_state(self):
+        """测试错误标志只影响报告错误的运行时"""
+        broken, _, broken_err = make_runtime()
+        healthy, _, _ = make_runtime()
+        
+        self.assertEqual(broken.execute_source("print ;"), 65)
+        self.assertEqual(healthy.execute_source("print 1;"), 0)
+        
+        self.assertTrue(broken.had_error)
+        self.assertFalse(healthy.had_error)
+        self.assertFalse(Lox.had_error)
+        self.assertIn("错误", broken_err.getvalue())
+    
+    def test_concurrent_threads(self):
+        """测试多个线程同时运行各自的程序"""
+        results = {}
+        
+        def worker(number):
+            runtime, stdout, _ = make_runtime()
+            source = f"""
+            var total = 0;
+            for (var i = 0; i < 2000; i = i + 1) total = total + {number};
+            print total;
+            """
+            results[number] = (runtime.execute_source(source), stdout.getvalue())
+        
+        threads = [threading.Thread(target=worker, args=(number,)) for number in range(1, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        for number in range(1, 5):
+            self.assertEqual(results[number], (0, f"{2000 * number}\n"))
+
+    
+    def test_run_file_rebuilds_interpreter(self):
+        """测试run_file的功能开关与已有的解释器不同时重新创建解释器"""
+        runtime, stdout, stderr = make_runtime()
+        self.assertEqual(runtime.execute_source("print 1;"), 0)
+        plain = runtime.interpreter
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "script.lox")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("fun f() { return 2; }\nprint f();\n")
+            runtime.run_file(path, stats=True, profile=True)
+            
+            self.assertIsInstance(runtime.interpreter, MetricsInterpreter)
+            self.assertIsInstance(runtime.interpreter, ProfilingInterpreter)
+            self.assertIs(runtime.metrics, runtime.interpreter.metrics)
+            self.assertIn("[统计] 阶段耗时", stderr.getvalue())
+            
+            # 开关不变时保留同一个解释器
+            interpreter = runtime.interpreter
+            runtime.run_file(path, stats=True, profile=True)
+            self.assertIs(runtime.interpreter, interpreter)
+            
+            runtime.run_file(path)
+            self.assertNotIsInstance(runtime.interpreter, MetricsInterpreter)
+            self.assertIsNot(runtime.interpreter, plain)
+        self.assertIn("2\n", stdout.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
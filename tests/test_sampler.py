@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试Lox调用栈采样
+"""
+
+import unittest
+import io
+import os
+import sys
+import tempfile
+from pylox.lox import LoxRuntime
+from pylox.scanner.scanner import Scanner
+from pylox.parser.parser import Parser
+from pylox.syntax_tree import node_line
+from pylox.interpreter.output import OutputSink
+from pylox.interpreter.sampler import SamplingInterpreter, StackSampler
+from pylox.interpreter.profiler import ProfilingInterpreter
+
+
+BUSY_PROGRAM = """
+fun fib(n) {
+  if (n < 2) return n;
+  return fib(n - 1) + fib(n - 2);
+}
+print fib(17);
+"""
+
+
+class TestNodeLine(unittest.TestCase):
+    """测试语句的行号"""
+    
+    def test_statement_lines(self):
+        """测试各类语句都能取得所在行"""
+        source = "var a = 1;\nprint a;\nif (a) a = 2;\nwhile (false) {}\n{ a; }\nreturn;\n"
+        statements = Parser(Scanner(source).scan_tokens()).parse()
+        
+        self.assertEqual([node_line(stmt) for stmt in statements], [1, 2, 3, 4, 5, 6])
+
+
+class TestSampler(unittest.TestCase):
+    """测试采样得到的折叠栈"""
+    
+    def run_sampled(self, source, **options):
+        """在启用采样的运行时中执行代码"""
+        runtime = LoxRuntime(output=OutputSink(io.StringIO()), error_stream=io.StringIO(), **options)
+        handle, runtime.sample_output = tempfile.mkstemp(suffix=".folded")
+        os.close(handle)
+        self.addCleanup(os.remove, runtime.sample_output)
+        runtime.sample_interval = 0.0005
+        self.assertEqual(runtime.execute_source(source), 0)
+        return runtime
+    
+    def test_collapsed_stacks(self):
+        """测试折叠栈包含Lox函数及其所在行"""
+        runtime = self.run_sampled(BUSY_PROGRAM)
+        sampler = runtime.interpreter.sampler
+        
+        self.assertGreater(sampler.samples, 0)
+        for line in sampler.collapsed().splitlines():
+            stack, count = line.rsplit(" ", 1)
+            self.assertTrue(stack.startswith("<script>:6"))
+            self.assertGreater(int(count), 0)
+        self.assertTrue(any(";fib:" in stack for stack in sampler.counts))
+        self.assertEqual(runtime.interpreter.frames, [])
+    
+    def test_sample_rate(self):
+        """测试实际采样率接近期望值，结束后恢复线程切换间隔"""
+        switch_interval = sys.getswitchinterval()
+        runtime = LoxRuntime(output=OutputSink(io.StringIO()), error_stream=io.StringIO())
+        runtime.sample_output = os.devnull
+        runtime.sample_interval = 0.002
+        self.assertEqual(runtime.execute_source(BUSY_PROGRAM.replace("fib(17)", "fib(20)")), 0)
+        sampler = runtime.interpreter.sampler
+        
+        self.assertEqual(sys.getswitchinterval(), switch_interval)
+        self.assertGreater(sampler.elapsed, 0.1)
+        # 默认的5ms切换间隔下只能达到约200Hz
+        self.assertGreater(sampler.rate(), 300)
+        self.assertLess(sampler.rate(), 600)
+        self.assertAlmostEqual(sampler.samples, sampler.rate() * sampler.elapsed, delta=1)
+        
+        runtime.write_samples()
+        self.assertIn(f"[采样] {sampler.samples}个样本", runtime.error_stream.getvalue())
+        self.assertIn("期望500Hz", runtime.error_stream.getvalue())
+    
+    def test_write_samples(self):
+        """测试折叠栈写入文件"""
+        runtime = self.run_sampled(BUSY_PROGRAM)
+        runtime.write_samples()
+        
+        with open(runtime.sample_output, encoding="utf-8") as file:
+            self.assertEqual(file.read(), runtime.interpreter.sampler.collapsed())
+    
+    def test_sample_snapshot(self):
+        """测试单次采样把调用处和当前语句的行号附在各栈帧上"""
+        runtime = self.run_sampled("fun f() { return 1; }\nf();")
+        interpreter = runtime.interpreter
+        statements = Parser(Scanner("f();\nprint 1;").scan_tokens()).parse()
+        interpreter.frames = [("f", statements[0])]
+        interpreter.current = statements[1]
+        
+        sampler = StackSampler(interpreter)
+        sampler.sample()
+        
+        self.assertEqual(sampler.collapsed(), "<script>:1;f:2 1\n")
+    
+    def test_combined_with_profile(self):
+        """测试同时启用性能分析时组合两个解释器子类"""
+        runtime = self.run_sampled("fun f() {} f();", profile=True)
+        
+        self.assertIsInstance(runtime.interpreter, SamplingInterpreter)
+        self.assertIsInstance(runtime.interpreter, ProfilingInterpreter)
+        self.assertEqual(runtime.interpreter.profiler.results()[0]["calls"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试常驻解释器服务
+"""
+
+import unittest
+import io
+import os
+import socket
+import sys
+import tempfile
+import threading
+from pylox.lox import Lox
+from pylox.server import execute_request, create_server, submit, run_client
+
+
+class TestExecuteRequest(unittest.TestCase):
+    """测试单个请求的执行"""
+    
+    def tearDown(self):
+        """测试后清理"""
+        Lox.interpreter = None
+    
+    def test_source(self):
+        """测试执行源代码并捕获输出"""
+        response = execute_request({"source": "print 1 + 2;"})
+        
+        self.assertEqual(response, {"stdout": "3\n", "stderr": "", "exit_code": 0})
+    
+    def test_fresh_globals(self):
+        """测试每个请求使用全新的全局环境"""
+        execute_request({"source": "var leaked = 1;"})
+        response = execute_request({"source": "print leaked;"})
+        
+        self.assertEqual(response["exit_code"], 70)
+        self.assertIn("未定义的变量 'leaked'", response["stderr"])
+    
+    def test_exit_codes(self):
+        """测试语法错误、找不到文件和无效请求的退出码"""
+        self.assertEqual(execute_request({"source": "print ;"})["exit_code"], 65)
+        self.assertEqual(execute_request({"path": "/nonexistent.lox"})["exit_code"], 65)
+        self.assertEqual(execute_request({})["exit_code"], 64)
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "需要Unix套接字")
+class TestServer(unittest.TestCase):
+    """测试通过套接字提交请求"""
+    
+    def setUp(self):
+        """在后台线程中启动服务"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.directory.name, "pylox.sock")
+        self.server = create_server(self.socket_path)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+    
+    def tearDown(self):
+        """停止服务"""
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.directory.cleanup()
+        Lox.interpreter = None
+    
+    def test_submit_path(self):
+        """测试提交脚本路径"""
+        script = os.path.join(self.directory.name, "script.lox")
+        with open(script, "w", encoding="utf-8") as file:
+            file.write('print "hello";')
+        
+        response = submit({"path": script}, self.socket_path)
+        
+        self.assertEqual(response["exit_code"], 0)
+        self.assertTrue(response["stdout"].endswith("hello\n"))
+    
+    def test_run_client(self):
+        """测试客户端输出结果并返回退出码"""
+        stdout_backup, stderr_backup = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = io.StringIO(), io.StringIO()
+        try:
+            exit_code = run_client(source='print 1; print 1 - "x";',
+                                   socket_path=self.socket_path)
+            stdout, stderr = sys.stdout.getvalue(), sys.stderr.getvalue()
+        finally:
+            sys.stdout, sys.stderr = stdout_backup, stderr_backup
+        
+        self.assertEqual(exit_code, 70)
+        self.assertEqual(stdout, "1\n")
+        self.assertIn("运行时错误", stderr)
+    
+    def test_unavailable(self):
+        """测试无法连接服务时返回69"""
+        stderr_backup = sys.stderr
+        sys.stderr = io.StringIO()
+        try:
+            exit_code = run_client(source="print 1;",
+                                   socket_path=os.path.join(self.directory.name, "none.sock"))
+        finally:
+            sys.stderr = stderr_backup
+        
+        self.assertEqual(exit_code, 69)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试命令行启动时的导入开销
+
+pylox会被任务调度器频繁启动，启动路径只应导入执行脚本所必需的模块。
+"""
+
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+
+
+# 启动路径上不应出现的标准库模块（只在出错、解析选项或调试时才按需导入）
+FORBIDDEN_MODULES = {
+    "argparse", "traceback", "inspect", "importlib", "ast", "re", "copy",
+    "tokenize", "linecache", "threading",
+}
+
+# `python -X importtime`测得的启动路径（导入pylox.lox并执行一个脚本）中pylox模块的
+# 累计导入时间上限（微秒）。本地约25ms，这里留出足够余量以免机器抖动导致误报。
+IMPORT_TIME_BUDGET_US = 300000
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(*args):
+    """在以仓库根目录为导入路径的子进程中运行Python"""
+    env = dict(os.environ, PYTHONPATH=PACKAGE_ROOT)
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True,
+                          env=env, cwd=PACKAGE_ROOT)
+
+
+class TestStartupImports(unittest.TestCase):
+    """测试启动路径的导入"""
+    
+    def import_times(self):
+        """
+        在-X importtime下导入pylox.lox并以main([script])执行脚本
+        
+        Returns:
+            tuple: (模块名到累计导入时间（微秒）的映射, 顶层pylox模块的累计导入时间之和)
+        """
+        with tempfile.NamedTemporaryFile("w", suffix=".lox", delete=False,
+                                         encoding="utf-8") as file:
+            file.write("print 1;")
+        try:
+            code = ("import pylox.lox\n"
+                    "from pylox.cli import main\n"
+                    f"main([{file.name!r}])\n")
+            result = run_python("-X", "importtime", "-c", code)
+        finally:
+            os.unlink(file.name)
+        
+        self.assertEqual(result.returncode, 0, result.stderr)
+        times = {}
+        total = 0
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = int(cumulative)
+            # 嵌套导入的模块名带有缩进，顶层导入的累计时间已经包含它们
+            if name.startswith(" pylox"):
+                total += int(cumulative)
+        return times, total
+    
+    def test_no_forbidden_imports(self):
+        """测试启动并执行脚本时不会加载不需要的模块"""
+        times, _ = self.import_times()
+        
+        for name in ("pylox.lox", "pylox.cli", "pylox.interpreter.interpreter",
+                     "pylox.parser.parser", "pylox.interpreter.natives.containers"):
+            self.assertIn(name, times)
+        self.assertEqual(FORBIDDEN_MODULES & set(times), set())
+    
+    def test_import_time_budget(self):
+        """测试启动并执行脚本时的导入时间在预算之内"""
+        _, total = self.import_times()
+        
+        self.assertGreater(total, 0)
+        self.assertLess(total, IMPORT_TIME_BUDGET_US)
+    
+    def test_run_script_without_option_parsing(self):
+        """测试只给出脚本路径时不导入argparse"""
+        with tempfile.NamedTemporaryFile("w", suffix=".lox", delete=False,
+                                         encoding="utf-8") as file:
+            file.write("print 1;")
+        try:
+            code = ("import sys\n"
+                    "from pylox.cli import main\n"
+                    f"main([{file.name!r}])\n"
+                    f"loaded = {sorted(FORBIDDEN_MODULES)!r}\n"
+                    "print([name for name in loaded if name in sys.modules])\n")
+            result = run_python("-c", code)
+        finally:
+            os.unlink(file.name)
+        
+        self.assertEqual(result.stdout.splitlines()[-1], "[]")
+        self.assertIn("1", result.stdout.splitlines())
+
+
+if __name__ == "__main__":
+    unittest.main()
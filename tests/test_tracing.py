@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试跟踪钩子
+"""
+
+import unittest
+import io
+from pylox.lox import LoxRuntime
+from pylox.interpreter.interpreter import Interpreter
+from pylox.interpreter.output import OutputSink
+from pylox.interpreter.debug_interpreter import DebugInterpreter
+from pylox.interpreter.tracing import is_tracing
+
+
+class TestTracing(unittest.TestCase):
+    """测试语句和调用事件"""
+    
+    def setUp(self):
+        """创建运行时并安装记录事件的回调"""
+        self.runtime = LoxRuntime(output=OutputSink(io.StringIO()), error_stream=io.StringIO())
+        self.events = []
+        self.runtime.set_trace(lambda event, line, arg: self.events.append((event, line)))
+    
+    def test_events(self):
+        """测试语句、调用和返回事件及其行号"""
+        self.runtime.execute_source("fun f(n) {\n  return n + 1;\n}\nprint f(1);\n")
+        
+        self.assertEqual(self.events, [
+            ("statement", 1),
+            ("statement", 4),
+            ("call", 4),
+            ("statement", 2),
+            ("return", 4),
+        ])
+    
+    def test_exception_event(self):
+        """测试调用因运行时错误结束"""
+        self.runtime.execute_source('fun f() {\n  return 1 - "x";\n}\nf();\n')
+        
+        self.assertEqual(self.events[-1], ("exception", 4))
+        self.assertTrue(self.runtime.had_runtime_error)
+    
+    def test_remove_restores_class(self):
+        """测试移除回调后恢复原来的解释器类"""
+        interpreter = self.runtime.interpreter
+        self.assertTrue(is_tracing(interpreter))
+        
+        interpreter.set_trace(None)
+        self.runtime.execute_source("print 1;")
+        
+        self.assertIs(type(interpreter), Interpreter)
+        self.assertFalse(is_tracing(interpreter))
+        self.assertEqual(self.events, [])
+    
+    def test_composes_with_feature_subclasses(self):
+        """测试在调试解释器上安装回调"""
+        runtime = LoxRuntime(debug=True, output=OutputSink(io.StringIO()), error_stream=io.StringIO())
+        runtime.set_trace(lambda event, line, arg: self.events.append(event))
+        runtime.execute_source("print 1;")
+        
+        self.assertIsInstance(runtime.interpreter, DebugInterpreter)
+        self.assertEqual(self.events, ["statement"])
+        
+        runtime.set_trace(None)
+        self.assertIs(type(runtime.interpreter), DebugInterpreter)
+
+
+if __name__ == "__main__":
+    unittest.main()